@@ -0,0 +1,74 @@
+"""composite/unique indexes for leaderboard_snapshots + member_daily_snapshot
+
+Revision ID: 20261017_hot_path_indexes
+Revises: 20261017_add_lb_captures
+Create Date: 2026-10-17 00:10:00.000000
+
+Achtung: upgrade() löscht doppelte member_daily_snapshot-Zeilen (pro tenant/user_id/day bleibt die
+neueste), bevor der UNIQUE-Index angelegt wird. Diese Löschung ist endgültig, downgrade() stellt
+nur die Indexe wieder her, nicht die entfernten Dubletten.
+"""
+from alembic import op  # type: ignore
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '20261017_hot_path_indexes'
+down_revision = '20261017_add_lb_captures'
+branch_labels = None
+depends_on = None
+
+
+def _has_unique(conn, table: str, cols: tuple) -> bool:
+    """True, wenn schon ein UNIQUE-Index/Constraint exakt diese Spalten abdeckt (Name egal)."""
+    for row in conn.exec_driver_sql(f"PRAGMA index_list('{table}')"):
+        name, unique = row[1], row[2]
+        if not unique:
+            continue
+        idx_cols = tuple(r[2] for r in conn.exec_driver_sql(f"PRAGMA index_info('{name}')"))
+        if idx_cols == cols:
+            return True
+    return False
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    tables = set(sa.inspect(conn).get_table_names())
+
+    if 'leaderboard_snapshots' in tables:
+        conn.exec_driver_sql(
+            'CREATE INDEX IF NOT EXISTS ix_lbs_tenant_window_captured '
+            'ON leaderboard_snapshots (tenant, "window", captured_at)'
+        )
+
+    if 'member_daily_snapshot' in tables:
+        if not _has_unique(conn, 'member_daily_snapshot', ('tenant', 'user_id', 'day')):
+            # Dubletten aus der Zeit ohne Constraint entfernen: pro (tenant, user_id, day) gewinnt die neueste Zeile
+            conn.exec_driver_sql(
+                """
+                DELETE FROM member_daily_snapshot
+                WHERE id NOT IN (
+                    SELECT MAX(id) FROM member_daily_snapshot GROUP BY tenant, user_id, day
+                )
+                """
+            )
+            conn.exec_driver_sql(
+                'CREATE UNIQUE INDEX IF NOT EXISTS uq_member_daily '
+                'ON member_daily_snapshot (tenant, user_id, day)'
+            )
+        # alter, vom UNIQUE-Index abgedeckter Lookup-Index ist überflüssig
+        conn.exec_driver_sql('DROP INDEX IF EXISTS ix_mds_tenant_user_day')
+        conn.exec_driver_sql(
+            'CREATE INDEX IF NOT EXISTS ix_mds_tenant_day ON member_daily_snapshot (tenant, day)'
+        )
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    conn.exec_driver_sql('DROP INDEX IF EXISTS ix_lbs_tenant_window_captured')
+    # uq_member_daily/ix_mds_tenant_day bleiben: sie können aus dem ursprünglichen Schema stammen
+    if 'member_daily_snapshot' in set(sa.inspect(conn).get_table_names()):
+        # den in upgrade() entfernten Lookup-Index wiederherstellen (gelöschte Dubletten nicht)
+        conn.exec_driver_sql(
+            'CREATE INDEX IF NOT EXISTS ix_mds_tenant_user_day '
+            'ON member_daily_snapshot (tenant, user_id, day)'
+        )
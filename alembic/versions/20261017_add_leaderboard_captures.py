@@ -0,0 +1,119 @@
+"""add leaderboard_captures + leaderboard_snapshots.capture_id
+
+Revision ID: 20261017_add_lb_captures
+Revises: 20250904_add_joined_at_utc
+Create Date: 2026-10-17 00:00:00.000000
+"""
+from datetime import datetime
+
+from alembic import op  # type: ignore
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '20261017_add_lb_captures'
+down_revision = '20250904_add_joined_at_utc'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    tables = set(sa.inspect(conn).get_table_names())
+
+    if 'leaderboard_captures' not in tables:
+        op.create_table(
+            'leaderboard_captures',
+            sa.Column('id', sa.Integer(), primary_key=True, autoincrement=True),
+            sa.Column('tenant', sa.String(), nullable=False),
+            sa.Column('window', sa.String(), nullable=False),
+            sa.Column('captured_at', sa.DateTime(timezone=True), server_default=sa.func.now()),
+            sa.Column('source_file', sa.String(), nullable=True),
+            sa.Column('build_id', sa.String(), nullable=True),
+            sa.Column('row_count', sa.Integer(), nullable=True),
+        )
+    conn.exec_driver_sql(
+        'CREATE INDEX IF NOT EXISTS ix_lbc_tenant_window_id ON leaderboard_captures (tenant, "window", id)'
+    )
+
+    if 'leaderboard_snapshots' not in tables:
+        return
+    cols = {c['name'] for c in sa.inspect(conn).get_columns('leaderboard_snapshots')}
+    if 'capture_id' not in cols:
+        # SQLite: FK-Constraint lässt sich per ALTER nicht nachrüsten, das Model deklariert ihn
+        op.add_column('leaderboard_snapshots', sa.Column('capture_id', sa.Integer(), nullable=True))
+    conn.exec_driver_sql(
+        'CREATE INDEX IF NOT EXISTS ix_lbs_capture_user ON leaderboard_snapshots (capture_id, user_id)'
+    )
+
+    _backfill_captures(conn)
+
+
+# Lücke zwischen zwei Zeilen derselben Datei, ab der ein neuer Normalisierungslauf beginnt
+_RUN_GAP_SECONDS = 60
+
+
+def _parse_ts(value):
+    if isinstance(value, datetime):
+        return value
+    try:
+        return datetime.fromisoformat(str(value))
+    except (TypeError, ValueError):
+        return None
+
+
+def _capture_runs(rows):
+    """
+    Zerlegt Alt-Zeilen (id, tenant, window, source_file, build_id, captured_at, user_id) in
+    Normalisierungsläufe. Dieselbe Datei kann mehrfach normalisiert worden sein: innerhalb von
+    (tenant, window, source_file, build_id) beginnt ein neuer Lauf, sobald ein user_id erneut
+    auftaucht oder zwischen zwei Zeilen mehr als _RUN_GAP_SECONDS liegen.
+    """
+    runs, current, key, seen, last_ts = [], None, None, set(), None
+    for row in sorted(rows, key=lambda r: (r[1], r[2], r[3] or "", r[4] or "", r[0])):
+        row_key, ts = row[1:5], _parse_ts(row[5])
+        gap = ts is not None and last_ts is not None and (ts - last_ts).total_seconds() > _RUN_GAP_SECONDS
+        if current is None or row_key != key or row[6] in seen or gap:
+            current, key, seen = [], row_key, set()
+            runs.append(current)
+        current.append(row)
+        seen.add(row[6])
+        last_ts = ts if ts is not None else last_ts
+    # chronologisch nummerieren: frühester Zeitstempel, dann kleinste id
+    runs.sort(key=lambda run: (_first_ts(run) or "", run[0][0]))
+    return runs
+
+
+def _first_ts(run):
+    return min((str(r[5]) for r in run if r[5] is not None), default=None)
+
+
+def _backfill_captures(conn):
+    """Bisher hatte jede Zeile ihren eigenen Zeitstempel – je Normalisierungslauf ein Capture."""
+    rows = conn.exec_driver_sql(
+        'SELECT id, tenant, "window", source_file, build_id, captured_at, user_id '
+        'FROM leaderboard_snapshots WHERE capture_id IS NULL'
+    ).fetchall()
+    for run in _capture_runs(rows):
+        first = run[0]
+        res = conn.exec_driver_sql(
+            'INSERT INTO leaderboard_captures (tenant, "window", captured_at, source_file, build_id, row_count) '
+            'VALUES (?, ?, ?, ?, ?, ?)',
+            (first[1], first[2], _first_ts(run), first[3], first[4], len(run)),
+        )
+        conn.exec_driver_sql(
+            'UPDATE leaderboard_snapshots SET capture_id = ? WHERE id = ?',
+            [(res.lastrowid, r[0]) for r in run],
+        )
+
+
+def downgrade() -> None:
+    try:
+        op.drop_index('ix_lbs_capture_user', table_name='leaderboard_snapshots')
+        op.drop_column('leaderboard_snapshots', 'capture_id')
+    except Exception:
+        # best-effort für ältere SQLite-Versionen ohne DROP COLUMN
+        pass
+    try:
+        op.drop_table('leaderboard_captures')
+    except Exception:
+        pass
@@ -0,0 +1,31 @@
+"""(tenant, joined_at_utc) index on members for the joiners window
+
+Revision ID: 20261017_member_joined_idx
+Revises: 20261017_member_points_idx
+Create Date: 2026-10-17 00:30:00.000000
+"""
+from alembic import op  # type: ignore
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '20261017_member_joined_idx'
+down_revision = '20261017_member_points_idx'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    if 'members' not in set(sa.inspect(conn).get_table_names()):
+        return
+    cols = {c['name'] for c in sa.inspect(conn).get_columns('members')}
+    if 'joined_at_utc' not in cols:
+        return
+    conn.exec_driver_sql(
+        'CREATE INDEX IF NOT EXISTS ix_members_tenant_joined ON members (tenant, joined_at_utc)'
+    )
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    conn.exec_driver_sql('DROP INDEX IF EXISTS ix_members_tenant_joined')
@@ -0,0 +1,32 @@
+"""composite (tenant, points_*) indexes on members for tenant top-N
+
+Revision ID: 20261017_member_points_idx
+Revises: 20261017_hot_path_indexes
+Create Date: 2026-10-17 00:20:00.000000
+"""
+from alembic import op  # type: ignore
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '20261017_member_points_idx'
+down_revision = '20261017_hot_path_indexes'
+branch_labels = None
+depends_on = None
+
+_WINDOWS = ('7d', '30d', 'all')
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    if 'members' not in set(sa.inspect(conn).get_table_names()):
+        return
+    for w in _WINDOWS:
+        conn.exec_driver_sql(
+            f'CREATE INDEX IF NOT EXISTS ix_members_tenant_points_{w} ON members (tenant, points_{w})'
+        )
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    for w in _WINDOWS:
+        conn.exec_driver_sql(f'DROP INDEX IF EXISTS ix_members_tenant_points_{w}')
@@ -0,0 +1,76 @@
+"""Micro-benchmark: get_in vs. precompiled field accessors for member normalization.
+
+Usage:
+    python scripts/bench_field_paths.py [--file RAW] [--slug hoomans] [--repeat 5]
+
+Uses a recorded members payload (--file, or the newest members capture of --slug from the
+RAW store). Without one, a synthetic page of 1000 members in the Skool shape is used.
+Both variants are checked to produce identical records before timing.
+"""
+from __future__ import annotations
+import argparse
+import json
+import timeit
+
+from skoolhud.normalizer import FIELDS, _FIELD_ACCESSORS
+from skoolhud.utils import get_in, find_member_entries, latest_raw_file
+
+
+def _synthetic(n: int = 1000) -> dict:
+    users = []
+    for i in range(n):
+        users.append({
+            "user": {"id": f"u{i}", "name": f"handle-{i}", "firstName": f"First{i}", "lastName": "X",
+                     "metadata": {"bio": "hi", "location": "Berlin", "lastOffline": "2025-09-01T10:00:00Z",
+                                  "spData": json.dumps({"pts": i, "lv": 2})}},
+            "member": {"id": f"m{i}", "role": "member", "createdAt": "2025-01-01T00:00:00Z",
+                       "approvedAt": "2025-01-02T00:00:00Z", "metadata": {}},
+        })
+    return {"pageProps": {"users": users}}
+
+
+def _load_payload(args) -> tuple[dict, str]:
+    path = args.file
+    if path is None and args.slug:
+        from skoolhud.config import settings
+        path = latest_raw_file(settings.raw_dir, args.slug, "members")
+    if path:
+        from skoolhud.raw_store import load_raw
+        return load_raw(path), path
+    return _synthetic(), "synthetic (1000 members)"
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--file", default=None, help="recorded members payload (raw json/.gz/.zst)")
+    ap.add_argument("--slug", default=None, help="use the newest members capture of this tenant")
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args(argv)
+
+    payload, source = _load_payload(args)
+    nodes = list(find_member_entries(payload))
+    if not nodes:
+        print(f"no member entries in {source}")
+        return 1
+
+    def with_get_in():
+        return [{f: get_in(n, p) for f, p in FIELDS.items()} for n in nodes]
+
+    def with_compiled():
+        return [{f: acc(n) for f, acc in _FIELD_ACCESSORS} for n in nodes]
+
+    assert with_get_in() == with_compiled(), "compiled accessors differ from get_in"
+
+    number = max(1, 20000 // len(nodes))
+    t_old = min(timeit.repeat(with_get_in, number=number, repeat=args.repeat)) / number
+    t_new = min(timeit.repeat(with_compiled, number=number, repeat=args.repeat)) / number
+
+    print(f"payload: {source} — {len(nodes)} entries x {len(FIELDS)} fields")
+    print(f"get_in:   {t_old * 1e3:8.2f} ms/page  ({t_old / len(nodes) * 1e6:6.2f} µs/entry)")
+    print(f"compiled: {t_new * 1e3:8.2f} ms/page  ({t_new / len(nodes) * 1e6:6.2f} µs/entry)")
+    print(f"speedup:  {t_old / t_new:.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
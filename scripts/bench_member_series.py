@@ -0,0 +1,81 @@
+"""Benchmark: SnapshotSeries load + metrics over member_daily_snapshot.
+
+Usage:
+    python scripts/bench_member_series.py [--members 2000] [--days 180] [--repeat 3]
+    python scripts/bench_member_series.py --slug hoomans      # real history from settings.db_path
+
+Without --slug a temporary SQLite database is filled with synthetic daily snapshots
+(members x days, ~10% missing days) for tenant "bench". Load time (one query + matrix build)
+and the vectorized metrics (summary()) are timed separately.
+"""
+from __future__ import annotations
+import argparse
+import os
+import tempfile
+import timeit
+from datetime import date, timedelta
+
+import numpy as np
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from skoolhud.db import Base
+from skoolhud.member_series import SnapshotSeries
+from skoolhud.models import MemberDailySnapshot
+
+
+def _fill(engine, members: int, days: int):
+    rng = np.random.default_rng(0)
+    gains = rng.poisson(2.0, size=(members, days)) * (rng.random((members, days)) < 0.4)
+    points = np.cumsum(gains, axis=1)
+    keep = rng.random((members, days)) > 0.1
+    start = date(2025, 1, 1)
+    day_list = [start + timedelta(days=d) for d in range(days)]
+    rows = [
+        {"tenant": "bench", "user_id": f"u{m}", "day": day_list[d], "points_all": int(points[m, d]),
+         "rank_all": int(rng.integers(1, members + 1))}
+        for m, d in zip(*np.nonzero(keep))
+    ]
+    with engine.begin() as conn:
+        for i in range(0, len(rows), 50000):
+            conn.execute(insert(MemberDailySnapshot), rows[i:i + 50000])
+    return len(rows)
+
+
+def _bench(session, tenant: str, repeat: int):
+    series = SnapshotSeries.load(session, tenant)
+    t_load = min(timeit.repeat(lambda: SnapshotSeries.load(session, tenant), number=1, repeat=repeat))
+    t_calc = min(timeit.repeat(series.summary, number=1, repeat=repeat))
+    cells = int((~np.isnan(series.values["points_all"])).sum()) if len(series) else 0
+    print(f"tenant {tenant}: {len(series)} members x {len(series.days)} days ({cells} member-days)")
+    print(f"load:    {t_load * 1e3:8.1f} ms")
+    print(f"metrics: {t_calc * 1e3:8.1f} ms")
+    print(f"total:   {(t_load + t_calc) * 1e3:8.1f} ms")
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--members", type=int, default=2000)
+    ap.add_argument("--days", type=int, default=180)
+    ap.add_argument("--slug", default=None, help="benchmark the real history of this tenant")
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args(argv)
+
+    if args.slug:
+        from skoolhud.db import SessionLocal
+        with SessionLocal() as s:
+            _bench(s, args.slug, args.repeat)
+        return 0
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}", future=True)
+        Base.metadata.create_all(engine)
+        _fill(engine, args.members, args.days)
+        with sessionmaker(bind=engine, future=True)() as s:
+            _bench(s, "bench", args.repeat)
+        engine.dispose()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,68 @@
+"""Benchmark: leaderboard_delta.top_movers (tenant-scoped SQL ORDER BY/LIMIT) vs. the old
+untenanted load-everything-and-sort-in-Python variant, for growing member tables.
+
+Usage:
+    python scripts/bench_top_movers.py [--sizes 10000,100000,400000] [--tenants 20] [--repeat 5]
+
+For each size a temporary SQLite database with the current schema (incl. the
+ix_members_tenant_points_* indexes) is filled with synthetic members spread over --tenants
+tenants. The SQL variant should stay roughly flat while the Python sort grows with the table.
+"""
+from __future__ import annotations
+import argparse
+import os
+import random
+import tempfile
+import timeit
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from skoolhud.agents.leaderboard_delta import top_movers
+from skoolhud.db import Base
+from skoolhud.models import Member
+
+
+def _legacy_top(session, window: str, topn: int = 15):
+    col = {"7d": Member.points_7d, "30d": Member.points_30d}.get(window, Member.points_all)
+    rows = session.query(Member.name, col).filter(col != None).all()
+    return sorted(rows, key=lambda row: row[1], reverse=True)[:topn]
+
+
+def _fill(engine, n: int, tenants: int):
+    rnd = random.Random(n)
+    rows = [
+        {"tenant": f"t{i % tenants}", "user_id": f"u{i}", "name": f"Member {i}",
+         "points_7d": rnd.randint(0, 200), "points_30d": rnd.randint(0, 800), "points_all": rnd.randint(0, 20000)}
+        for i in range(n)
+    ]
+    with engine.begin() as conn:
+        for start in range(0, n, 50000):
+            conn.execute(insert(Member), rows[start:start + 50000])
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sizes", default="10000,100000,400000", help="comma-separated member counts")
+    ap.add_argument("--tenants", type=int, default=20)
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args(argv)
+
+    print(f"{'members':>9}  {'sql top-N':>10}  {'python sort':>12}")
+    for n in (int(x) for x in args.sizes.split(",") if x.strip()):
+        with tempfile.TemporaryDirectory() as tmp:
+            engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}", future=True)
+            Base.metadata.create_all(engine)
+            _fill(engine, n, args.tenants)
+            with sessionmaker(bind=engine, future=True)() as s:
+                t_sql = min(timeit.repeat(lambda: [top_movers(s, "t0", w) for w in ("7d", "30d", "all")],
+                                          number=1, repeat=args.repeat))
+                t_py = min(timeit.repeat(lambda: [_legacy_top(s, w) for w in ("7d", "30d", "all")],
+                                         number=1, repeat=args.repeat))
+            engine.dispose()
+        print(f"{n:>9}  {t_sql * 1e3:>8.2f}ms  {t_py * 1e3:>10.2f}ms")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,116 @@
+"""Check the query plans of the hot agent/CLI queries with EXPLAIN QUERY PLAN.
+
+Usage:
+    python scripts/explain_hot_queries.py [--db skool.db] [--quiet]
+
+For every query shape below the plan is printed; a `SCAN <table>` (a full table scan that
+gets slower as history grows) is reported as a failure and the script exits with code 1.
+Run it after `alembic upgrade head` to confirm the composite indexes are picked up.
+"""
+from __future__ import annotations
+import argparse
+import sqlite3
+import sys
+from pathlib import Path
+
+PARAMS = {"tenant": "t", "window": "7", "ts": "2025-01-01 00:00:00", "uid": "u", "day": "2025-01-01",
+          "day_to": "2025-01-31", "cur": 2, "prev": 1}
+
+QUERIES = {
+    "delta: last two captures": """
+        SELECT id, captured_at FROM leaderboard_captures
+        WHERE tenant = :tenant AND "window" = :window
+        ORDER BY id DESC LIMIT 2
+    """,
+    "delta: capture self-join": """
+        SELECT cur.user_id, cur.points, cur.rank, old.points, old.rank, m.name
+        FROM leaderboard_snapshots AS cur
+        LEFT JOIN leaderboard_snapshots AS old ON old.capture_id = :prev AND old.user_id = cur.user_id
+        LEFT JOIN members AS m ON m.tenant = :tenant AND m.user_id = cur.user_id
+        WHERE cur.capture_id = :cur
+        UNION ALL
+        SELECT old.user_id, NULL, NULL, old.points, old.rank, m.name
+        FROM leaderboard_snapshots AS old
+        LEFT JOIN leaderboard_snapshots AS cur ON cur.capture_id = :cur AND cur.user_id = old.user_id
+        LEFT JOIN members AS m ON m.tenant = :tenant AND m.user_id = old.user_id
+        WHERE old.capture_id = :prev AND cur.user_id IS NULL
+    """,
+    "leaderboard: window history": """
+        SELECT user_id, points, rank FROM leaderboard_snapshots
+        WHERE tenant = :tenant AND "window" = :window AND captured_at >= :ts
+        ORDER BY captured_at DESC
+    """,
+    "daily: upsert lookup": """
+        SELECT id FROM member_daily_snapshot
+        WHERE tenant = :tenant AND user_id = :uid AND day = :day
+    """,
+    "daily: tenant day range": """
+        SELECT user_id, day, points_all FROM member_daily_snapshot
+        WHERE tenant = :tenant AND day BETWEEN :day AND :day_to
+    """,
+    "movers: tenant top-N": """
+        SELECT name, points_7d FROM members
+        WHERE tenant = :tenant AND points_7d IS NOT NULL
+        ORDER BY points_7d DESC, id LIMIT 15
+    """,
+    "joiners: tenant 30d window": """
+        SELECT name, joined_at_utc, skool_tag FROM members
+        WHERE tenant = :tenant AND joined_at_utc >= :day
+    """,
+    "series: tenant history": """
+        SELECT user_id, group_concat(substr(day, 1, 10)), group_concat(coalesce(points_all, 'nan'))
+        FROM member_daily_snapshot WHERE tenant = :tenant GROUP BY user_id ORDER BY user_id
+    """,
+    "members: tenant lookup": """
+        SELECT user_id, name FROM members WHERE tenant = :tenant AND user_id = :uid
+    """,
+}
+
+
+def full_scans(plan_rows) -> list[str]:
+    """Plan details that read a whole table (`SCAN <table|alias>`); SEARCH ... USING INDEX is fine."""
+    return [d for d in plan_rows if d.startswith("SCAN ") and not d.startswith(("SCAN CONSTANT", "SCAN SUBQUERY"))]
+
+
+def explain(conn: sqlite3.Connection, sql: str) -> list[str]:
+    return [row[3] for row in conn.execute("EXPLAIN QUERY PLAN " + sql, PARAMS)]
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--db", default=None, help="SQLite file (default: settings.db_path)")
+    ap.add_argument("--quiet", action="store_true", help="only print failures")
+    args = ap.parse_args(argv)
+
+    db = args.db
+    if db is None:
+        # started as `python scripts/explain_hot_queries.py` from a checkout: make the repo root importable
+        sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+        from skoolhud.config import settings
+        db = settings.db_path
+
+    conn = sqlite3.connect(db)
+    failures = 0
+    try:
+        for name, sql in QUERIES.items():
+            try:
+                plan = explain(conn, sql)
+            except sqlite3.OperationalError as e:
+                print(f"[ERR ] {name}: {e} (did you run alembic upgrade head?)")
+                failures += 1
+                continue
+            bad = full_scans(plan)
+            failures += bool(bad)
+            if bad or not args.quiet:
+                print(f"[{'SCAN' if bad else ' OK '}] {name}")
+                for detail in plan:
+                    print(f"         {detail}")
+    finally:
+        conn.close()
+
+    print(f"{len(QUERIES) - failures}/{len(QUERIES)} query shapes use an index")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -359,7 +359,7 @@ def post_new_joiners(tenant: str):
     try:
         from skoolhud.db import SessionLocal
         from skoolhud.models import Member
-        from dateutil import parser as dtparser
+        from skoolhud.utils.timestamps import to_utc
         from datetime import datetime, timezone
 
         now = datetime.utcnow().replace(tzinfo=timezone.utc)
@@ -373,11 +373,8 @@ def post_new_joiners(tenant: str):
                 jd = getattr(m, 'joined_date', None)
                 if not jd:
                     continue
-                try:
-                    dt = dtparser.parse(jd)
-                    if dt.tzinfo is None:
-                        dt = dt.replace(tzinfo=timezone.utc)
-                except Exception:
+                dt = to_utc(jd)
+                if dt is None:
                     # ignore unparsable
                     continue
                 delta = now - dt
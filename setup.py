@@ -14,10 +14,15 @@ setup(
         "pydantic>=2.0.0",
         "python-dateutil>=2.8.2",
         "orjson>=3.8.0",
+        "numpy>=1.24",
         "requests>=2.31.0",
         "beautifulsoup4>=4.12.0",
         "lxml>=4.9.0",
     ],
+    extras_require={
+        # inkrementelles Parsen großer RAW-Payloads (--stream)
+        "stream": ["ijson>=3.2"],
+    },
     entry_points={
         "console_scripts": [
             "skoolhud=skoolhud.cli:app",
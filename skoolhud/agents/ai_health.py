@@ -1,11 +1,11 @@
 #!/usr/bin/env python3
 from __future__ import annotations
+import argparse
 import os
 from datetime import datetime
 from skoolhud.utils import reports_dir_for
 from skoolhud.config import get_tenant_slug
-from skoolhud.db import SessionLocal
-from skoolhud.models import Member
+from skoolhud.member_frame import get_frame
 from skoolhud.ai.tools import llm_complete
 from skoolhud.ai.tools import discord_report_post, STATUS_DIR
 import json
@@ -14,17 +14,16 @@ import os
 
 
 def find_at_risk(tenant: str):
-    s = SessionLocal()
-    try:
-        rows = s.query(Member.user_id, Member.name, Member.points_30d, Member.points_all, Member.last_active_at_utc).filter(Member.tenant == tenant).all()
-    finally:
-        s.close()
-    at_risk = [r for r in rows if (r[2] or 0) < 5 and (r[3] or 0) > 50]
-    return at_risk
+    # Punkte im letzten Monat fast null, aber historisch aktiv
+    frame = get_frame(tenant)
+    return frame.rows(frame.mask("points_30d<5 & points_all>50"),
+                      "user_id", "name", "points_30d", "points_all", "last_active_at_utc")
 
 
-def main(slug: str | None = None) -> int:
-    slug = get_tenant_slug(slug)
+def main(argv: list[str] | None = None) -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--slug", default=None)
+    slug = get_tenant_slug(ap.parse_args(argv).slug)
     out_dir = reports_dir_for(slug)
     at_risk = find_at_risk(slug)
     sample = at_risk[:10]
@@ -1,5 +1,6 @@
 #!/usr/bin/env python3
 from __future__ import annotations
+import argparse
 import os
 from datetime import datetime
 from skoolhud.utils import reports_dir_for
@@ -13,8 +14,10 @@ import os
 from datetime import timezone
 
 
-def main(slug: str | None = None) -> int:
-    slug = get_tenant_slug(slug)
+def main(argv: list[str] | None = None) -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--slug", default=None)
+    slug = get_tenant_slug(ap.parse_args(argv).slug)
     out_dir = reports_dir_for(slug)
     kpis = generate_kpi(slug)
 
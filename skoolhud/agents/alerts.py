@@ -41,11 +41,11 @@ def _format_alert(row: dict) -> str:
 	return summary
 
 
-def main() -> None:
+def main(argv: list[str] | None = None) -> None:
 	ap = argparse.ArgumentParser(description="Write tenantized alerts to exports/reports/<slug>/alerts.md")
 	ap.add_argument("--slug", default=None)
 	ap.add_argument("--limit", type=int, default=100, help="Max number of alerts to include")
-	args = ap.parse_args()
+	args = ap.parse_args(argv)
 	from skoolhud.config import get_tenant_slug
 	args.slug = get_tenant_slug(args.slug)
 
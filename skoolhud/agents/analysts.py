@@ -1,8 +1,7 @@
 from __future__ import annotations
 from typing import Any, Dict
 from datetime import datetime
-from skoolhud.db import SessionLocal
-from skoolhud.models import Member
+from skoolhud.member_frame import get_frame
 import os
 from skoolhud.ai.tools import llm_complete
 
@@ -18,13 +17,10 @@ class KPIAnalyst(BaseAnalyst):
     name = 'kpi'
 
     def analyze(self, tenant: str) -> Dict[str, Any]:
-        s = SessionLocal()
-        try:
-            total = s.query(Member).filter(Member.tenant == tenant).count()
-            active7 = s.query(Member).filter((Member.points_7d != None) & (Member.points_7d > 0) & (Member.tenant == tenant)).count()
-            active30 = s.query(Member).filter((Member.points_30d != None) & (Member.points_30d > 0) & (Member.tenant == tenant)).count()
-        finally:
-            s.close()
+        frame = get_frame(tenant)
+        total = len(frame)
+        active7 = frame.count("points_7d>0")
+        active30 = frame.count("points_30d>0")
 
         insights = {
             'summary': f"{total} members; active7={active7}; active30={active30}",
@@ -40,12 +36,8 @@ class HealthAnalyst(BaseAnalyst):
     name = 'health'
 
     def analyze(self, tenant: str) -> Dict[str, Any]:
-        s = SessionLocal()
-        try:
-            rows = s.query(Member.user_id, Member.name, Member.points_30d, Member.points_all, Member.last_active_at_utc).filter(Member.tenant == tenant).all()
-        finally:
-            s.close()
-        at_risk = [r for r in rows if (r[2] or 0) < 5 and (r[3] or 0) > 50]
+        frame = get_frame(tenant)
+        at_risk = frame.rows(frame.mask("points_30d<5 & points_all>50"), "user_id", "name")
         insights = {
             'summary': f'Found {len(at_risk)} at-risk members',
             'at_risk_count': len(at_risk),
@@ -1,10 +1,11 @@
 import argparse
 import os
 from datetime import date, datetime, timedelta
-from dateutil import parser as dtparser
-from skoolhud.db import SessionLocal
+from sqlalchemy import func, null, select
+from skoolhud.db import SessionLocal, table_columns
 from skoolhud.models import Member
 from skoolhud.utils import reports_dir_for
+from skoolhud.utils.timestamps import parse_timestamp, to_utc
 from skoolhud.ai.tools import discord_report_post
 from skoolhud.ai.tools import STATUS_DIR
 import json
@@ -13,19 +14,49 @@ import os
 from datetime import timezone
 
 def _to_dt(x):
-    if x is None:
-        return None
-    if isinstance(x, datetime):
-        return x
-    try:
-        return dtparser.parse(str(x))
-    except Exception:
-        return None
+    # Offset bleibt erhalten (naive bleibt naiv); fromisoformat-Fast-Path + Cache
+    return parse_timestamp(x)
+
+
+def joiners_in_window(s, tenant: str, cutoff_30: date, start_this_week: date, start_last_week: date, end_last_week: date):
+    """
+    Joiner des Tenants seit cutoff_30 als (name, joined_dt, skool_tag, in_week, in_last_week).
+    Mit joined_at_utc (ISO-UTC, lexikografisch sortierbar) ist das eine Range-Query über
+    ix_members_tenant_joined; die Wochen-Zuordnung passiert per substr(…, 1, 10) in SQL und
+    nur die Zeilen im Fenster werden geparst. Ohne die Spalte (alte DB) Fallback auf joined_date.
+    """
+    cols = table_columns(s, "members")
+    tag = Member.skool_tag if "skool_tag" in cols else null()
+    if "joined_at_utc" in cols:
+        day = func.substr(Member.joined_at_utc, 1, 10)
+        q = (
+            select(
+                Member.name,
+                Member.joined_at_utc,
+                tag,
+                (day >= start_this_week.isoformat()).label("in_week"),
+                day.between(start_last_week.isoformat(), end_last_week.isoformat()).label("in_last_week"),
+            )
+            .where(Member.tenant == tenant, Member.joined_at_utc >= cutoff_30.isoformat())
+            .order_by(Member.id)
+        )
+        return [(name, to_utc(j), t, bool(w), bool(lw)) for name, j, t, w, lw in s.execute(q)]
+
+    out = []
+    q = select(Member.name, Member.joined_date, tag).where(Member.tenant == tenant, Member.joined_date != None).order_by(Member.id)
+    for name, jd, t in s.execute(q):
+        dt = _to_dt(jd)
+        if not dt or dt.date() < cutoff_30:
+            continue
+        d = dt.date()
+        out.append((name, dt, t, d >= start_this_week, start_last_week <= d <= end_last_week))
+    return out
 
-def main():
+
+def main(argv=None):
     ap = argparse.ArgumentParser()
     ap.add_argument("--slug", default=None)
-    args = ap.parse_args()
+    args = ap.parse_args(argv)
     from skoolhud.config import get_tenant_slug
     args.slug = get_tenant_slug(args.slug)
 
@@ -40,19 +71,7 @@ def main():
 
     s = SessionLocal()
     try:
-        # detect whether the members table has a skool_tag column
-        try:
-            from sqlalchemy import text
-            cols = [r[1] for r in s.execute(text("PRAGMA table_info(members)"))]
-            has_skool = "skool_tag" in cols
-        except Exception:
-            has_skool = False
-
-        if has_skool:
-            rows = s.query(Member.name, Member.joined_date, Member.skool_tag).filter(Member.joined_date != None).all()
-        else:
-            # return rows with None for skool_tag
-            rows = [(r[0], r[1], None) for r in s.query(Member.name, Member.joined_date).filter(Member.joined_date != None).all()]
+        rows = joiners_in_window(s, args.slug, cutoff_30, start_this_week, start_last_week, end_last_week)
     finally:
         s.close()
 
@@ -91,26 +110,15 @@ def main():
     last_week = []
     d30 = []
     seen = set()
-    for row in rows:
-        # rows may be tuples (name, joined_date, skool_tag) or (name, joined_date, None)
-        if len(row) == 3:
-            name, jd, skool_tag = row
-            user_id = None
-        else:
-            name, jd = row[0], row[1]
-            skool_tag = None
-            user_id = None
-        dt = _to_dt(jd)
+    for name, dt, skool_tag, in_week, in_last_week in rows:
         if not dt:
             continue
-        d = dt.date()
-        entry = fmt_entry(name or "(no name)", dt, skool_tag, user_id)
-        if d >= start_this_week and name not in seen:
+        entry = fmt_entry(name or "(no name)", dt, skool_tag)
+        if in_week and name not in seen:
             week.append(entry); seen.add(name)
-        if start_last_week <= d <= end_last_week:
+        if in_last_week:
             last_week.append(entry)
-        if d >= cutoff_30:
-            d30.append(entry)
+        d30.append(entry)
 
     # write files (names only)
     (out_dir / "new_joiners_week.md").write_text("\n".join([f"- {n}" for n in week]) + ("\n" if week else ""), encoding="utf-8")
@@ -5,35 +5,37 @@ from skoolhud.models import Member
 from skoolhud.utils import reports_dir_for
 
 
-def top_movers(session, window: str, topn: int = 15):
-    # window in {"7d","30d","all"}
-    if window == "7d":
-        q = session.query(Member.name, Member.points_7d).filter(Member.points_7d != None)
-        order_key = lambda row: row[1]
-    elif window == "30d":
-        q = session.query(Member.name, Member.points_30d).filter(Member.points_30d != None)
-        order_key = lambda row: row[1]
-    else:
-        q = session.query(Member.name, Member.points_all).filter(Member.points_all != None)
-        order_key = lambda row: row[1]
-
-    rows = q.all()
-    rows = sorted(rows, key=order_key, reverse=True)[:topn]
-    return rows
-
-def main():
+_POINTS = {"7d": Member.points_7d, "30d": Member.points_30d, "all": Member.points_all}
+
+
+def top_movers(session, tenant: str, window: str, topn: int = 15):
+    """
+    Top-N (name, punkte) eines Tenants für window in {"7d","30d","all"}. Sortierung und LIMIT
+    laufen in SQLite über ix_members_tenant_points_* – die Kosten hängen an topn, nicht an der
+    Größe der members-Tabelle. Gleichstand: Einfügereihenfolge.
+    """
+    col = _POINTS.get(window, Member.points_all)
+    return (
+        session.query(Member.name, col)
+        .filter(Member.tenant == tenant, col != None)
+        .order_by(col.desc(), Member.id)
+        .limit(topn)
+        .all()
+    )
+
+def main(argv=None):
     ap = argparse.ArgumentParser()
     ap.add_argument("--slug", default=None)
-    args = ap.parse_args()
+    args = ap.parse_args(argv)
     from skoolhud.config import get_tenant_slug
     args.slug = get_tenant_slug(args.slug)
 
     out_dir = reports_dir_for(args.slug)
     s = SessionLocal()
     try:
-        movers7 = top_movers(s, "7d")
-        movers30 = top_movers(s, "30d")
-        moversAll = top_movers(s, "all")
+        movers7 = top_movers(s, args.slug, "7d")
+        movers30 = top_movers(s, args.slug, "30d")
+        moversAll = top_movers(s, args.slug, "all")
 
         lines = []
         lines.append("# Leaderboard Movers (Heuristic)")
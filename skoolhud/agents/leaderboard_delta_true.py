@@ -1,7 +1,8 @@
 # REPLACE FILE: copied from ai/agents
 import argparse
-from skoolhud.db import SessionLocal
-from skoolhud.models import Member, LeaderboardSnapshot
+from sqlalchemy import and_, literal, null, select, union_all
+from skoolhud.db import SessionLocal, table_columns
+from skoolhud.models import Member, LeaderboardSnapshot, LeaderboardCapture
 from skoolhud.utils import reports_dir_for
 
 WINDOWS = [("all","All-Time"), ("30","Past 30 Days"), ("7","Past 7 Days")]
@@ -9,34 +10,56 @@ _rank = lambda r: r if isinstance(r,int) else 10**9
 _fmt  = lambda v: f"+{v}" if v>0 else str(v)
 
 def _latest_two(s, slug, window):
-    q=(s.query(LeaderboardSnapshot.captured_at)
-        .filter(LeaderboardSnapshot.tenant==slug)
-        .filter(LeaderboardSnapshot.window==window)
-        .order_by(LeaderboardSnapshot.captured_at.desc()))
-    seen=[]; last=None
-    for (ts,) in q:
-        if last is None or ts!=last: seen.append(ts); last=ts
-        if len(seen)==2: break
-    return (seen[0], seen[1]) if seen else (None, None)
+    """Die zwei neuesten Captures (id, captured_at) eines Fensters – Index-Lookup statt Historien-Scan."""
+    rows=(s.query(LeaderboardCapture.id, LeaderboardCapture.captured_at)
+        .filter(LeaderboardCapture.tenant==slug)
+        .filter(LeaderboardCapture.window==window)
+        .order_by(LeaderboardCapture.id.desc())
+        .limit(2).all())
+    return (rows[0], rows[1]) if len(rows)==2 else (rows[0] if rows else None, None)
 
-def _snap_map(s, slug, window, ts):
-    if not ts: return {}
-    rows=(s.query(LeaderboardSnapshot.user_id, LeaderboardSnapshot.points, LeaderboardSnapshot.rank)
-           .filter(LeaderboardSnapshot.tenant==slug)
-           .filter(LeaderboardSnapshot.window==window)
-           .filter(LeaderboardSnapshot.captured_at==ts).all())
-    return {u:(p or 0, r) for u,p,r in rows}
+def _has_captures(s):
+    """Capture-Tabelle und snapshots.capture_id gibt es erst nach der Migration (alte DB -> False)."""
+    return bool(table_columns(s, "leaderboard_captures")) and "capture_id" in table_columns(s, "leaderboard_snapshots")
 
-def _names(s, ids):
-    if not ids: return {}
-    rows=s.query(Member.user_id, Member.name).filter(Member.user_id.in_(list(ids))).all()
-    return {u:(n or f"user:{u}") for u,n in rows}
+def _delta_rows(s, slug, cur_id, prev_id):
+    """
+    Ein SQL-Self-Join über beide Captures: (user_id, p_new, r_new, p_old, r_old, in_cur, in_old, name).
+    FULL OUTER JOIN gibt es in älterem SQLite nicht, daher cur⟕old ∪ (old ohne Treffer in cur).
+    """
+    snap=LeaderboardSnapshot.__table__; m=Member.__table__
+    cur=snap.alias("cur"); old=snap.alias("old")
+    kept=(select(cur.c.user_id, cur.c.points.label("p_new"), cur.c.rank.label("r_new"),
+                 old.c.points.label("p_old"), old.c.rank.label("r_old"),
+                 literal(True).label("in_cur"), old.c.user_id.is_not(None).label("in_old"))
+          .select_from(cur.outerjoin(old, and_(old.c.capture_id==prev_id, old.c.user_id==cur.c.user_id)))
+          .where(cur.c.capture_id==cur_id))
+    dropped=(select(old.c.user_id, null(), null(), old.c.points, old.c.rank, literal(False), literal(True))
+          .select_from(old.outerjoin(cur, and_(cur.c.capture_id==cur_id, cur.c.user_id==old.c.user_id)))
+          .where(old.c.capture_id==prev_id, cur.c.user_id.is_(None)))
+    d=union_all(kept, dropped).subquery("d")
+    q=(select(d.c.user_id, d.c.p_new, d.c.r_new, d.c.p_old, d.c.r_old, d.c.in_cur, d.c.in_old, m.c.name)
+       .select_from(d.outerjoin(m, and_(m.c.tenant==slug, m.c.user_id==d.c.user_id))))
+    return s.execute(q).all()
 
-def main():
+def _movers(rows):
+    up,down,new_in,dropped=[],[],[],[]
+    for uid,p_new,r_new,p_old,r_old,in_cur,in_old,name in rows:
+        nm=name or f"user:{uid}"
+        if in_cur and not in_old:  new_in.append((nm, p_new or 0, r_new));  continue
+        if in_old and not in_cur:  dropped.append((nm, p_old or 0, r_old)); continue
+        p_new,p_old=p_new or 0,p_old or 0
+        dr=_rank(r_old)-_rank(r_new); dp=p_new-p_old
+        (up if (dr>0 or dp>0) else down if (dr<0 or dp<0) else up).append((nm,dr,dp,r_old,r_new,p_old,p_new))
+    up=sorted(up,key=lambda t:(t[1],t[2]),reverse=True)[:20]
+    down=sorted(down,key=lambda t:(t[1],t[2]))[:20]
+    return up,down,new_in,dropped
+
+def main(argv=None):
     import argparse
     ap=argparse.ArgumentParser()
     ap.add_argument("--slug", default=None)
-    args=ap.parse_args()
+    args=ap.parse_args(argv)
     from skoolhud.config import get_tenant_slug
     args.slug = get_tenant_slug(args.slug)
 
@@ -44,24 +67,17 @@ def main():
     s=SessionLocal()
     try:
         combined=[f"# Leaderboard Deltas (true history) — {args.slug}\n"]
+        if not _has_captures(s):
+            combined.append("Migration fehlt (alembic upgrade head) – keine Captures, Deltas übersprungen.\n")
+            (out_dir / "leaderboard_delta_true.md").write_text("\n".join(combined), encoding="utf-8")
+            print("SKIP: leaderboard_delta_true – Migration fehlt (alembic upgrade head)")
+            return
         for key,label in WINDOWS:
             latest, prev = _latest_two(s, args.slug, key)
             if not latest or not prev:
                 combined.append(f"## {label}\n(zu wenig Snapshots)\n"); continue
-            cur=_snap_map(s,args.slug,key,latest)
-            old=_snap_map(s,args.slug,key,prev)
-            users=set(cur)|set(old); names=_names(s, users)
-            up,down,new_in,dropped=[],[],[],[]
-            for uid in users:
-                nm=names.get(uid, f"user:{uid}")
-                if uid in cur and uid not in old:  new_in.append((nm, *cur[uid]));  continue
-                if uid in old and uid not in cur:  dropped.append((nm, *old[uid])); continue
-                p_new,r_new=cur.get(uid,(0,None))
-                p_old,r_old=old.get(uid,(0,None))
-                dr=_rank(r_old)-_rank(r_new); dp=(p_new or 0)-(p_old or 0)
-                (up if (dr>0 or dp>0) else down if (dr<0 or dp<0) else up).append((nm,dr,dp,r_old,r_new,p_old,p_new))
-            up=sorted(up,key=lambda t:(t[1],t[2]),reverse=True)[:20]
-            down=sorted(down,key=lambda t:(t[1],t[2]))[:20]
+            up,down,new_in,dropped=_movers(_delta_rows(s, args.slug, latest.id, prev.id))
+            latest, prev = latest.captured_at, prev.captured_at
 
             lines=[f"# {label} — Δ (latest {latest} vs prev {prev})\n","## Up-Movers"]
             lines += ["- (keine)"] if not up else [f"- {n} — rank {ro}→{rn} ({_fmt(dr)}) | pts {po}→{pn} ({_fmt(dp)})" for n,dr,dp,ro,rn,po,pn in up]
@@ -1,42 +1,167 @@
-# REPLACE FILE: copied from ai/agents
-import subprocess, sys
-from pathlib import Path
+"""
+In-Process-Runner für die Report-Agents eines Tenants.
+
+Jeder Agent ist ein Callable `main(argv)` mit deklarierten Inputs (DB-Tabellen, Dateien) und
+Outputs (Reports). Aus Outputs -> Inputs ergibt sich ein DAG; unabhängige Agents laufen
+parallel in einem Thread- (Default) oder Prozess-Pool. Statt eines Subprozesses pro Agent
+(Interpreter-Start + Import von SQLAlchemy/Models pro Skript) wird alles einmal importiert.
+Am Ende steht die Wall-Time pro Agent. Im Thread-Pool teilen sich die Agents den Member-Frame
+des Tenants (skoolhud.member_frame), der so nur einmal geladen wird; Worker-Prozesse laden je eigenen.
+
+    python -m skoolhud.agents.run_all_agents --slug hoomans [--workers 4] [--executor process]
+"""
+from __future__ import annotations
 import argparse
+import importlib
+import time
+import traceback
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from typing import NamedTuple
+
 from skoolhud.config import get_tenant_slug
+from skoolhud.member_frame import shared_frames
+
+
+class Agent(NamedTuple):
+    name: str
+    target: str                      # "modul:funktion", aufgerufen als funktion(["--slug", slug])
+    inputs: tuple[str, ...] = ()     # z. B. "db:members", "file:datalake/members.csv"
+    outputs: tuple[str, ...] = ()    # z. B. "report:alerts.md"
+
+
+AGENTS: tuple[Agent, ...] = (
+    Agent("ai_kpi", "skoolhud.agents.ai_kpi:main", ("db:members",), ("report:ai_kpi_summary",)),
+    Agent("ai_health", "skoolhud.agents.ai_health:main", ("db:members",), ("report:ai_health_plan",)),
+    Agent("leaderboard_delta", "skoolhud.agents.leaderboard_delta:main", ("db:members",),
+          ("report:leaderboard_movers.md",)),
+    Agent("joiners", "skoolhud.agents.joiners:main", ("db:members",),
+          ("report:new_joiners_week.md", "report:new_joiners_last_week.md", "report:new_joiners_30d.md")),
+    Agent("leaderboard_delta_true", "skoolhud.agents.leaderboard_delta_true:main",
+          ("db:leaderboard_captures", "db:leaderboard_snapshots", "db:members"), ("report:leaderboard_delta_true.md",)),
+    Agent("alerts", "skoolhud.agents.alerts:main", ("db:alerts",), ("report:alerts.md",)),
+    Agent("snapshot_report", "skoolhud.agents.snapshot_report:main", ("file:datalake/members.csv",),
+          ("report:snapshot_members.csv", "report:snapshot.md")),
+)
+
+
+class AgentResult(NamedTuple):
+    name: str
+    status: str      # "ok" | "failed" | "skipped"
+    seconds: float
+    error: str = ""
+
+
+def dependencies(agents) -> dict[str, set[str]]:
+    """
+    Agent -> Agents, deren Outputs er als Input braucht. Inputs ohne Erzeuger im Register
+    (DB-Tabellen, externe Dateien) sind Voraussetzungen, keine Kanten. Zyklen -> ValueError.
+    """
+    producers: dict[str, str] = {}
+    for a in agents:
+        for out in a.outputs:
+            producers[out] = a.name
+    deps = {a.name: {producers[i] for i in a.inputs if i in producers and producers[i] != a.name} for a in agents}
+
+    # Kahn: jeder Agent muss in eine Reihenfolge passen
+    remaining = {k: set(v) for k, v in deps.items()}
+    while remaining:
+        ready = [k for k, v in remaining.items() if not v]
+        if not ready:
+            raise ValueError(f"Zyklus in den Agent-Abhängigkeiten: {sorted(remaining)}")
+        for k in ready:
+            del remaining[k]
+        for v in remaining.values():
+            v.difference_update(ready)
+    return deps
 
-AGENTS = [
-    "ai_kpi.py",
-    "ai_health.py",
-    "kpi_report.py",
-    "health_score.py",
-    "leaderboard_delta.py",          # (optional: ebenfalls tenantisieren)
-    "export_members_snapshot.py",
-    "joiners.py",
-    "leaderboard_delta_true.py",
-    "alerts.py",
-    "celebrations.py",
-    "snapshot_report.py",
-]
-
-def run_agent(script: str, slug: str):
-    path = Path(__file__).parent / script
-    print(f"\n--- RUNNING {script} ({slug}) ---\n")
-    if not path.exists():
-        print(f"⚠️ Skipping {script}: file not found at {path}")
-        return
-    res = subprocess.run([sys.executable, str(path), "--slug", slug])
-    if res.returncode != 0:
-        print(f"❌ Fehler bei {script}")
-        sys.exit(res.returncode)
-
-def main():
+
+def _invoke(target: str, slug: str) -> tuple[bool, float, str]:
+    """Führt einen Agent aus (auch im Worker-Prozess): (ok, Sekunden, Fehlertext)."""
+    module, _, func = target.partition(":")
+    t0 = time.perf_counter()
+    try:
+        rc = getattr(importlib.import_module(module), func)(["--slug", slug])
+        ok, err = rc in (None, 0, True), "" if rc in (None, 0, True) else f"Rückgabewert {rc}"
+    except SystemExit as e:  # argparse / sys.exit im Agent
+        ok, err = e.code in (None, 0), f"SystemExit({e.code})"
+    except Exception:
+        ok, err = False, traceback.format_exc(limit=5)
+    return ok, time.perf_counter() - t0, "" if ok else err
+
+
+def run_agents(slug: str, agents=AGENTS, workers: int = 4, executor: str = "thread") -> list[AgentResult]:
+    """
+    Führt die Agents als DAG aus: ein Agent startet, sobald alle Erzeuger seiner Inputs
+    erfolgreich waren; schlägt ein Erzeuger fehl, wird er übersprungen. Liefert die Ergebnisse
+    in Registerreihenfolge.
+    """
+    deps = dependencies(agents)
+    by_name = {a.name: a for a in agents}
+    results: dict[str, AgentResult] = {}
+    pool_cls = ProcessPoolExecutor if executor == "process" else ThreadPoolExecutor
+
+    with shared_frames(), pool_cls(max_workers=max(1, int(workers))) as pool:
+        running = {}
+        while len(results) < len(by_name):
+            for name, need in deps.items():
+                if name in results or name in running.values():
+                    continue
+                failed = [d for d in need if d in results and results[d].status != "ok"]
+                if failed:
+                    results[name] = AgentResult(name, "skipped", 0.0, f"Abhängigkeit fehlgeschlagen: {', '.join(sorted(failed))}")
+                    print(f"--- SKIP {name} ({slug}): {results[name].error}")
+                elif all(d in results for d in need):
+                    print(f"--- START {name} ({slug})")
+                    running[pool.submit(_invoke, by_name[name].target, slug)] = name
+            if not running:
+                continue  # nur Skips in dieser Runde – neu auswerten
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for fut in done:
+                name = running.pop(fut)
+                try:
+                    ok, secs, err = fut.result()
+                except Exception as e:  # z. B. abgestürzter Worker-Prozess
+                    ok, secs, err = False, 0.0, repr(e)
+                results[name] = AgentResult(name, "ok" if ok else "failed", secs, err)
+                print(f"--- {'DONE' if ok else 'FAIL'} {name} ({secs:.2f}s)" + ("" if ok else f"\n{err}"))
+    return [results[a.name] for a in agents]
+
+
+def print_summary(results: list[AgentResult], wall: float):
+    width = max((len(r.name) for r in results), default=5)
+    print()
+    print("Agent".ljust(width) + "  Status   Zeit")
+    for r in sorted(results, key=lambda r: -r.seconds):
+        print(f"{r.name.ljust(width)}  {r.status:<7}  {r.seconds:6.2f}s")
+    print(f"Summe {sum(r.seconds for r in results):.2f}s, Wall {wall:.2f}s")
+
+
+def main(argv: list[str] | None = None) -> int:
     ap = argparse.ArgumentParser()
     ap.add_argument("--slug", default=None)
-    args = ap.parse_args()
+    ap.add_argument("--workers", type=int, default=4, help="parallel laufende Agents")
+    ap.add_argument("--executor", choices=("thread", "process"), default="thread")
+    ap.add_argument("--only", default=None, help="kommagetrennte Agent-Namen (ohne automatische Abhängigkeiten)")
+    args = ap.parse_args(argv)
     resolved = get_tenant_slug(args.slug)
-    for script in AGENTS:
-        run_agent(script, resolved)
+
+    agents = AGENTS
+    if args.only:
+        wanted = {n.strip() for n in args.only.split(",") if n.strip()}
+        unknown = wanted - {a.name for a in AGENTS}
+        if unknown:
+            ap.error(f"unbekannte Agents: {', '.join(sorted(unknown))}")
+        agents = tuple(a for a in AGENTS if a.name in wanted)
+
+    t0 = time.perf_counter()
+    results = run_agents(resolved, agents, workers=args.workers, executor=args.executor)
+    print_summary(results, time.perf_counter() - t0)
+    if any(r.status != "ok" for r in results):
+        print(f"\n❌ Fehler bei: {', '.join(r.name for r in results if r.status != 'ok')}")
+        return 1
     print("\n[OK] Agents completed (tenantized)\n")
+    return 0
+
 
 if __name__ == "__main__":
-    main()
+    raise SystemExit(main())
@@ -4,10 +4,10 @@ from pathlib import Path
 from skoolhud.utils import reports_dir_for, datalake_members_dir_for
 from skoolhud.config import get_tenant_slug
 
-def main():
+def main(argv=None):
     ap = argparse.ArgumentParser()
     ap.add_argument("--slug", default=None)
-    args = ap.parse_args()
+    args = ap.parse_args(argv)
     slug = get_tenant_slug(args.slug)
 
     out_dir = reports_dir_for(slug)
@@ -0,0 +1,12 @@
+"""Kompatibilitäts-Einstieg (Workflows, Smoke-Tests): der Runner liegt in skoolhud.agents.run_all_agents."""
+import sys
+from pathlib import Path
+
+if not __package__:
+    # als Skript gestartet (python skoolhud/ai/agents/run_all_agents.py): Repo-Root importierbar machen
+    sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
+
+from skoolhud.agents.run_all_agents import AGENTS, main, run_agents  # noqa: E402,F401
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -8,10 +8,8 @@ from typing import Any, List, Dict, Optional
 
 from skoolhud.db import SessionLocal
 from sqlalchemy import text
-from skoolhud.vector.db import get_collection, get_client
 import requests
 from requests.adapters import HTTPAdapter, Retry
-from sentence_transformers import SentenceTransformer
 from skoolhud.utils import reports_dir_for
 from skoolhud.config import get_tenant_slug
 from skoolhud.utils.net import post_with_retry
@@ -197,12 +195,25 @@ def db_query(sql: str, params: Optional[Dict[str, Any]] = None):
     finally:
         s.close()
 
+_EMBEDDERS: dict = {}
+
+
+def _embedder(model_name: str):
+    # sentence_transformers/chromadb are heavy imports: load them only when vector search is used
+    model = _EMBEDDERS.get(model_name)
+    if model is None:
+        from sentence_transformers import SentenceTransformer
+        model = _EMBEDDERS[model_name] = SentenceTransformer(model_name)
+    return model
+
+
 def vector_search(query: str, tenant: str | None = None, k: int = 5):
+    from skoolhud.vector.db import get_collection
+
     tenant = get_tenant_slug(tenant)
     model_name = os.getenv('EMBED_MODEL', 'sentence-transformers/all-MiniLM-L6-v2')
-    model = SentenceTransformer(model_name)
+    model = _embedder(model_name)
     q_emb = model.encode([query], normalize_embeddings=True).tolist()[0]
-    client = get_client()
     col = get_collection('skoolhud')
     res = col.query(query_embeddings=[q_emb], n_results=k, where={'tenant': tenant}, include=['metadatas','documents','distances'])
     ids = (res.get('ids') or [[]])[0]
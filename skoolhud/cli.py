@@ -4,11 +4,9 @@ from .db import Base, engine, SessionLocal
 from .models import Tenant
 from .config import settings, get_tenant_slug
 from .fetcher import SkoolFetcher
-from .normalizer import normalize_members_json
-from .vector.ingest import ingest_members_to_vector
-from .vector.query import search as search_vectors
-from .vector.db import get_client, get_or_create_collection, similarity_search
-from .ai.orchestrator import run_orchestrator
+from .normalizer import normalize_members_json, normalize_members_stream
+# Vector-Store/Orchestrator (chromadb, sentence-transformers) werden erst in den
+# jeweiligen Commands importiert, damit Fetch-/Normalize-Läufe schnell starten.
 
 app = typer.Typer(help="Skool HUD CLI")
 
@@ -34,6 +32,7 @@ def count_members(slug: str = typer.Option(..., help="Tenant Slug")):
 def vectors_ingest(tenant: str | None = typer.Option(None, "--tenant")):
     """Vektor-Store mit Reports/CSVs füttern."""
     import os
+    from .vector.ingest import ingest_members_to_vector
     resolved = get_tenant_slug(tenant)
     os.environ["TENANT"] = resolved
     ingest_members_to_vector(resolved)
@@ -45,6 +44,7 @@ def vectors_search(
     k: int = typer.Option(5, "--k"),
 ):
     """Semantische Suche im Vektor-Store (tenant-isoliert)."""
+    from .vector.query import search as search_vectors
     resolved = get_tenant_slug(tenant)
     search_vectors(query=query, tenant=resolved, k=k)
 
@@ -73,14 +73,16 @@ def test_tenant(slug: str = typer.Option(..., help="Tenant Slug, z. B. 'hoomans'
             raise typer.Exit(code=1)
         f = SkoolFetcher(settings.base_url, t.group_path, t.cookie_header, t.slug)
         try:
-            build = f.discover_build_id()
+            # Verbindungstest: bewusst am Cache vorbei frisch ermitteln
+            build = f.discover_build_id(use_cache=False)
             typer.echo(f"OK: buildId gefunden: {build}")
         except Exception as e:
             typer.echo(f"FEHLER: {e}")
             raise typer.Exit(code=1)
 
 @app.command()
-def fetch_members(slug: str = typer.Option(..., help="Tenant Slug")):
+def fetch_members(slug: str = typer.Option(..., help="Tenant Slug"),
+                  bulk: bool = typer.Option(True, "--bulk/--no-bulk", help="Gebatchter Upsert (ein Preload + Bulk-Writes pro Seite)")):
     with SessionLocal() as s:
         t = s.execute(select(Tenant).where(Tenant.slug==slug)).scalar_one_or_none()
         if not t:
@@ -92,7 +94,7 @@ def fetch_members(slug: str = typer.Option(..., help="Tenant Slug")):
         time.sleep(settings.min_interval_seconds)
         data, route, fpath = f.fetch_members_json(build)
         typer.echo(f"RAW gespeichert: {fpath}")
-        res = normalize_members_json(s, t.slug, build, data, fpath)
+        res = normalize_members_json(s, t.slug, build, data, fpath, bulk=bulk)
         s.commit()
         typer.echo(f"Normalisiert: inserted={res['inserted']}, updated={res['updated']} (scanned_nodes={res['scanned_nodes']})")
 
@@ -100,13 +102,40 @@ def fetch_members(slug: str = typer.Option(..., help="Tenant Slug")):
 def fetch_members_all(slug: str = typer.Option(..., help="Tenant Slug"),
                       max_pages: int = typer.Option(20, help="Sicherheitslimit (z. B. 20)"),
                       min_wait: int = typer.Option(11, help="Min. Pause zwischen Seiten (Sek.)"),
-                      max_wait: int = typer.Option(24, help="Max. Pause zwischen Seiten (Sek.)")):
+                      max_wait: int = typer.Option(24, help="Max. Pause zwischen Seiten (Sek.)"),
+                      concurrency: int = typer.Option(1, help="Parallele Seitenabrufe (>1 = asyncio-Modus)"),
+                      rate_interval: float | None = typer.Option(None, help="Async-Modus: Mindestabstand zwischen Request-Starts pro Tenant (Sek.). Default: min_wait + Jitter bis max_wait – gleicher Durchsatz wie sequentiell; schneller nur mit kleinerem Wert"),
+                      bulk: bool = typer.Option(True, "--bulk/--no-bulk", help="Gebatchter Upsert (ein Preload + Bulk-Writes pro Seite)"),
+                      stream: bool = typer.Option(False, "--stream/--no-stream", help="Seiten unverändert archivieren und Einträge inkrementell normalisieren (benötigt ijson)"),
+                      commit_every: int = typer.Option(5, help="Sequentieller Modus: Commit spätestens nach so vielen Seiten"),
+                      resume: bool = typer.Option(False, "--resume", help="Nach einem Abbruch ab der letzten committeten Seite fortsetzen (gleiche buildId)"),
+                      incremental: bool = typer.Option(False, "--incremental", help="Stoppen, sobald mehrere Seiten in Folge keine Änderungen bringen"),
+                      unchanged_pages: int = typer.Option(2, help="Inkrementell: so viele unveränderte Seiten in Folge beenden den Lauf"),
+                      full_every_days: float = typer.Option(7.0, help="Inkrementell: spätestens nach so vielen Tagen wieder ein Voll-Sync (erkennt Löschungen)")):
     """
     Holt alle Members-Seiten mit dem bestätigten Param 'p=1..N' und normalisiert sie.
     Stoppt bei 0 neuen IDs, weniger als 30 Einträgen (letzte Seite), wiederholter Route oder nach max_pages.
+    Sequentiell laufen Abruf und Normalisierung als Pipeline: während der Pause vor der nächsten Seite
+    wird die vorige im Hintergrund archiviert, normalisiert und (gebündelt) committet.
+    Mit --concurrency > 1 werden mehrere Seiten gleichzeitig geladen (gemeinsames Rate-Budget pro Tenant).
+    Das Budget bestimmt den Durchsatz: ohne --rate-interval gilt dieselbe Pause wie sequentiell
+    (min_wait + Jitter bis max_wait), parallel überlappen dann nur Antwortzeit und Normalisierung.
+    Mehr Seiten pro Minute gibt es nur mit einem kleineren --rate-interval.
+    Mit --stream wird keine Seite komplett als Python-Objekt aufgebaut (geringerer Spitzen-Speicher).
+    Nach jedem Commit wird ein Checkpoint geschrieben; --resume setzt danach fort (max_pages bleibt
+    die absolute Seitenobergrenze).
+    Mit --incremental wird pro Seite gegen den gespeicherten Stand verglichen (user.updatedAt,
+    lastOffline); nach --unchanged-pages Seiten ohne neue/geänderte Member endet der Lauf. Ist der
+    letzte Voll-Sync älter als --full-every-days, läuft stattdessen ein Voll-Sync.
     """
-    import random, time
-    from .utils import get_in
+    import random, asyncio
+    from .raw_store import streaming_available
+    from .pipeline import StageTimings, run_page_pipeline
+    from .member_sync import resume_point, save_checkpoint, clear_checkpoint, full_sync_due, last_full_sync, mark_full_sync
+
+    if stream and not streaming_available():
+        typer.echo("Hinweis: 'ijson' ist nicht installiert (pip install 'skoolhud[stream]') – Streaming-Modus deaktiviert.")
+        stream = False
 
     with SessionLocal() as s:
         t = s.execute(select(Tenant).where(Tenant.slug==slug)).scalar_one_or_none()
@@ -120,37 +149,47 @@ def fetch_members_all(slug: str = typer.Option(..., help="Tenant Slug"),
 
         total_inserted = 0
         total_updated = 0
-        page = 1
         seen_routes = set()
         seen_ids = set()
-
-        while page <= max_pages:
-            params = None if page == 1 else {"p": page}
-            typer.echo(f"Seite {page} abrufen… (params={params})")
-            data, route, fpath = f.fetch_members_json_with_params(build, params)
+        raw_paths: list[str] = []
+        start_page = 1
+        if resume:
+            start_page, seen_ids, raw_paths, note = resume_point(slug, build)
+            typer.echo(f"Resume: {note}")
+        if incremental and full_sync_due(slug, full_every_days):
+            typer.echo(f"Inkrementell: letzter Voll-Sync {last_full_sync(slug) or 'nie'} – führe Voll-Sync durch.")
+            incremental = False
+        # letzte normalisierte Seite (für den Checkpoint beim nächsten Commit); finished = Abbruchkriterium erreicht,
+        # early = inkrementeller Abbruch (kein Voll-Sync); unchanged = unveränderte Seiten in Folge
+        progress = {"page": start_page - 1, "finished": False, "early": False, "unchanged": 0}
+        timings = StageTimings()
+
+        def handle_page(page: int, data, route: str, fpath: str) -> bool:
+            """Normalisiert eine Seite (ohne Commit) und prüft die Abbruchkriterien. True = Pagination beenden."""
+            nonlocal total_inserted, total_updated
 
             # Doppel-Route-Schutz
             if route in seen_routes:
                 typer.echo(f"Stoppe: Route wiederholt sich ({route}).")
-                break
+                return True
             seen_routes.add(route)
 
-            # Einträge zählen & neue IDs bestimmen
-            users = get_in(data, "pageProps.users") or []
-            entries_count = len(users) if isinstance(users, list) else 0
-            new_ids = set()
-            for u in (users if isinstance(users, list) else []):
-                uid = get_in(u, "user.id") or u.get("id")
-                if uid and str(uid) not in seen_ids:
-                    new_ids.add(str(uid))
+            # Normalisieren (data ist None im Streaming-Modus)
+            # f.build_id: falls die buildId unterwegs erneuert wurde
+            if data is None:
+                res = normalize_members_stream(s, t.slug, f.build_id or build or "", fpath, bulk=bulk,
+                                               track_changes=incremental)
+            else:
+                res = normalize_members_json(s, t.slug, f.build_id or build or "", data, fpath, bulk=bulk,
+                                             track_changes=incremental)
 
-            # Normalisieren
-            # build ist direkt darüber definiert: build = f.discover_build_id()
-            build_id_val = build if 'build' in locals() and build is not None else ""
-            res = normalize_members_json(s, t.slug, build if build is not None else "", data, fpath)
-            s.commit()
+            # Einträge zählen & neue IDs bestimmen (aus der Extraktion des Normalizers, kein zweiter Durchlauf)
+            entries_count = res["scanned_nodes"]
+            new_ids = set(res["user_ids"]) - seen_ids
             total_inserted += res["inserted"]
             total_updated += res["updated"]
+            progress["page"] = page
+            raw_paths.append(str(fpath))
 
             typer.echo(f"  -> RAW: {fpath}")
             typer.echo(f"  -> Normalisiert: +{res['inserted']}/~{res['updated']} (scanned={res['scanned_nodes']}, entries={entries_count}, neueIDs={len(new_ids)})")
@@ -158,28 +197,92 @@ def fetch_members_all(slug: str = typer.Option(..., help="Tenant Slug"),
             # Abbruchkriterien
             if entries_count == 0:
                 typer.echo("Stoppe: 0 Einträge auf dieser Seite.")
-                break
+                return True
             if len(new_ids) == 0:
                 typer.echo("Stoppe: keine neuen IDs mehr (wir sind durch).")
-                break
+                return True
             if entries_count < 30:
                 typer.echo("Stoppe: letzte Seite erkannt (weniger als 30 Einträge).")
-                break
+                return True
+            if incremental:
+                progress["unchanged"] = 0 if res["changed"] else progress["unchanged"] + 1
+                typer.echo(f"  -> Inkrementell: {res['changed']} neu/geändert (unverändert in Folge: {progress['unchanged']})")
+                if progress["unchanged"] >= unchanged_pages:
+                    typer.echo(f"Stoppe (inkrementell): {unchanged_pages} Seite(n) in Folge ohne Änderungen.")
+                    progress["early"] = True
+                    return True
 
-            # nächste Seite
             seen_ids.update(new_ids)
-            page += 1
+            return False
 
-            # Pause (zufällig 11–24s)
-            wait_s = random.randint(min_wait, max_wait)
-            typer.echo(f"Warte {wait_s}s (zufällig) vor nächster Seite…")
-            time.sleep(wait_s)
+        def finish_page(page: int, data, route: str, fpath: str) -> bool:
+            stop = handle_page(page, data, route, fpath)
+            progress["finished"] = progress["finished"] or stop
+            return stop
+
+        def commit():
+            s.commit()
+            if progress["page"] >= start_page:
+                save_checkpoint(slug, f.build_id or build or "", progress["page"], seen_ids, raw_paths)
+
+        if concurrency <= 1:
+            def fetch_page(page: int):
+                params = None if page == 1 else {"p": page}
+                typer.echo(f"Seite {page} abrufen… (params={params})")
+                if stream:
+                    route, fpath = f.fetch_members_stream_with_params(build, params)
+                    return None, route, lambda: fpath
+                # RAW-Archivierung erst im Consumer (save), damit sie in die Pause fällt
+                return f.fetch_members_deferred_with_params(build, params)
+
+            def consume(page: int, item) -> bool:
+                data, route, save = item
+                return finish_page(page, data, route, timings.timed("save_raw", save))
+
+            def wait(page: int) -> float:
+                # Pause (zufällig 11–24s)
+                wait_s = random.randint(min_wait, max_wait)
+                typer.echo(f"Warte {wait_s}s (zufällig) vor nächster Seite…")
+                return wait_s
+
+            run_page_pipeline(fetch_page, consume, max_pages=max_pages, wait=wait, commit=commit,
+                              start_page=start_page, commit_every=commit_every, timings=timings)
+        else:
+            interval = rate_interval if rate_interval is not None else float(min_wait)
+            jitter = 0.0 if rate_interval is not None else float(max(0, max_wait - min_wait))
+            typer.echo(f"Async-Modus: bis zu {concurrency} Seiten parallel, Request-Abstand ≥{interval:g}s (+Jitter ≤{jitter:g}s).")
+            if rate_interval is None:
+                typer.echo("Hinweis: ohne --rate-interval entspricht der Durchsatz dem sequentiellen Modus.")
+
+            async def run_pages():
+                pages = f.iter_members_pages_async(build, max_pages=max_pages, concurrency=concurrency,
+                                                   min_interval=interval, jitter=jitter, start_page=start_page,
+                                                   stream=stream)
+                try:
+                    async for page, data, route, fpath in pages:
+                        typer.echo(f"Seite {page} geladen.")
+                        stop = timings.timed("normalize", finish_page, page, data, route, fpath)
+                        timings.timed("commit", commit)
+                        if stop:
+                            break
+                finally:
+                    await pages.aclose()
+
+            asyncio.run(run_pages())
 
         typer.echo(f"FERTIG. Gesamt: inserted={total_inserted}, updated={total_updated}.")
+        typer.echo(f"Stage-Zeiten: {timings.summary()}")
+        if progress["finished"]:
+            clear_checkpoint(slug)
+            if not progress["early"]:
+                mark_full_sync(slug, progress["page"])
+        elif progress["page"] >= start_page:
+            typer.echo(f"max_pages erreicht – Checkpoint bei Seite {progress['page']} bleibt für --resume erhalten.")
 
         # Nach erfolgreichem Fetch: Vector-Ingest für diesen Tenant
         try:
             typer.echo(f"Starte automatischen Vector-Ingest für Tenant '{slug}'...")
+            from .vector.ingest import ingest_members_to_vector
             ingest_members_to_vector(slug, collection_name="skool_members")
             typer.echo("Vector-Ingest abgeschlossen.")
         except Exception as e:
@@ -198,18 +301,17 @@ def inspect_members_raw(slug: str = typer.Option(..., help="Tenant Slug")):
       - Welche Pagination-Hinweise es gibt (cursor/next/page)
     """
     from .utils import latest_raw_file, guess_members_arrays, guess_pagination_hints
-    import orjson
+    from .raw_store import load_raw
 
-    # RAW-Datei finden
-    fpath = latest_raw_file("exports/raw", slug, route_keyword="members")
+    # RAW-Datei finden (über den Index des RAW-Speichers)
+    fpath = latest_raw_file(settings.raw_dir, slug, route_keyword="members")
     if not fpath:
         typer.echo("Keine members-RAW-Datei gefunden. Erst 'fetch-members' ausführen.")
         raise typer.Exit(code=1)
 
     # JSON laden
     try:
-        with open(fpath, "rb") as f:
-            data = orjson.loads(f.read())
+        data = load_raw(fpath)
     except Exception as e:
         typer.echo(f"Fehler beim Lesen von {fpath}: {e}")
         raise typer.Exit(code=1)
@@ -238,6 +340,17 @@ def inspect_members_raw(slug: str = typer.Option(..., help="Tenant Slug")):
 
 # <<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<
 
+@app.command("raw-index-backfill")
+def raw_index_backfill(slug: str = typer.Option(..., help="Tenant Slug"),
+                       migrate: bool = typer.Option(False, help="Alte JSON-Dateien zusätzlich komprimiert in den Objektspeicher übernehmen (und löschen)")):
+    """
+    Nimmt vorhandene alte RAW-Dateien (exports/raw/<tenant>/*.json) in Index + Manifest auf,
+    damit latest_raw_file auch für Altbestände ohne Verzeichnis-Scan auskommt.
+    """
+    from .raw_store import RawStore
+    res = RawStore(settings.raw_dir, slug).backfill_legacy(migrate=migrate)
+    typer.echo(f"RAW-Index Backfill ({slug}): aufgenommen={res['added']}, bereits indiziert={res['skipped']}")
+
 @app.command()
 def probe_members_pages(slug: str = typer.Option(..., help="Tenant Slug"),
                         target_page: int = typer.Option(2, help="Welche Seite prüfen (z.B. 2)"),
@@ -329,15 +442,14 @@ def inspect_leaderboard_raw(slug: str = typer.Option(..., help="Tenant Slug")):
     Zeigt die neueste RAW-Leaderboard-JSON und verrät, wo die Datenblöcke stecken.
     """
     from .utils import latest_raw_file, deep_iter
-    import orjson
+    from .raw_store import load_raw
 
-    fpath = latest_raw_file("exports/raw", slug, route_keyword="leaderboards")
+    fpath = latest_raw_file(settings.raw_dir, slug, route_keyword="leaderboards")
     if not fpath:
         typer.echo("Keine Leaderboard-RAW-Datei gefunden. Erst 'fetch-leaderboard' ausführen.")
         raise typer.Exit(code=1)
 
-    with open(fpath, "rb") as f:
-        data = orjson.loads(f.read())
+    data = load_raw(fpath)
     typer.echo(f"RAW-Datei: {fpath}")
 
     found = 0
@@ -356,37 +468,56 @@ def inspect_leaderboard_raw(slug: str = typer.Option(..., help="Tenant Slug")):
 @app.command()
 def normalize_leaderboard(
     slug: str = typer.Option(..., help="Tenant Slug"),
-    window: str = typer.Option(..., help="Fenster: 7, 30 oder all")
+    window: str | None = typer.Option(None, help="Fenster: 7, 30, all oder Liste wie 'all,30,7'"),
+    all_windows: bool = typer.Option(False, "--all-windows", help="Alle Fenster (all,30,7) aus einer Payload"),
+    stream: bool = typer.Option(False, "--stream/--no-stream", help="Einträge inkrementell aus der RAW-Datei lesen (benötigt ijson)")
 ):
     """
     Normalisiert die letzte Leaderboard-RAW-Datei in DB + Snapshots.
+    Mehrere Fenster werden aus derselben (einmal geladenen) Payload in einer Transaktion normalisiert.
+    Mit --stream wird die Payload nicht komplett geladen, sondern je Fenster inkrementell gelesen.
     """
     from .utils import latest_raw_file
-    from .normalizer import normalize_leaderboard_json
-    import orjson
+    from .normalizer import normalize_leaderboard_windows, normalize_leaderboard_windows_stream, LEADERBOARD_WINDOWS
+    from .raw_store import load_raw, streaming_available
     from .models import Tenant
 
+    if all_windows:
+        windows = list(LEADERBOARD_WINDOWS)
+    elif window:
+        windows = [w.strip() for w in window.split(",") if w.strip()]
+    else:
+        typer.echo("Bitte --window (z. B. 'all' oder 'all,30,7') oder --all-windows angeben.")
+        raise typer.Exit(code=2)
+    unknown = [w for w in windows if w not in LEADERBOARD_WINDOWS]
+    if unknown:
+        typer.echo(f"Unbekannte Fenster: {unknown} (erlaubt: {', '.join(LEADERBOARD_WINDOWS)})")
+        raise typer.Exit(code=2)
+
     with SessionLocal() as s:
         t = s.execute(select(Tenant).where(Tenant.slug == slug)).scalar_one_or_none()
         if not t:
             typer.echo("Unbekannter Tenant. Erst add-tenant ausführen.")
             raise typer.Exit(code=1)
 
-        fpath = latest_raw_file("exports/raw", slug, route_keyword="leaderboards")
+        fpath = latest_raw_file(settings.raw_dir, slug, route_keyword="leaderboards")
         if not fpath:
             typer.echo("Keine Leaderboard-RAW-Datei gefunden. Erst 'fetch-leaderboard' ausführen.")
             raise typer.Exit(code=1)
 
-        with open(fpath, "rb") as f:
-            data = orjson.loads(f.read())
-
         # Fix: build is not defined here, use a static/manual value or pass empty string
-        res = normalize_leaderboard_json(s, t.slug, "manual", data, fpath, window)
+        if stream and streaming_available():
+            results = normalize_leaderboard_windows_stream(s, t.slug, "manual", fpath, windows)
+        else:
+            if stream:
+                typer.echo("Hinweis: 'ijson' ist nicht installiert (pip install 'skoolhud[stream]') – lade die Payload komplett.")
+            results = normalize_leaderboard_windows(s, t.slug, "manual", load_raw(fpath), fpath, windows)
         s.commit()
-        typer.echo(
-            f"Leaderboard normalisiert (window={window}): "
-            f"inserted={res['inserted']}, updated={res['updated']}, scanned={res['scanned']}"
-        )
+        for w, res in results.items():
+            typer.echo(
+                f"Leaderboard normalisiert (window={w}): "
+                f"inserted={res['inserted']}, updated={res['updated']}, scanned={res['scanned']}"
+            )
 
 @app.command("fetch-leaderboard-all")
 def fetch_leaderboard_all(slug: str, window: str = typer.Option("all", help="all|30|7"), limit: int = 100):
@@ -409,6 +540,7 @@ def run_orch(
     force: bool = typer.Option(False, help="Force dispatch even if cost-guard would block"),
 ):
     """Run the AI orchestrator (validator → analysts → composer → dispatcher) for a tenant."""
+    from .ai.orchestrator import run_orchestrator
     resolved = get_tenant_slug(tenant)
     typer.echo(f"Starting orchestrator for tenant '{resolved}' (run_id={run_id}, force={force})")
     code = run_orchestrator(resolved, run_id, force=force)
@@ -444,29 +576,18 @@ import typer
 from datetime import datetime, timezone, date
 from typing import Optional
 
-def _to_dt_utc(x):
-    if not x:
-        return None
-    if isinstance(x, datetime):
-        return x.astimezone(timezone.utc) if x.tzinfo else x.replace(tzinfo=timezone.utc)
-    s = str(x).strip()
-    if s.endswith("Z"):
-        s = s[:-1] + "+00:00"
-    try:
-        dt = datetime.fromisoformat(s)
-        return dt.astimezone(timezone.utc) if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
-    except Exception:
-        return None
-
 @app.command("snapshot-members-daily")
 def snapshot_members_daily(slug: str, day_str: Optional[str] = None):
     """
-    Schreibt für alle Member einen Tages-Snapshot in member_daily_snapshot.
+    Schreibt für alle Member des Tenants einen Tages-Snapshot in member_daily_snapshot
+    (ein INSERT … SELECT … ON CONFLICT statt Lookup + Write pro Member).
     day_str: YYYY-MM-DD (optional), Default = heute (UTC).
     """
     from skoolhud.db import SessionLocal
-    from skoolhud.models import Member, MemberDailySnapshot
+    from skoolhud.models import MemberDailySnapshot
+    from skoolhud.normalizer import snapshot_members_daily as write_daily_snapshot
     from skoolhud.utils.schema_utils import validate_json
+    from sqlalchemy import select, func, or_, not_, literal_column
     import json
     from pathlib import Path
 
@@ -480,65 +601,38 @@ def snapshot_members_daily(slug: str, day_str: Optional[str] = None):
 
     s = SessionLocal()
     try:
-        # Fix: Argument missing for parameter "tenant"
         if day_str is not None:
             y, m, d = map(int, day_str.split("-"))
             the_day = date(y, m, d)
         else:
             the_day = datetime.now(timezone.utc).date()
 
-        now = datetime.now(timezone.utc)
-        inserted = updated = 0
-
-        members = s.query(Member).all()
-        for m in members:
-            tenant_val = getattr(m, "tenant", None) or slug
-            row = (s.query(MemberDailySnapshot)
-                    .filter(MemberDailySnapshot.tenant == tenant_val)
-                    .filter(MemberDailySnapshot.user_id == m.user_id)
-                    .filter(MemberDailySnapshot.day == the_day)
-                    .one_or_none())
-
-            values = dict(
-                tenant=tenant_val,
-                user_id=m.user_id,
-                day=the_day,
-                level_current=m.level_current,
-                points_7d=m.points_7d,
-                points_30d=m.points_30d,
-                points_all=m.points_all,
-                rank_7d=m.rank_7d,
-                rank_30d=m.rank_30d,
-                rank_all=m.rank_all,
-                last_active_at_utc=_to_dt_utc(m.last_active_at_utc),
-                captured_at=now,
-            )
-
-            # validate minimal snapshot dict against schema if available
-            if _MDS_SCHEMA is not None:
-                from datetime import date as _date, datetime as _dt
-                the_day_val = values.get("day")
-                if isinstance(the_day_val, (_date, _dt)):
-                    day_iso = the_day_val.isoformat()
-                elif isinstance(the_day_val, str):
-                    day_iso = the_day_val
-                else:
-                    day_iso = None
-                minimal = {"tenant": values.get("tenant"), "user_id": str(values.get("user_id")), "day": day_iso, "points_7d": values.get("points_7d"), "points_30d": values.get("points_30d"), "points_all": values.get("points_all")}
+        res = write_daily_snapshot(s, slug, the_day, captured_at=datetime.now(timezone.utc))
+
+        # Schema-Check: Typprüfung aller Zeilen per SQL-Aggregat + jsonschema auf einer Stichprobe
+        if _MDS_SCHEMA is not None:
+            mds = MemberDailySnapshot.__table__
+            scope = (mds.c.tenant == slug, mds.c.day == the_day)
+            bad_types = s.execute(
+                select(func.count()).select_from(mds).where(*scope, or_(*(
+                    not_(func.typeof(mds.c[c]).in_(["integer", "null"]))
+                    for c in ("points_7d", "points_30d", "points_all")
+                )))
+            ).scalar_one()
+            if bad_types:
+                print(f"MemberDailySnapshot schema validation failed for {bad_types} rows (points not integer)")
+            sample = s.execute(
+                select(mds.c.tenant, mds.c.user_id, mds.c.day, mds.c.points_7d, mds.c.points_30d, mds.c.points_all)
+                .where(*scope).order_by(literal_column("random()")).limit(20)
+            ).mappings().all()
+            for row in sample:
+                minimal = dict(row, user_id=str(row["user_id"]), day=row["day"].isoformat())
                 ok, err = validate_json(minimal, _MDS_SCHEMA)
                 if not ok:
-                    print(f"MemberDailySnapshot schema validation failed for user {values.get('user_id')}: {err}")
-
-            if row is None:
-                s.add(MemberDailySnapshot(**values))
-                inserted += 1
-            else:
-                for k, v in values.items():
-                    setattr(row, k, v)
-                updated += 1
+                    print(f"MemberDailySnapshot schema validation failed for user {row['user_id']}: {err}")
 
         s.commit()
-        typer.echo(f"member_daily_snapshot: inserted={inserted} updated={updated} day={the_day}")
+        typer.echo(f"member_daily_snapshot: inserted={res['inserted']} updated={res['updated']} day={the_day}")
     finally:
         s.close()
 app = typer.Typer(add_completion=False) if 'app' not in globals() else app
@@ -546,6 +640,7 @@ app = typer.Typer(add_completion=False) if 'app' not in globals() else app
 @app.command("vector-ingest")
 def vector_ingest(slug: str = typer.Argument(...), collection: str = typer.Option("skool_members", help="Chroma Collection Name")):
     """Ingest aller Members eines Tenants in den Vector Store (mit Embeddings)."""
+    from .vector.ingest import ingest_members_to_vector
     ingest_members_to_vector(slug, collection_name=collection)
 
 
@@ -565,6 +660,7 @@ def vector_ingest_reports(
 @app.command("vector-search")
 def vector_search(query: str = typer.Argument(...), slug: str = typer.Option(None, help="Optional: Tenant-Filter"), top_k: int = typer.Option(5, help="Anzahl Treffer")):
     """Semantische Suche im Vector Store."""
+    from .vector.db import get_client, get_or_create_collection, similarity_search
     client = get_client()
     col = get_or_create_collection(client, "skool_members")
     where = {"tenant": slug} if slug else None
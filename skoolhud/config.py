@@ -15,6 +15,9 @@ class Settings(BaseModel):
     raw_dir: str = os.environ.get("RAW_DIR", "exports/raw")
     db_path: str = os.environ.get("DB_PATH", "skool.db")
     min_interval_seconds: int = int(os.environ.get("MIN_INTERVAL_SECONDS", "15"))
+    # Persistenter Fetcher-Zustand (buildId-Cache usw.)
+    state_dir: str = os.environ.get("STATE_DIR", "exports/state")
+    build_id_ttl_seconds: int = int(os.environ.get("BUILD_ID_TTL_SECONDS", "21600"))
 
 # Instanz der Settings, wird von anderen Modulen importiert
 settings = Settings()
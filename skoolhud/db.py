@@ -3,6 +3,8 @@
 Initialisiert die Datenbankverbindung und stellt die SQLAlchemy-Basisobjekte bereit.
 Verwendet SQLite als Backend, Pfad wird aus den Settings geladen.
 """
+import weakref
+
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
 from .config import settings
@@ -11,3 +13,25 @@ from .config import settings
 engine = create_engine(f"sqlite:///{settings.db_path}", echo=False, future=True)
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, future=True)
 Base = declarative_base()
+
+# Spalten pro (Engine, Tabelle) – PRAGMA nur einmal pro Prozess statt bei jedem Agent-Lauf
+_TABLE_COLUMNS: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+
+def table_columns(bind, table: str) -> frozenset:
+    """
+    Tatsächlich vorhandene Spalten einer Tabelle (ältere DBs ohne Migration haben evtl. nicht
+    alle Model-Spalten). `bind` ist Engine, Connection oder Session; das Ergebnis wird je Engine
+    gecacht. Fehlende Tabelle -> leeres Set (nicht gecacht, sie kann noch angelegt werden).
+    """
+    if hasattr(bind, "get_bind"):
+        bind = bind.get_bind()
+    eng = getattr(bind, "engine", bind)
+    per_engine = _TABLE_COLUMNS.setdefault(eng, {})
+    cols = per_engine.get(table)
+    if cols is None:
+        with eng.connect() as conn:
+            cols = frozenset(r[1] for r in conn.exec_driver_sql(f"PRAGMA table_info('{table}')"))
+        if cols:
+            per_engine[table] = cols
+    return cols
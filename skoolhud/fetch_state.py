@@ -0,0 +1,45 @@
+"""
+Kleiner persistenter Zustandsspeicher für den Fetcher (z. B. buildId-Cache pro Tenant).
+Jeder Bereich liegt als JSON-Datei unter settings.state_dir und wird atomar geschrieben.
+"""
+from __future__ import annotations
+import json
+import os
+import threading
+from typing import Callable
+
+from .config import settings
+
+_LOCK = threading.RLock()
+
+
+def _state_path(name: str) -> str:
+    return os.path.join(settings.state_dir, f"{name}.json")
+
+
+def load_state(name: str) -> dict:
+    """Lädt einen Zustandsbereich; fehlende oder kaputte Dateien ergeben ein leeres Dict."""
+    try:
+        with open(_state_path(name), "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return data if isinstance(data, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+
+def save_state(name: str, data: dict) -> None:
+    path = _state_path(name)
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def update_state(name: str, fn: Callable[[dict], None]) -> dict:
+    """Read-modify-write eines Bereichs unter Prozess-Lock; `fn` verändert das Dict in-place."""
+    with _LOCK:
+        data = load_state(name)
+        fn(data)
+        save_state(name, data)
+        return data
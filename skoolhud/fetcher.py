@@ -3,12 +3,85 @@
 Modul zum Abrufen von Daten aus Skool-Communities.
 Enthält die Klasse SkoolFetcher, die HTTP-Anfragen stellt und Cookies aus DB oder Datei lädt.
 """
-import os, json, time, re
+import os, json, time, re, random, asyncio, threading
+import orjson
 from dotenv import load_dotenv
 load_dotenv()
 import requests
 from bs4 import BeautifulSoup
 from .config import settings
+from .fetch_state import load_state, update_state
+from .raw_store import RawStore, RawRef
+
+_BUILD_CACHE = "build_ids"
+_ROUTE_STATE = "leaderboard_routes"
+# Nach so vielen Fehlschlägen in Folge wird eine Leaderboard-Route nur noch als Fallback probiert
+_ROUTE_DEMOTE_AFTER = int(os.environ.get("ROUTE_DEMOTE_AFTER", "3"))
+
+# Kandidaten-Routen fürs Leaderboard ({group}/{build} werden pro Aufruf eingesetzt)
+_LEADERBOARD_ROUTES = [
+    "/{group}/-/leaderboards.json?group={group}",
+    "/leaderboards.json?group={group}",
+    "/api/leaderboards?group={group}",
+    "/api/leaderboards.json?group={group}",
+    "/_next/data/{build}/{group}/-/leaderboards.json?group={group}",
+]
+_LEADERBOARD_BUCKETS = ("allTime", "past30Days", "past7Days")
+
+
+class BuildIdExpired(RuntimeError):
+    """Eine /_next/data/-Route antwortete mit Redirect oder 404 – die buildId ist veraltet."""
+
+
+class TenantRateBudget:
+    """
+    Gemeinsames Rate-Budget pro Tenant: garantiert einen Mindestabstand (plus optionalem Jitter)
+    zwischen zwei Request-Starts – egal wie viele Seiten gerade parallel unterwegs sind.
+    Thread-sicher und nicht an eine Event-Loop gebunden.
+    """
+    def __init__(self, min_interval: float, jitter: float = 0.0):
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+        self.configure(min_interval, jitter)
+
+    def configure(self, min_interval: float, jitter: float = 0.0):
+        """Neue Parameter ab dem nächsten Slot; bereits reservierte Slots bleiben bestehen."""
+        with self._lock:
+            self.min_interval = max(0.0, float(min_interval))
+            self.jitter = max(0.0, float(jitter))
+
+    def reserve(self) -> float:
+        """Reserviert den nächsten freien Slot und gibt die Wartezeit bis dahin zurück."""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.min_interval + random.uniform(0, self.jitter)
+            return slot - now
+
+    async def acquire(self):
+        delay = self.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+_RATE_BUDGETS: dict[str, TenantRateBudget] = {}
+_RATE_BUDGETS_LOCK = threading.Lock()
+
+
+def rate_budget_for(tenant: str, min_interval: float, jitter: float = 0.0) -> TenantRateBudget:
+    """
+    Liefert das (prozessweit geteilte) Rate-Budget eines Tenants; legt es beim ersten Aufruf an.
+    Spätere Aufrufe übernehmen min_interval/jitter (z. B. anderes --rate-interval im selben Prozess),
+    der Slot-Zeitplan bleibt geteilt.
+    """
+    with _RATE_BUDGETS_LOCK:
+        budget = _RATE_BUDGETS.get(tenant)
+        if budget is None:
+            budget = _RATE_BUDGETS[tenant] = TenantRateBudget(min_interval, jitter)
+        else:
+            budget.configure(min_interval, jitter)
+        return budget
+
 
 class SkoolFetcher:
     """
@@ -21,6 +94,10 @@ class SkoolFetcher:
         # NEU: Cookie aus DB ODER aus cookie.txt holen
         self.cookie_header = self._cookie_from_db_or_file(cookie_header)
         self.tenant = tenant_slug
+        self.build_id: str | None = None
+        # veraltete buildId -> frisch ermittelte buildId (für Folgeaufrufe mit alter ID)
+        self._stale_builds: dict[str, str] = {}
+        self._build_lock = threading.Lock()
         self.session = requests.Session()
         self.session.headers.update({
             "User-Agent": settings.user_agent,
@@ -39,26 +116,95 @@ class SkoolFetcher:
             return env_cookie.strip()
         raise RuntimeError("Kein gültiger Cookie gefunden. Bitte SKOOL_COOKIE in .env setzen.")
 
+    # --------- intern: JSON-Antworten parsen (Bytes + Metadaten behalten) ----------
+    @staticmethod
+    def _read_json(resp) -> tuple[object, bytes, dict]:
+        """
+        Parst den Response-Body einmal aus den Wire-Bytes und liefert (data, raw, meta) mit
+        Byte-Länge, Parse- und Abrufzeit. Die Bytes gehen unverändert in den RAW-Speicher,
+        sodass für Größe/Hash nichts erneut serialisiert werden muss.
+        """
+        raw = resp.content
+        t0 = time.perf_counter()
+        try:
+            data = orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            data = json.loads(raw)  # toleranter (z. B. NaN); wirft wie resp.json() bei kaputtem JSON
+        meta = {"size": len(raw), "parse_ms": round((time.perf_counter() - t0) * 1000, 3)}
+        elapsed = getattr(resp, "elapsed", None)
+        if elapsed is not None:
+            meta["fetch_ms"] = round(elapsed.total_seconds() * 1000, 1)
+        return data, raw, meta
+
     # --------- intern: Next.js Data-Routen robust abrufen (ohne 307) ----------
     def _get_next_data_json(self, url: str, referer_tail: str):
+        """Wie _get_next_data, liefert aber nur die geparsten Daten."""
+        return self._get_next_data(url, referer_tail)[0]
+
+    def _get_next_data(self, url: str, referer_tail: str):
         """
         Holt eine Next.js-Datenroute so, dass keine 307-Redirects passieren.
         Wichtig: x-nextjs-data + sinnvoller Referer + Cookie.
+        Liefert (data, raw_bytes, meta), siehe _read_json.
         """
-        headers = {
+        resp = self.session.get(url, headers=self._next_data_headers(referer_tail), timeout=30, allow_redirects=False)
+        self._check_next_status(resp, url)
+        data, raw, meta = self._read_json(resp)
+        if isinstance(data, dict) and data.get("pageProps", {}).get("__N_REDIRECT"):
+            self._raise_redirect_json(url)
+        return data, raw, meta
+
+    def _get_next_data_stream(self, url: str, referer_tail: str, route: str, build_id: str | None) -> RawRef:
+        """
+        Streaming-Variante: der Body wird chunkweise unverändert in den RAW-Speicher geschrieben
+        (kein Python-Objekt der ganzen Payload). Redirect-JSON wird vor dem Indizieren erkannt.
+        """
+        from .config import settings as cfg
+        resp = self.session.get(url, headers=self._next_data_headers(referer_tail), timeout=30,
+                                allow_redirects=False, stream=True)
+        try:
+            self._check_next_status(resp, url)
+
+            def check(head: bytes, size: int):
+                # Redirect-Antworten sind winzig – steckt der ganze Body im Kopf, wie bisher prüfen
+                if size <= len(head) and b"__N_REDIRECT" in head:
+                    data = json.loads(head)
+                    if isinstance(data, dict) and data.get("pageProps", {}).get("__N_REDIRECT"):
+                        self._raise_redirect_json(url)
+
+            ref = RawStore(cfg.raw_dir, self.tenant).put_stream(
+                route, build_id, resp.iter_content(chunk_size=64 * 1024), check=check
+            )
+        finally:
+            resp.close()
+        elapsed = getattr(resp, "elapsed", None)
+        if elapsed is not None:
+            ref.meta["fetch_ms"] = round(elapsed.total_seconds() * 1000, 1)
+        ref.meta["streamed"] = True
+        return ref
+
+    def _next_data_headers(self, referer_tail: str) -> dict:
+        return {
             "Cookie": self.cookie_header,
             "Accept": "*/*",
             "x-nextjs-data": "1",
             "Referer": f"{self.base_url}/{self.group_path}/{referer_tail}".rstrip("/"),
         }
-        resp = self.session.get(url, headers=headers, timeout=30, allow_redirects=False)
+
+    def _check_next_status(self, resp, url: str):
+        is_next_data = "/_next/data/" in url
         if resp.status_code in (301, 302, 303, 307, 308):
+            if is_next_data:
+                raise BuildIdExpired(f"Next.js Redirect {resp.status_code} für {url} – buildId veraltet oder x-nextjs-data/Referer/Cookie fehlt.")
             raise RuntimeError(f"Next.js Redirect {resp.status_code} für {url} – meist fehlt x-nextjs-data/Referer/Cookie.")
+        if resp.status_code == 404 and is_next_data:
+            raise BuildIdExpired(f"Next.js 404 für {url} – buildId veraltet.")
         resp.raise_for_status()
-        data = resp.json()
-        if isinstance(data, dict) and data.get("pageProps", {}).get("__N_REDIRECT"):
-            raise RuntimeError(f"Next.js Redirect-JSON für {url} – prüfe Cookie/Referer/Build-ID.")
-        return data
+
+    def _raise_redirect_json(self, url: str):
+        if "/_next/data/" in url:
+            raise BuildIdExpired(f"Next.js Redirect-JSON für {url} – prüfe Cookie/Referer/Build-ID.")
+        raise RuntimeError(f"Next.js Redirect-JSON für {url} – prüfe Cookie/Referer/Build-ID.")
 
     # --------- Hilfen zum Speichern / buildId finden ----------
     def _safe_name(self, text: str) -> str:
@@ -66,17 +212,18 @@ class SkoolFetcher:
         cleaned = _re.sub(r'[^A-Za-z0-9._-]+', '_', text)
         return cleaned[:140]
 
-    def _save_raw(self, route_path: str, build_id: str | None, data: dict):
-        ts = time.strftime("%Y%m%dT%H%M%S")
-        safe_route = self._safe_name(route_path.strip("/"))
-        fname = f"{self._safe_name(self.tenant)}__{safe_route}__{ts}.json"
+    def _save_raw(self, route_path: str, build_id: str | None, data, raw: bytes | None = None,
+                  meta: dict | None = None) -> RawRef:
+        """
+        Speichert die Payload content-adressiert + komprimiert (identische Payloads werden nur neu
+        indiziert). Mit `raw` werden die empfangenen Bytes unverändert abgelegt. Der Rückgabewert
+        ist der Objektpfad (str) mit .meta = size/sha256 + Abruf-Metadaten.
+        """
         from .config import settings as cfg
-        outdir = os.path.join(cfg.raw_dir, self.tenant)
-        os.makedirs(outdir, exist_ok=True)
-        fpath = os.path.join(outdir, fname)
-        with open(fpath, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
-        return fpath
+        ref = RawStore(cfg.raw_dir, self.tenant).put(route_path, build_id, raw if raw is not None else data)
+        if meta:
+            ref.meta.update(meta)
+        return ref
 
     def _discover_build_id_from(self, page_tail: str) -> str:
         url = f"{self.base_url}/{self.group_path}/{page_tail}" if self.group_path else f"{self.base_url}/{page_tail}"
@@ -95,38 +242,182 @@ class SkoolFetcher:
             raise RuntimeError("buildId fehlt in __NEXT_DATA__.")
         return build
 
-    def discover_build_id(self) -> str:
-        return self._discover_build_id_from("-/members")
+    # --------- buildId-Cache (pro Tenant, mit TTL) ----------
+    def _cached_build_id(self) -> str | None:
+        entry = load_state(_BUILD_CACHE).get(self.tenant)
+        if not isinstance(entry, dict) or entry.get("group") != self.group_path:
+            return None
+        if time.time() - float(entry.get("ts") or 0) > settings.build_id_ttl_seconds:
+            return None
+        return entry.get("build_id") or None
+
+    def _store_build_id(self, build: str):
+        def put(data: dict):
+            data[self.tenant] = {"build_id": build, "group": self.group_path, "ts": time.time()}
+        update_state(_BUILD_CACHE, put)
+
+    def invalidate_build_id(self):
+        """Entfernt die gecachte buildId dieses Tenants (nach Redirect/404 auf /_next/data/)."""
+        update_state(_BUILD_CACHE, lambda data: data.pop(self.tenant, None))
+
+    def discover_build_id(self, use_cache: bool = True) -> str:
+        """
+        Liefert die aktuelle buildId. Standardmäßig aus dem Cache (TTL: settings.build_id_ttl_seconds),
+        sonst per HTML-Abruf der Members-Seite; das Ergebnis wird für Folgeaufrufe/-läufe gecacht.
+        """
+        if use_cache:
+            cached = self._cached_build_id()
+            if cached:
+                self.build_id = cached
+                return cached
+        build = self._discover_build_id_from("-/members")
+        self._store_build_id(build)
+        self.build_id = build
+        return build
+
+    def _with_build_refresh(self, build_id: str, call):
+        """
+        Führt call(build_id) aus. Meldet die Route eine veraltete buildId, wird genau einmal frisch
+        ermittelt und wiederholt; spätere Aufrufe mit der alten ID nutzen direkt die neue.
+        """
+        build_id = self._stale_builds.get(build_id, build_id)
+        try:
+            return call(build_id)
+        except BuildIdExpired:
+            with self._build_lock:
+                fresh = self._stale_builds.get(build_id)
+                if not fresh:
+                    # veralteten Cache-Eintrag verwerfen; die frisch ermittelte ID wird neu gecacht und
+                    # bleibt es auch, wenn die Route mit ihr ebenfalls scheitert
+                    self.invalidate_build_id()
+                    fresh = self.discover_build_id(use_cache=False)
+                    if fresh == build_id:
+                        raise
+                    self._stale_builds[build_id] = fresh
+            return call(fresh)
 
     # --------- Members JSON ----------
     def fetch_members_json(self, build_id: str):
+        return self._with_build_refresh(build_id, self._fetch_members_json)
+
+    def _fetch_members_json(self, build_id: str):
         group = self.group_path
         route = f"/_next/data/{build_id}/{group}/-/members.json?group={group}" if group else f"/_next/data/{build_id}/-/members.json"
         url = f"{self.base_url}{route}"
-        data = self._get_next_data_json(url, referer_tail="-/members")
-        fpath = self._save_raw(route, build_id, data)
+        data, raw, meta = self._get_next_data(url, referer_tail="-/members")
+        fpath = self._save_raw(route, build_id, data, raw, meta)
         return data, route, fpath
 
     def fetch_members_json_with_params(self, build_id: str, extra_params: dict | None = None):
+        return self._with_build_refresh(build_id, lambda b: self._fetch_members_json_with_params(b, extra_params))
+
+    def _members_route(self, build_id: str, extra_params: dict | None = None) -> str:
         group = self.group_path
         base = f"/_next/data/{build_id}/{group}/-/members.json?group={group}" if group else f"/_next_data/{build_id}/-/members.json"
         if extra_params:
             from urllib.parse import urlencode
-            route = base + "&" + urlencode(extra_params, doseq=True)
-        else:
-            route = base
+            return base + "&" + urlencode(extra_params, doseq=True)
+        return base
+
+    def _fetch_members_json_with_params(self, build_id: str, extra_params: dict | None = None):
+        data, route, save = self._fetch_members_deferred(build_id, extra_params)
+        return data, route, save()
+
+    def fetch_members_deferred_with_params(self, build_id: str, extra_params: dict | None = None):
+        """
+        Wie fetch_members_json_with_params, archiviert aber nicht sofort: liefert (data, route, save);
+        save() legt die empfangenen Bytes ab und gibt den RawRef zurück. So kann das Archivieren
+        außerhalb des Fetch-Threads laufen (siehe pipeline.run_page_pipeline).
+        """
+        return self._with_build_refresh(build_id, lambda b: self._fetch_members_deferred(b, extra_params))
+
+    def _fetch_members_deferred(self, build_id: str, extra_params: dict | None = None):
+        route = self._members_route(build_id, extra_params)
         url = f"{self.base_url}{route}"
-        data = self._get_next_data_json(url, referer_tail="-/members")
-        fpath = self._save_raw(route, build_id, data)
-        return data, route, fpath
+        data, raw, meta = self._get_next_data(url, referer_tail="-/members")
+        return data, route, lambda: self._save_raw(route, build_id, data, raw, meta)
+
+    def fetch_members_stream_with_params(self, build_id: str, extra_params: dict | None = None):
+        """
+        Streaming-Modus: archiviert die Seite unverändert und liefert (route, fpath) ohne die Payload
+        zu parsen; die Einträge liest der Normalizer inkrementell (normalize_members_stream).
+        """
+        return self._with_build_refresh(build_id, lambda b: self._fetch_members_stream(b, extra_params))
+
+    def _fetch_members_stream(self, build_id: str, extra_params: dict | None = None):
+        route = self._members_route(build_id, extra_params)
+        fpath = self._get_next_data_stream(f"{self.base_url}{route}", "-/members", route, build_id)
+        return route, fpath
 
     def fetch_members_json_page(self, build_id: str, page: int | None = None):
         params = {} if page in (None, 1) else {"page": page}
         return self.fetch_members_json_with_params(build_id, params)
 
+    # --------- Members JSON: nebenläufige Pagination (asyncio) ----------
+    async def _fetch_members_page_async(self, build_id: str, page: int, budget: TenantRateBudget,
+                                        stream: bool = False):
+        await budget.acquire()
+        params = None if page == 1 else {"p": page}
+        # requests ist blockierend -> im Thread-Pool ausführen, die Loop bleibt frei
+        if stream:
+            route, fpath = await asyncio.to_thread(self.fetch_members_stream_with_params, build_id, params)
+            return None, route, fpath
+        return await asyncio.to_thread(self.fetch_members_json_with_params, build_id, params)
+
+    async def iter_members_pages_async(self, build_id: str, max_pages: int = 20, concurrency: int = 3,
+                                       min_interval: float = 11.0, jitter: float = 0.0, start_page: int = 1,
+                                       stream: bool = False):
+        """
+        Async-Generator über die Members-Seiten (Param 'p'), bis zu `concurrency` Seiten gleichzeitig.
+        Die Requests teilen sich das Rate-Budget des Tenants (Mindestabstand `min_interval` + Jitter
+        zwischen zwei Request-Starts). Ergebnisse werden strikt in Seitenreihenfolge geliefert
+        (page, data, route, fpath) – auch wenn die Antworten ungeordnet eintreffen – damit die
+        Abbruchkriterien des Aufrufers unverändert greifen. Bricht der Aufrufer ab (break/aclose),
+        werden noch laufende Vorab-Abrufe verworfen. Mit stream=True ist `data` None (siehe
+        fetch_members_stream_with_params).
+        """
+        concurrency = max(1, int(concurrency))
+        budget = rate_budget_for(self.tenant, min_interval, jitter)
+        tasks: dict[int, asyncio.Task] = {}
+        next_page = start_page
+
+        def schedule():
+            nonlocal next_page
+            while next_page <= max_pages and len(tasks) < concurrency:
+                tasks[next_page] = asyncio.create_task(self._fetch_members_page_async(build_id, next_page, budget, stream))
+                next_page += 1
+
+        try:
+            for page in range(start_page, max_pages + 1):
+                schedule()
+                task = tasks.pop(page)
+                data, route, fpath = await task
+                # Fenster sofort nachfüllen, damit während der Verarbeitung weitergeladen wird
+                schedule()
+                yield page, data, route, fpath
+        finally:
+            for t in tasks.values():
+                t.cancel()
+            if tasks:
+                await asyncio.gather(*tasks.values(), return_exceptions=True)
+
     # --------- Leaderboards JSON (Plural!) ----------
     def _looks_like_leaderboard(self, data: dict) -> bool:
         try:
+            # Schnellpfad: bekannte Bucket-Layouts direkt prüfen, bevor rekursiv gescannt wird
+            page = data.get("pageProps") if isinstance(data, dict) else None
+            if isinstance(page, dict):
+                for holder in (page.get("s"), page):
+                    if not isinstance(holder, dict):
+                        continue
+                    for bucket in _LEADERBOARD_BUCKETS:
+                        node = holder.get(bucket)
+                        users = node.get("users") if isinstance(node, dict) else None
+                        if isinstance(users, list) and users and isinstance(users[0], dict):
+                            keys = users[0].keys()
+                            if "points" in keys and ("userId" in keys or "user" in keys):
+                                return True
+
             def deep_iter(x):
                 if isinstance(x, dict):
                     yield x
@@ -144,8 +435,49 @@ class SkoolFetcher:
         except Exception:
             return False
 
+    def _leaderboard_route_order(self, window_key: str) -> list[str]:
+        """
+        Kandidaten-Templates in gelernter Reihenfolge: zuletzt erfolgreiche Route zuerst,
+        Routen mit >= _ROUTE_DEMOTE_AFTER Fehlschlägen in Folge ans Ende (nur noch Fallback).
+        """
+        stats = load_state(_ROUTE_STATE).get(self.tenant, {}).get(window_key, {})
+
+        def key(item):
+            idx, tpl = item
+            st = stats.get(tpl) or {}
+            demoted = int(st.get("fail_streak") or 0) >= _ROUTE_DEMOTE_AFTER
+            return (demoted, -float(st.get("last_ok") or 0), -int(st.get("ok") or 0), idx)
+
+        return [tpl for _, tpl in sorted(enumerate(_LEADERBOARD_ROUTES), key=key)]
+
+    def _record_route_probes(self, window_key: str, probes: list[tuple[str, bool]]):
+        if not probes:
+            return
+        now = time.time()
+
+        def apply(data: dict):
+            stats = data.setdefault(self.tenant, {}).setdefault(window_key, {})
+            for tpl, ok in probes:
+                st = stats.setdefault(tpl, {"ok": 0, "fail": 0, "fail_streak": 0})
+                if ok:
+                    st["ok"] = int(st.get("ok") or 0) + 1
+                    st["fail_streak"] = 0
+                    st["last_ok"] = now
+                else:
+                    st["fail"] = int(st.get("fail") or 0) + 1
+                    st["fail_streak"] = int(st.get("fail_streak") or 0) + 1
+                    st["last_fail"] = now
+
+        update_state(_ROUTE_STATE, apply)
+
     def fetch_leaderboard_json(self, window: str | None = None, build_id: str | None = None):
+        """
+        Holt das Leaderboard über die erste funktionierende Kandidaten-Route. Die Gewinner-Route wird
+        pro Tenant und Fenster gemerkt (Erfolgs-/Fehlerzähler), sodass Folgeläufe sie direkt zuerst
+        probieren; dauerhaft fehlschlagende Routen werden nach hinten sortiert statt täglich zuerst.
+        """
         group = self.group_path
+        window_key = window or "-"
 
         def add_win(route: str) -> str:
             if window:
@@ -153,49 +485,65 @@ class SkoolFetcher:
                 return f"{route}{sep}window={window}"
             return route
 
-        candidates = [
-            add_win(f"/{group}/-/leaderboards.json?group={group}"),
-            add_win(f"/leaderboards.json?group={group}"),
-            add_win(f"/api/leaderboards?group={group}"),
-            add_win(f"/api/leaderboards.json?group={group}"),
-        ]
-
-        if not build_id:
-            try:
-                build_id = self.discover_build_id()
-            except Exception:
-                build_id = None
-        if build_id:
-            candidates.append(add_win(f"/_next/data/{build_id}/{group}/-/leaderboards.json?group={group}"))
-
         last_err = None
-        for route in candidates:
-            url = f"{self.base_url}{route}"
-            try:
-                if "/_next/data/" in route:
-                    data = self._get_next_data_json(url, referer_tail="-/leaderboards")
-                else:
-                    headers = {
-                        "Cookie": self.cookie_header,
-                        "Accept": "application/json",
-                        "Referer": f"{self.base_url}/{group}/-/leaderboards",
-                        "User-Agent": settings.user_agent,
-                    }
-                    resp = self.session.get(url, headers=headers, timeout=30, allow_redirects=False)
-                    if resp.status_code in (301, 302, 303, 307, 308):
-                        raise RuntimeError(f"Redirect {resp.status_code} für {route}")
-                    resp.raise_for_status()
-                    data = resp.json()
-
-                if not isinstance(data, dict):
-                    raise RuntimeError("Antwort ist kein JSON-Objekt.")
-                if self._looks_like_leaderboard(data):
-                    fpath = self._save_raw(route, build_id, data)
-                    return data, route, fpath
-                last_err = RuntimeError(f"Kein Leaderboard-Schema bei {route}")
-            except Exception as e:
-                last_err = e
-                continue
+        probes: list[tuple[str, bool]] = []
+        try:
+            for tpl in self._leaderboard_route_order(window_key):
+                if "{build}" in tpl:
+                    # buildId erst ermitteln, wenn eine Route sie wirklich braucht
+                    if not build_id:
+                        try:
+                            # im selben Lauf bereits ermittelte (bzw. gecachte) buildId wiederverwenden
+                            build_id = self.build_id or self.discover_build_id()
+                        except Exception as e:
+                            last_err = e
+                            continue
+                route = add_win(tpl.format(group=group, build=build_id))
+                url = f"{self.base_url}{route}"
+                used = {"builds": []}
+                try:
+                    if "/_next/data/" in route:
+
+                        def next_data(bid, tpl=tpl):
+                            used["route"], used["build"] = add_win(tpl.format(group=group, build=bid)), bid
+                            used["builds"].append(bid)
+                            return self._get_next_data(f"{self.base_url}{used['route']}", referer_tail="-/leaderboards")
+
+                        # veraltete buildId: einmal frisch ermitteln und wiederholen
+                        data, raw, meta = self._with_build_refresh(build_id, next_data)
+                        route, build_id = used["route"], used["build"]
+                    else:
+                        headers = {
+                            "Cookie": self.cookie_header,
+                            "Accept": "application/json",
+                            "Referer": f"{self.base_url}/{group}/-/leaderboards",
+                            "User-Agent": settings.user_agent,
+                        }
+                        resp = self.session.get(url, headers=headers, timeout=30, allow_redirects=False)
+                        if resp.status_code in (301, 302, 303, 307, 308):
+                            raise RuntimeError(f"Redirect {resp.status_code} für {route}")
+                        resp.raise_for_status()
+                        data, raw, meta = self._read_json(resp)
+
+                    if not isinstance(data, dict):
+                        raise RuntimeError("Antwort ist kein JSON-Objekt.")
+                    if self._looks_like_leaderboard(data):
+                        probes.append((tpl, True))
+                        fpath = self._save_raw(route, build_id, data, raw, meta)
+                        return data, route, fpath
+                    last_err = RuntimeError(f"Kein Leaderboard-Schema bei {route}")
+                except BuildIdExpired as e:
+                    last_err = e
+                    if len(used["builds"]) > 1:
+                        # buildId hat sich gerade geändert und wurde trotzdem abgelehnt – kein Urteil über die Route
+                        build_id = used["build"]
+                        continue
+                    # frisch ermittelte buildId ist die aktuelle: die Route selbst ist tot (Cache bleibt gültig)
+                except Exception as e:
+                    last_err = e
+                probes.append((tpl, False))
+        finally:
+            self._record_route_probes(window_key, probes)
 
         raise RuntimeError(f"Keine Leaderboard-Route gefunden. Letzter Fehler: {last_err}")
 
@@ -211,7 +559,7 @@ class SkoolFetcher:
         }
         resp = self.session.get(url, headers=headers, timeout=30)
         resp.raise_for_status()
-        data = resp.json()
-        fpath = self._save_raw(route, None, data)
+        data, raw, meta = self._read_json(resp)
+        fpath = self._save_raw(route, None, data, raw, meta)
         return data, route, fpath
 
@@ -0,0 +1,154 @@
+"""
+Schneller Member-Extraktor für die bekannte Payload-Form (pageProps.users).
+
+find_member_entries() läuft rekursiv über die komplette Next.js-Payload und prüft jede dict-Node
+per Key-Heuristik. Die Members-Seite hat aber eine feste Form: pageProps.users ist eine Liste von
+User-Objekten (mit verschachteltem 'member') oder {user, member}-Wrappern. Diese Form wird per
+Fingerprint erkannt; nur wenn sich der Fingerprint ändert, läuft die Heuristik einmal zur Prüfung
+mit. Jeder neue Fingerprint wird im Fetch-State ('member_shapes') protokolliert, damit eine
+Änderung am Skool-Frontend sichtbar wird statt nur langsam.
+"""
+from __future__ import annotations
+import hashlib
+import json
+import threading
+import time
+
+from .fetch_state import load_state, update_state
+from .utils import find_member_entries
+
+SHAPE_STATE = "member_shapes"
+# wie viele Einträge für Layout-Erkennung/Fingerprint angesehen werden
+_SAMPLE = 5
+
+# (tenant, fingerprint) -> "fast" | "heuristic"; spart das Lesen der State-Datei pro Seite
+_KNOWN: dict[tuple[str, str], str] = {}
+_KNOWN_LOCK = threading.Lock()
+
+
+def _item_layout(item) -> str | None:
+    """Form eines pageProps.users-Eintrags: 'wrapper' ({user, member}), 'user' (User mit id) oder None."""
+    if not isinstance(item, dict):
+        return None
+    if isinstance(item.get("user"), dict):
+        return "wrapper"
+    if "id" in item and any(k in item for k in ("firstName", "lastName", "name")):
+        return "user"
+    return None
+
+
+def shape_fingerprint(data) -> tuple[str, dict]:
+    """
+    Struktur-Fingerprint einer Members-Payload: pageProps-Keys, Typ von pageProps.users und
+    Layout/Keys der ersten Einträge (Werte spielen keine Rolle). Liefert (sha1[:16], Beschreibung).
+    """
+    page = data.get("pageProps") if isinstance(data, dict) else None
+    users = page.get("users") if isinstance(page, dict) else None
+    sample = users[:_SAMPLE] if isinstance(users, list) else []
+    layouts = sorted({str(_item_layout(u)) for u in sample})
+    member_nested = sorted({
+        isinstance((u.get("member") if isinstance(u, dict) else None), dict) for u in sample
+    })
+    desc = {
+        "pageProps": sorted(page) if isinstance(page, dict) else None,
+        "users": type(users).__name__,
+        "layouts": layouts,
+        "member_nested": member_nested,
+    }
+    fp = hashlib.sha1(json.dumps(desc, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+    return fp, desc
+
+
+def wrap_member_item(u) -> dict | None:
+    """Ein pageProps.users-Eintrag als {user, member}; None, wenn er nicht ins bekannte Layout passt."""
+    layout = _item_layout(u)
+    if layout == "wrapper":
+        member = u.get("member")
+        return u if isinstance(member, dict) else {"user": u["user"], "member": {}}
+    if layout == "user":
+        member = u.get("member")
+        return {"user": u, "member": member if isinstance(member, dict) else {}}
+    return None
+
+
+def _fast_entries(users: list) -> list[dict] | None:
+    """pageProps.users -> {user, member}-Einträge; None, wenn ein Eintrag nicht ins Layout passt."""
+    out = []
+    for u in users:
+        entry = wrap_member_item(u)
+        if entry is None:
+            return None
+        out.append(entry)
+    return out
+
+
+def _uid(entry: dict):
+    uid = entry.get("user", {}).get("id")
+    return str(uid) if uid else None
+
+
+def _record_shape(tenant: str, fp: str, desc: dict, mode: str, fast_n: int | None, heuristic_n: int):
+    now = time.strftime("%Y-%m-%dT%H:%M:%S")
+
+    def _apply(state: dict):
+        t = state.setdefault(tenant, {})
+        shapes = t.setdefault("shapes", {})
+        previous = t.get("current")
+        shapes.setdefault(fp, {"first_seen": now, **desc})
+        shapes[fp].update({"mode": mode, "verified_at": now, "fast_entries": fast_n,
+                           "heuristic_entries": heuristic_n})
+        t["current"] = fp
+        if previous and previous != fp:
+            t["changed_at"] = now
+            print(f"[member-shape] {tenant}: Payload-Form geändert {previous} -> {fp} ({mode})")
+        elif not previous:
+            print(f"[member-shape] {tenant}: Payload-Form {fp} erfasst ({mode})")
+        if mode == "heuristic":
+            print(f"[member-shape] WARNUNG {tenant}: pageProps.users passt nicht zum bekannten Layout "
+                  f"({desc}) – nutze langsame Heuristik.")
+
+    update_state(SHAPE_STATE, _apply)
+
+
+def _known_mode(tenant: str, fp: str) -> str | None:
+    with _KNOWN_LOCK:
+        mode = _KNOWN.get((tenant, fp))
+    if mode is not None:
+        return mode
+    shape = load_state(SHAPE_STATE).get(tenant, {}).get("shapes", {}).get(fp)
+    if shape and shape.get("mode") in ("fast", "heuristic"):
+        with _KNOWN_LOCK:
+            _KNOWN[(tenant, fp)] = shape["mode"]
+        return shape["mode"]
+    return None
+
+
+def extract_member_entries(data, tenant: str = "_") -> list[dict]:
+    """
+    {user, member}-Einträge einer Members-Payload. Bekannter Fingerprint -> direkter Zugriff auf
+    pageProps.users; unbekannter Fingerprint -> einmalig Heuristik zum Abgleich, Ergebnis wird
+    für den Tenant protokolliert. Passt das Layout nicht, wird die Heuristik verwendet.
+    """
+    page = data.get("pageProps") if isinstance(data, dict) else None
+    users = page.get("users") if isinstance(page, dict) else None
+    if isinstance(users, list) and not users:
+        return []  # leere (letzte) Seite: nichts zu extrahieren, keine eigene Form
+
+    fp, desc = shape_fingerprint(data)
+    mode = _known_mode(tenant, fp)
+    fast = _fast_entries(users) if isinstance(users, list) else None
+
+    if mode == "fast" and fast is not None:
+        return fast
+    if mode == "heuristic":
+        return list(find_member_entries(data))
+
+    # neue Form (oder bekannte Form, deren Einträge nicht mehr passen): gegen die Heuristik prüfen
+    heuristic = list(find_member_entries(data))
+    heuristic_ids = {_uid(e) for e in heuristic}
+    ok = fast is not None and all(_uid(e) in heuristic_ids for e in fast)
+    mode = "fast" if ok else "heuristic"
+    _record_shape(tenant, fp, desc, mode, len(fast) if fast is not None else None, len(heuristic))
+    with _KNOWN_LOCK:
+        _KNOWN[(tenant, fp)] = mode
+    return fast if ok else heuristic
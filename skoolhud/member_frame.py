@@ -0,0 +1,167 @@
+"""
+Spaltenorientierter Member-Snapshot eines Tenants (NumPy) für die Agents.
+
+Statt dass jeder Agent `members` selbst abfragt (oft die ganze Tabelle) und in Python filtert,
+lädt TenantFrame die Member eines Tenants mit einer Query in Arrays: IDs/Namen, Punkte und Ränge
+je Fenster, Level sowie Join-/Aktivitätszeitpunkt als Epoch-Sekunden. Filter wie
+"points_30d<5 & points_all>50" laufen vektorisiert.
+
+Innerhalb von `with shared_frames():` (der Agent-Runner setzt das pro Lauf) liefert get_frame()
+für jeden Tenant dieselbe Instanz; außerhalb wird bei jedem Aufruf frisch geladen.
+"""
+from __future__ import annotations
+import re
+import threading
+from contextlib import contextmanager
+
+import numpy as np
+from sqlalchemy import select
+
+from .models import Member
+from .utils.timestamps import to_utc
+
+# numerische Spalten (NULL -> NaN); Punkte/Level zählen in Filtern wie bisher `(x or 0)` als 0
+NUMERIC = ("points_7d", "points_30d", "points_all", "rank_7d", "rank_30d", "rank_all", "level_current")
+_NULL_AS_ZERO = frozenset(("points_7d", "points_30d", "points_all", "level_current"))
+TEXT = ("user_id", "name", "last_active_at_utc")
+# Epoch-Sekunden (UTC, NaN wenn leer/unlesbar) aus den normalisierten ISO-Spalten
+EPOCHS = {"joined_epoch": "joined_at_utc", "active_epoch": "last_active_at_utc"}
+
+_CLAUSE = re.compile(r"^\s*([a-z_0-9]+)\s*(<=|>=|==|!=|<|>)\s*(-?\d+(?:\.\d+)?)\s*$")
+_OPS = {
+    "<": np.less, "<=": np.less_equal, ">": np.greater, ">=": np.greater_equal,
+    "==": np.equal, "!=": np.not_equal,
+}
+
+
+def _epoch(value) -> float:
+    dt = to_utc(value)
+    return dt.timestamp() if dt is not None else np.nan
+
+
+class TenantFrame:
+    """Member eines Tenants als Spalten-Arrays gleicher Länge (Zugriff per Attribut, z. B. frame.points_30d)."""
+
+    def __init__(self, tenant: str, columns: dict[str, np.ndarray]):
+        self.tenant = tenant
+        self.columns = columns
+
+    @classmethod
+    def load(cls, session, tenant: str) -> "TenantFrame":
+        """Eine Query über die benötigten Spalten des Tenants."""
+        names = list(dict.fromkeys(TEXT + NUMERIC + tuple(EPOCHS.values())))
+        rows = session.execute(
+            select(*(getattr(Member, c) for c in names)).where(Member.tenant == tenant).order_by(Member.id)
+        ).all()
+        raw = dict(zip(names, zip(*rows))) if rows else {c: () for c in names}
+        data: dict[str, np.ndarray] = {}
+        for name in TEXT:
+            data[name] = np.array(raw[name], dtype=object)
+        for name in NUMERIC:
+            data[name] = np.array([np.nan if v is None else v for v in raw[name]], dtype=np.float64)
+        for name, src in EPOCHS.items():
+            data[name] = np.array([_epoch(v) for v in raw[src]], dtype=np.float64)
+        return cls(tenant, data)
+
+    def __len__(self) -> int:
+        return len(self.columns["user_id"])
+
+    def __getattr__(self, name: str) -> np.ndarray:
+        try:
+            return self.__dict__["columns"][name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def values(self, name: str) -> np.ndarray:
+        """Spalte für Vergleiche: Punkte/Level mit NULL als 0, sonst NaN (Vergleich immer False)."""
+        col = self.columns[name]
+        return np.nan_to_num(col, nan=0.0) if name in _NULL_AS_ZERO else col
+
+    def mask(self, expr: str) -> np.ndarray:
+        """
+        Bool-Maske für Ausdrücke aus `spalte op zahl`, verknüpft mit & und | (& bindet stärker),
+        z. B. "points_30d<5 & points_all>50". Unbekannte Spalten/Syntax -> ValueError.
+        """
+        result = np.zeros(len(self), dtype=bool)
+        for alternative in expr.split("|"):
+            part = np.ones(len(self), dtype=bool)
+            for clause in alternative.split("&"):
+                m = _CLAUSE.match(clause)
+                if not m or m.group(1) not in self.columns or m.group(1) in TEXT:
+                    raise ValueError(f"Ungültige Filterbedingung: {clause.strip()!r}")
+                col, op, value = m.groups()
+                with np.errstate(invalid="ignore"):
+                    part &= _OPS[op](self.values(col), float(value))
+            result |= part
+        return result
+
+    def count(self, expr: str) -> int:
+        return int(self.mask(expr).sum())
+
+    def top(self, column: str, n: int, mask: np.ndarray | None = None) -> np.ndarray:
+        """
+        Indizes der n größten Werte (NULL ausgeschlossen), absteigend; O(N) per argpartition statt
+        vollständiger Sortierung.
+        """
+        col = self.columns[column]
+        idx = np.flatnonzero(~np.isnan(col) if mask is None else (mask & ~np.isnan(col)))
+        if n <= 0 or not len(idx):
+            return idx[:0]
+        if len(idx) > n:
+            idx = idx[np.argpartition(-col[idx], n - 1)[:n]]
+        # stabile Reihenfolge: Wert absteigend, bei Gleichstand Ladereihenfolge
+        return idx[np.lexsort((idx, -col[idx]))]
+
+    def rows(self, selector, *names: str) -> list[tuple]:
+        """
+        Zeilen (Tupel der gewünschten Spalten) für eine Bool-Maske oder Index-Liste; NaN -> None,
+        Punkte/Ränge/Level wieder als int wie aus der DB.
+        """
+        idx = np.flatnonzero(selector) if getattr(selector, "dtype", None) == bool else np.asarray(selector, dtype=np.intp)
+        cols = []
+        for name in names:
+            col = self.columns[name][idx].tolist()
+            if name in NUMERIC:
+                col = [None if v != v else int(v) for v in col]
+            elif name in EPOCHS:
+                col = [None if v != v else v for v in col]
+            cols.append(col)
+        return list(zip(*cols)) if cols else []
+
+
+_SHARED: dict[str, TenantFrame] | None = None
+_SHARED_LOCK = threading.Lock()
+
+
+@contextmanager
+def shared_frames():
+    """Frames innerhalb des Blocks einmal pro Tenant laden und zwischen Agents teilen."""
+    global _SHARED
+    with _SHARED_LOCK:
+        outer = _SHARED
+        if outer is None:
+            _SHARED = {}
+    try:
+        yield
+    finally:
+        if outer is None:
+            with _SHARED_LOCK:
+                _SHARED = None
+
+
+def get_frame(tenant: str, session=None) -> TenantFrame:
+    """TenantFrame des Tenants – geteilt innerhalb von shared_frames(), sonst frisch geladen."""
+    def _load():
+        if session is not None:
+            return TenantFrame.load(session, tenant)
+        from .db import SessionLocal
+        with SessionLocal() as s:
+            return TenantFrame.load(s, tenant)
+
+    with _SHARED_LOCK:
+        if _SHARED is not None:
+            # unter dem Lock laden: parallel startende Agents warten statt doppelt zu laden
+            if tenant not in _SHARED:
+                _SHARED[tenant] = _load()
+            return _SHARED[tenant]
+    return _load()
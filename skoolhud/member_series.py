@@ -0,0 +1,191 @@
+"""
+Zeitreihen aus member_daily_snapshot als dichte NumPy-Matrizen (Member × Kalendertage).
+
+SnapshotSeries.load() liest die Snapshot-Historie eines Tenants mit einer Query und legt je
+Wert-Spalte (points_all, rank_all, …) eine float64-Matrix an; Tage ohne Snapshot sind NaN,
+die Tagesachse ist lückenlos (fehlende Tage = leere Spalte), damit Fenster Kalendertage zählen.
+Alle Kennzahlen sind vektorisiert (kumulative Summen statt Schleifen über Member/Tage):
+
+- daily_gain:   Punkte-Zuwachs pro Tag (points_all, Lücken vorwärts aufgefüllt)
+- activity:     aktive Tage (Zuwachs > 0) im gleitenden Fenster
+- streaks:      aktuelle und längste Serie aktiver Tage
+- velocity:     mittlerer Zuwachs pro Tag im Fenster
+- volatility:   Standardabweichung des Rangs im Fenster
+- engagement:   Zuwächse mit exponentiellem Zerfall (Halbwertszeit in Tagen) gewichtet
+
+Die Funktionen auf Matrizen (rolling_sum, forward_fill, …) sind unabhängig von der DB nutzbar.
+"""
+from __future__ import annotations
+from datetime import date
+
+import numpy as np
+from sqlalchemy import func, select
+
+from .models import MemberDailySnapshot
+
+VALUE_COLUMNS = ("level_current", "points_7d", "points_30d", "points_all", "rank_7d", "rank_30d", "rank_all")
+
+
+def forward_fill(matrix: np.ndarray) -> np.ndarray:
+    """NaN je Zeile mit dem letzten bekannten Wert auffüllen (vor dem ersten Wert bleibt NaN)."""
+    if not matrix.size:
+        return matrix.copy()
+    idx = np.where(np.isnan(matrix), 0, np.arange(matrix.shape[1]))
+    np.maximum.accumulate(idx, axis=1, out=idx)
+    return matrix[np.arange(matrix.shape[0])[:, None], idx]
+
+
+def rolling_sum(matrix: np.ndarray, window: int) -> np.ndarray:
+    """Summe über die letzten `window` Tage je Zelle (NaN zählt 0; am Anfang kürzeres Fenster)."""
+    csum = np.cumsum(np.nan_to_num(matrix), axis=1)
+    out = csum.copy()
+    if window < matrix.shape[1]:
+        out[:, window:] -= csum[:, :-window]
+    return out
+
+
+def rolling_std(matrix: np.ndarray, window: int, min_count: int = 2) -> np.ndarray:
+    """NaN-bewusste Standardabweichung im gleitenden Fenster (weniger als min_count Werte -> NaN)."""
+    present = ~np.isnan(matrix)
+    # um den Zeilenmittelwert zentrieren: vermeidet Auslöschung bei großen Rängen in s2/n - (s1/n)²
+    count = present.sum(axis=1, keepdims=True)
+    mean = np.divide(np.nansum(matrix, axis=1, keepdims=True), count, out=np.zeros(count.shape), where=count > 0)
+    centered = matrix - mean
+    n = rolling_sum(present.astype(np.float64), window)
+    s1 = rolling_sum(centered, window)
+    s2 = rolling_sum(centered * centered, window)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        var = s2 / n - (s1 / n) ** 2
+    var = np.clip(var, 0.0, None)
+    var[n < min_count] = np.nan
+    return np.sqrt(var)
+
+
+def run_lengths(active: np.ndarray) -> np.ndarray:
+    """Länge der bis zum jeweiligen Tag laufenden Serie von True-Werten je Zeile."""
+    days = np.arange(active.shape[1])
+    last_break = np.where(active, -1, days)
+    np.maximum.accumulate(last_break, axis=1, out=last_break)
+    return np.where(active, days - last_break, 0)
+
+
+def decay_weights(n_days: int, half_life: float) -> np.ndarray:
+    """Gewichte je Tag, der letzte Tag = 1, halbiert sich alle `half_life` Tage rückwärts."""
+    age = np.arange(n_days - 1, -1, -1, dtype=np.float64)
+    return np.power(0.5, age / float(half_life))
+
+
+class SnapshotSeries:
+    """Snapshot-Historie eines Tenants; `values[spalte]` ist eine Matrix len(user_ids) × len(days)."""
+
+    def __init__(self, tenant: str, user_ids: np.ndarray, days: np.ndarray, values: dict[str, np.ndarray]):
+        self.tenant = tenant
+        self.user_ids = user_ids
+        self.days = days
+        self.values = values
+
+    @classmethod
+    def load(cls, session, tenant: str, start: date | None = None, end: date | None = None,
+             columns: tuple[str, ...] = ("points_all", "rank_all")) -> "SnapshotSeries":
+        """
+        Eine Query über den Unique-Index (tenant, user_id, day): pro Member eine Zeile mit Tagen
+        und Werten als group_concat-Listen (NULL -> "nan"). Statt je Member-Tag ein Python-Tupel
+        zu bauen, parst NumPy die zusammengefügten Listen in C und befüllt die Matrizen per
+        Fancy Indexing.
+        """
+        unknown = set(columns) - set(VALUE_COLUMNS)
+        if unknown:
+            raise ValueError(f"Unbekannte Snapshot-Spalten: {', '.join(sorted(unknown))}")
+        mds = MemberDailySnapshot.__table__
+        # alle group_concat einer Zeile laufen über dieselben Zeilen in derselben Reihenfolge
+        q = (
+            select(
+                mds.c.user_id,
+                func.group_concat(func.substr(mds.c.day, 1, 10)),
+                *(func.group_concat(func.coalesce(mds.c[c], "nan")) for c in columns),
+            )
+            .where(mds.c.tenant == tenant)
+            .group_by(mds.c.user_id)
+            .order_by(mds.c.user_id)
+        )
+        if start is not None:
+            q = q.where(mds.c.day >= start)
+        if end is not None:
+            q = q.where(mds.c.day <= end)
+        rows = session.execute(q).all()
+        if not rows:
+            empty = np.empty((0, 0), dtype=np.float64)
+            return cls(tenant, np.array([], dtype=object), np.array([], dtype="datetime64[D]"),
+                       {c: empty.copy() for c in columns})
+
+        user_ids = np.array([r[0] for r in rows], dtype=object)
+        lengths = np.fromiter((r[1].count(",") + 1 for r in rows), dtype=np.intp, count=len(rows))
+        row_idx = np.repeat(np.arange(len(rows)), lengths)
+        days = np.array(",".join(r[1] for r in rows).split(","), dtype="datetime64[D]")
+        first = days.min()
+        col_idx = (days - first).astype(np.intp)
+        n_days = int(col_idx.max()) + 1
+
+        values = {}
+        for i, name in enumerate(columns, start=2):
+            m = np.full((len(rows), n_days), np.nan)
+            m[row_idx, col_idx] = np.array(",".join(r[i] for r in rows).split(","), dtype=np.float64)
+            values[name] = m
+        return cls(tenant, user_ids, first + np.arange(n_days), values)
+
+    def __len__(self) -> int:
+        return len(self.user_ids)
+
+    def daily_gain(self, column: str = "points_all") -> np.ndarray:
+        """Zuwachs gegenüber dem Vortag; Lücken aufgefüllt, Rücksetzer (negativ) zählen 0."""
+        filled = forward_fill(self.values[column])
+        gain = np.full(filled.shape, np.nan)
+        if filled.shape[1] > 1:
+            with np.errstate(invalid="ignore"):
+                gain[:, 1:] = np.clip(filled[:, 1:] - filled[:, :-1], 0.0, None)
+        return gain
+
+    def activity(self, window: int = 7, column: str = "points_all") -> np.ndarray:
+        """Anzahl aktiver Tage (Zuwachs > 0) in den letzten `window` Tagen, je Member und Tag."""
+        with np.errstate(invalid="ignore"):
+            active = self.daily_gain(column) > 0
+        return rolling_sum(active.astype(np.float64), window).astype(np.int64)
+
+    def streaks(self, column: str = "points_all") -> tuple[np.ndarray, np.ndarray]:
+        """(aktuelle Serie am letzten Tag, längste Serie) aktiver Tage je Member."""
+        with np.errstate(invalid="ignore"):
+            runs = run_lengths(self.daily_gain(column) > 0)
+        if not runs.size:
+            return np.zeros(len(self), dtype=np.int64), np.zeros(len(self), dtype=np.int64)
+        return runs[:, -1], runs.max(axis=1)
+
+    def velocity(self, window: int = 7, column: str = "points_all") -> np.ndarray:
+        """Mittlerer Punktezuwachs pro Tag über die letzten `window` Tage, je Member und Tag."""
+        return rolling_sum(self.daily_gain(column), window) / float(window)
+
+    def volatility(self, window: int = 14, column: str = "rank_all") -> np.ndarray:
+        """Standardabweichung des Rangs im Fenster (NaN bei weniger als zwei Snapshots)."""
+        return rolling_std(self.values[column], window)
+
+    def engagement(self, half_life: float = 7.0, column: str = "points_all") -> np.ndarray:
+        """Zerfallsgewichtete Summe der Tageszuwächse je Member (jüngere Tage zählen mehr)."""
+        gain = np.nan_to_num(self.daily_gain(column))
+        return gain @ decay_weights(gain.shape[1], half_life)
+
+    def summary(self, window: int = 7, half_life: float = 7.0, volatility_window: int = 14) -> dict[str, np.ndarray]:
+        """Kennzahlen je Member zum letzten Tag (Basis für Health-/KPI-Auswertungen)."""
+        if not len(self):
+            empty = np.zeros(0)
+            return {"user_id": self.user_ids, **{k: empty for k in ("active_days", "streak", "longest_streak",
+                                                                  "velocity", "rank_volatility", "engagement")}}
+        current, longest = self.streaks()
+        return {
+            "user_id": self.user_ids,
+            "active_days": self.activity(window)[:, -1],
+            "streak": current,
+            "longest_streak": longest,
+            "velocity": self.velocity(window)[:, -1],
+            "rank_volatility": (self.volatility(volatility_window)[:, -1] if "rank_all" in self.values
+                                else np.full(len(self), np.nan)),
+            "engagement": self.engagement(half_life),
+        }
@@ -0,0 +1,109 @@
+"""
+Fortschritts-Zustand für fetch-members-all (im Fetch-State, Bereich 'member_checkpoints').
+
+Nach jedem Commit wird pro Tenant ein Checkpoint geschrieben: buildId, letzte committete Seite,
+SHA-256 der bisher gesehenen User-IDs, Zeitstempel und die RAW-Pfade der Seiten. Bricht ein Lauf
+ab (Cookie abgelaufen, 5xx, Standby), setzt `--resume` bei der nächsten Seite fort, sofern die
+buildId noch passt. Die ID-Menge für das Abbruchkriterium "keine neuen IDs" wird lokal aus den
+archivierten Seiten rekonstruiert und gegen den Hash geprüft – ohne erneuten Download.
+
+Für den inkrementellen Sync (`--incremental`) hält der Bereich 'member_sync' pro Tenant den
+Zeitpunkt des letzten vollständigen Durchlaufs; ist er älter als `full_every_days`, läuft wieder
+ein Voll-Sync (nur der erkennt gelöschte/ausgetretene Member).
+"""
+from __future__ import annotations
+import hashlib
+import time
+from datetime import datetime, timedelta, timezone
+
+from .fetch_state import load_state, update_state
+from .utils.timestamps import to_utc
+
+CHECKPOINT_STATE = "member_checkpoints"
+SYNC_STATE = "member_sync"
+
+
+def seen_ids_digest(ids) -> str:
+    """Reihenfolge-unabhängiger Hash einer ID-Menge."""
+    h = hashlib.sha256()
+    for uid in sorted(ids):
+        h.update(uid.encode("utf-8"))
+        h.update(b"\n")
+    return h.hexdigest()
+
+
+def load_checkpoint(tenant: str) -> dict | None:
+    cp = load_state(CHECKPOINT_STATE).get(tenant)
+    return cp if isinstance(cp, dict) and cp.get("page") else None
+
+
+def save_checkpoint(tenant: str, build_id: str, page: int, seen_ids, raw_paths: list[str]):
+    """Checkpoint nach einem Commit: `page` ist die letzte Seite, deren Daten committet sind."""
+    entry = {
+        "build_id": build_id,
+        "page": int(page),
+        "seen_sha256": seen_ids_digest(seen_ids),
+        "seen_count": len(seen_ids),
+        "raw_paths": list(raw_paths),
+        "ts": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+    update_state(CHECKPOINT_STATE, lambda data: data.__setitem__(tenant, entry))
+
+
+def clear_checkpoint(tenant: str):
+    """Lauf vollständig abgeschlossen: nächster Lauf beginnt wieder bei Seite 1."""
+    update_state(CHECKPOINT_STATE, lambda data: data.pop(tenant, None))
+
+
+def rebuild_seen_ids(tenant: str, raw_paths: list[str]) -> set[str]:
+    """User-IDs der bereits verarbeiteten Seiten, aus den RAW-Dateien (wie im Normalizer extrahiert)."""
+    from .member_extract import extract_member_entries
+    from .raw_store import load_raw
+
+    ids: set[str] = set()
+    for path in raw_paths:
+        for entry in extract_member_entries(load_raw(path), tenant):
+            uid = entry.get("user", {}).get("id")
+            if uid:
+                ids.add(str(uid))
+    return ids
+
+
+def resume_point(tenant: str, build_id: str) -> tuple[int, set[str], list[str], str]:
+    """
+    (start_page, seen_ids, raw_paths, Hinweis) für --resume. Ohne Checkpoint, bei anderer buildId
+    oder wenn die rekonstruierten IDs nicht zum gespeicherten Hash passen: Start bei Seite 1.
+    """
+    cp = load_checkpoint(tenant)
+    if cp is None:
+        return 1, set(), [], "kein Checkpoint – starte bei Seite 1"
+    if cp.get("build_id") != build_id:
+        return 1, set(), [], f"buildId geändert ({cp.get('build_id')} -> {build_id}) – starte bei Seite 1"
+    raw_paths = list(cp.get("raw_paths") or [])
+    try:
+        seen = rebuild_seen_ids(tenant, raw_paths)
+    except OSError as e:
+        return 1, set(), [], f"RAW-Datei fehlt ({e}) – starte bei Seite 1"
+    if seen_ids_digest(seen) != cp.get("seen_sha256"):
+        return 1, set(), [], "gesehene IDs passen nicht zum Checkpoint – starte bei Seite 1"
+    return cp["page"] + 1, seen, raw_paths, f"setze nach Seite {cp['page']} fort ({len(seen)} IDs, Stand {cp.get('ts')})"
+
+
+def last_full_sync(tenant: str) -> datetime | None:
+    """Zeitpunkt (UTC) des letzten vollständig durchlaufenen Members-Syncs."""
+    return to_utc((load_state(SYNC_STATE).get(tenant) or {}).get("last_full_sync"))
+
+
+def full_sync_due(tenant: str, every_days: float, now: datetime | None = None) -> bool:
+    last = last_full_sync(tenant)
+    now = now or datetime.now(timezone.utc)
+    return last is None or now - last >= timedelta(days=every_days)
+
+
+def mark_full_sync(tenant: str, pages: int, now: datetime | None = None):
+    """Nach einem Voll-Sync (Pagination bis zum Ende) aufrufen."""
+    stamp = (now or datetime.now(timezone.utc)).isoformat()
+
+    def _apply(data: dict):
+        data.setdefault(tenant, {}).update({"last_full_sync": stamp, "pages": int(pages)})
+    update_state(SYNC_STATE, _apply)
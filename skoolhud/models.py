@@ -15,6 +15,8 @@ from sqlalchemy import (
     Date,
     DateTime,
     JSON,
+    ForeignKey,
+    Index,
     UniqueConstraint,
 )
 from sqlalchemy.sql import func
@@ -64,7 +66,7 @@ class Member(Base):
     skool_tag = Column(String, index=True, nullable=True)
 
     joined_date = Column(String, nullable=True)
-    # Normalized ISO UTC join timestamp (backfilled by scripts/backfill_joined_date.py)
+    # Normalized ISO UTC join timestamp (set by the normalizer; older rows: scripts/backfill_joined_date.py)
     joined_at_utc = Column(String, nullable=True)
     approved_at = Column(String, nullable=True)
     role = Column(String, nullable=True)
@@ -98,6 +100,12 @@ class Member(Base):
 
     __table_args__ = (
         UniqueConstraint("tenant", "user_id", name="uq_member_tenant_userid"),
+        # Top-N pro Tenant und Fenster (leaderboard_delta) ohne Sortieren der ganzen Tabelle
+        Index("ix_members_tenant_points_7d", "tenant", "points_7d"),
+        Index("ix_members_tenant_points_30d", "tenant", "points_30d"),
+        Index("ix_members_tenant_points_all", "tenant", "points_all"),
+        # Joiner-Fenster pro Tenant (agents/joiners): Range-Query auf dem ISO-UTC-String
+        Index("ix_members_tenant_joined", "tenant", "joined_at_utc"),
     )
 
 
@@ -116,6 +124,29 @@ class RawSnapshot(Base):
     meta = Column(JSON, nullable=True)
 
 
+# ------------------------
+# Leaderboard Captures
+# ------------------------
+class LeaderboardCapture(Base):
+    """
+    Ein Abruf eines Leaderboard-Fensters: alle Snapshot-Zeilen eines Normalisierungslaufs
+    hängen per capture_id daran (Deltas vergleichen ganze Captures, nicht einzelne Zeilen).
+    """
+    __tablename__ = "leaderboard_captures"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    tenant = Column(String, nullable=False)
+    window = Column(String, nullable=False)  # "7", "30", "all"
+    captured_at = Column(DateTime(timezone=True), server_default=func.now())
+    source_file = Column(String, nullable=True)
+    build_id = Column(String, nullable=True)
+    row_count = Column(Integer, nullable=True)
+
+    __table_args__ = (
+        Index("ix_lbc_tenant_window_id", "tenant", "window", "id"),
+    )
+
+
 # ------------------------
 # Leaderboard Snapshots
 # ------------------------
@@ -131,6 +162,14 @@ class LeaderboardSnapshot(Base):
     captured_at = Column(DateTime(timezone=True), server_default=func.now())
     source_file = Column(String, nullable=True)
     build_id = Column(String, nullable=True)
+    capture_id = Column(Integer, ForeignKey("leaderboard_captures.id"), nullable=True)
+
+    __table_args__ = (
+        # Delta-Join: alle Zeilen eines Captures bzw. ein User innerhalb eines Captures
+        Index("ix_lbs_capture_user", "capture_id", "user_id"),
+        # Zeitreihen pro Fenster (neuester Stand, Verlauf)
+        Index("ix_lbs_tenant_window_captured", "tenant", "window", "captured_at"),
+    )
 
 
 # -----------------------------
@@ -159,3 +198,9 @@ class MemberDailySnapshot(Base):
     last_active_at_utc = Column(DateTime)
 
     captured_at = Column(DateTime, server_default=func.now(), nullable=False)
+
+    __table_args__ = (
+        # ein Snapshot pro Member und Tag (Upsert-Ziel für snapshot-members-daily)
+        UniqueConstraint("tenant", "user_id", "day", name="uq_member_daily"),
+        Index("ix_mds_tenant_day", "tenant", "day"),
+    )
@@ -24,8 +24,7 @@ def main():
         # fetch & normalize
         run(["skoolhud", "fetch-members-all", "--slug", slug])
         run(["skoolhud", "fetch-leaderboard", "--slug", slug])
-        for w in ["all", "30", "7"]:
-            run(["skoolhud", "normalize-leaderboard", "--slug", slug, "--window", w])
+        run(["skoolhud", "normalize-leaderboard", "--slug", slug, "--all-windows"])
 
         # daily snapshot
         run(["skoolhud", "snapshot-members-daily", slug])
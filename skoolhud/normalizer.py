@@ -1,11 +1,13 @@
 import json
 from datetime import datetime
 
-from sqlalchemy import select
+from sqlalchemy import select, update, insert, bindparam, func, case, or_, literal, Date, DateTime
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import Session
 
-from .models import Member, RawSnapshot, LeaderboardSnapshot
-from .utils import get_in, to_utc_str, find_member_entries
+from .models import Member, RawSnapshot, LeaderboardSnapshot, LeaderboardCapture, MemberDailySnapshot
+from .utils import compile_path, to_utc_str
+from .member_extract import extract_member_entries, wrap_member_item
 
 # -------------------- Feld-Mapping für Member-Normalisierung --------------------
 FIELDS = {
@@ -32,6 +34,45 @@ FIELDS = {
 
 
 # -------------------- Upsert-Helfer --------------------
+# Stammdaten aus erster Quelle, die ein Update nicht überschreibt
+# einmalig kompiliert: (Feld, Accessor) – spart Split/Regex pro Member und Feld
+_FIELD_ACCESSORS = tuple((field, compile_path(path)) for field, path in FIELDS.items())
+_SP_DATA = compile_path("user.metadata.spData")
+
+PROTECTED_FIELDS = ("name", "email", "joined_date")
+
+
+def _merge_member_values(current: dict, record: dict) -> dict:
+    """
+    Merge-Policy für bestehende Member (Emails können gleich sein, user_id ist Master).
+    `current` braucht `last_active_raw`, `joined_date` und `joined_at_utc`; liefert die zu
+    setzenden Spalten.
+    """
+    changes = {}
+    if not current.get("joined_at_utc"):
+        # joined_date bleibt geschützt, fehlendes joined_at_utc (Zeilen von vor der Spalte) nachziehen
+        joined = to_utc_str(current.get("joined_date") or record.get("joined_date"))
+        if joined:
+            changes["joined_at_utc"] = joined
+    for k, v in record.items():
+        if v in (None, "", []):
+            continue  # leere Werte überschreiben nicht
+        if k in PROTECTED_FIELDS:
+            # Stammdaten aus erster Quelle nicht blind überschreiben
+            continue
+        if k == "last_active_raw":
+            # last_active nur vorwärts bewegen
+            cand = to_utc_str(v)
+            old_raw = current.get("last_active_raw")
+            old = to_utc_str(old_raw) if old_raw else None
+            if not old or (cand and cand > old):
+                changes["last_active_raw"] = v
+                changes["last_active_at_utc"] = cand
+            continue
+        changes[k] = v
+    return changes
+
+
 def upsert_member(session: Session, tenant: str, record: dict, build_id: str):
     # leere E-Mails als None behandeln
     if record.get("email") in ("", None):
@@ -57,20 +98,9 @@ def upsert_member(session: Session, tenant: str, record: dict, build_id: str):
         ).scalar_one_or_none()
 
     if existing:
-        # Merge-Policy (Emails können gleich sein, user_id ist Master)
-        for k, v in record.items():
-            if v in (None, "", []):
-                continue  # leere Werte überschreiben nicht
-            if k in ("name", "email", "joined_date"):
-                # Stammdaten aus erster Quelle nicht blind überschreiben
-                continue
-            if k == "last_active_raw":
-                cand = to_utc_str(v)
-                old = to_utc_str(existing.last_active_raw) if existing.last_active_raw else None
-                if not old or (cand and cand > old):
-                    existing.last_active_raw = v
-                    existing.last_active_at_utc = cand
-                continue
+        current = {"last_active_raw": existing.last_active_raw, "joined_date": existing.joined_date,
+                   "joined_at_utc": existing.joined_at_utc}
+        for k, v in _merge_member_values(current, record).items():
             setattr(existing, k, v)
         existing.source_last_update = "members"
         existing.source_build_id = build_id
@@ -79,6 +109,7 @@ def upsert_member(session: Session, tenant: str, record: dict, build_id: str):
     else:
         m = Member(tenant=tenant, **record)
         m.last_active_at_utc = to_utc_str(record.get("last_active_raw"))
+        m.joined_at_utc = to_utc_str(record.get("joined_date"))
         m.source_last_update = "members"
         m.source_build_id = build_id
         session.add(m)
@@ -87,19 +118,193 @@ def upsert_member(session: Session, tenant: str, record: dict, build_id: str):
         return "inserted"
 
 
+# Max. Parameter pro IN-Liste (SQLite-Variablenlimit)
+_IN_CHUNK = 500
+
+
+def _rows_where_in(session: Session, tenant: str, column, values) -> list[dict]:
+    tbl = Member.__table__
+    values = list(values)
+    out = []
+    for i in range(0, len(values), _IN_CHUNK):
+        chunk = values[i:i + _IN_CHUNK]
+        res = session.execute(select(tbl).where(tbl.c.tenant == tenant, column.in_(chunk)).order_by(tbl.c.id))
+        out.extend(dict(r) for r in res.mappings())
+    return out
+
+
+def upsert_members_bulk(session: Session, tenant: str, records: list[dict], build_id: str) -> tuple[int, int]:
+    """
+    Bulk-Variante von upsert_member für eine ganze Seite: lädt die betroffenen Member einmal
+    (IN auf user_id, dann email), wendet dieselbe Merge-Policy im Speicher an und schreibt mit
+    einem executemany-UPDATE (bestehende Zeilen) und einem INSERT … ON CONFLICT(tenant,user_id)
+    DO UPDATE (neue Zeilen). Liefert (inserted, updated).
+    """
+    tbl = Member.__table__
+    for rec in records:
+        # leere E-Mails als None behandeln
+        if rec.get("email") in ("", None):
+            rec["email"] = None
+
+    by_uid: dict[str, dict] = {}
+    by_email: dict[str, dict] = {}
+    uids = {r["user_id"] for r in records if r.get("user_id")}
+    for row in _rows_where_in(session, tenant, tbl.c.user_id, uids):
+        by_uid[row["user_id"]] = row
+    missing_emails = {r["email"] for r in records if r.get("email") and r.get("user_id") not in by_uid}
+    for row in _rows_where_in(session, tenant, tbl.c.email, missing_emails):
+        by_email.setdefault(row["email"], row)
+
+    dirty: dict[int, dict] = {}
+    new_rows: list[dict] = []
+    inserted = updated = 0
+    for rec in records:
+        row = by_uid.get(rec["user_id"]) if rec.get("user_id") else None
+        if row is None and rec.get("email"):
+            row = by_email.get(rec["email"])
+
+        if row is not None:
+            row.update(_merge_member_values(row, rec))
+            row["source_last_update"] = "members"
+            row["source_build_id"] = build_id
+            if row.get("id") is not None:
+                dirty[row["id"]] = row
+            if row.get("user_id"):
+                by_uid[row["user_id"]] = row
+            updated += 1
+        else:
+            row = {c.name: None for c in tbl.columns if c.name != "id"}
+            row.update(rec)
+            row["tenant"] = tenant
+            row["last_active_at_utc"] = to_utc_str(rec.get("last_active_raw"))
+            row["joined_at_utc"] = to_utc_str(rec.get("joined_date"))
+            row["source_last_update"] = "members"
+            row["source_build_id"] = build_id
+            new_rows.append(row)
+            # wie der flush im Einzelpfad: Folge-Einträge derselben Seite sehen den Datensatz
+            if row.get("user_id"):
+                by_uid[row["user_id"]] = row
+            if row.get("email"):
+                by_email.setdefault(row["email"], row)
+            inserted += 1
+
+    if dirty:
+        cols = [c.name for c in tbl.columns if c.name not in ("id", "tenant")]
+        stmt = (
+            update(tbl)
+            .where(tbl.c.id == bindparam("b_id"))
+            .values({c: bindparam(f"b_{c}") for c in cols})
+        )
+        session.execute(stmt, [{"b_id": r["id"], **{f"b_{c}": r.get(c) for c in cols}} for r in dirty.values()])
+
+    if new_rows:
+        ins = sqlite_insert(tbl)
+        # Sicherheitsnetz (z. B. parallel angelegte Zeile): Merge-Policy in SQL nachbilden
+        keep = {"id", "tenant", "user_id", "last_active_raw", "last_active_at_utc", "joined_at_utc", *PROTECTED_FIELDS}
+        set_ = {c.name: func.coalesce(ins.excluded[c.name], c) for c in tbl.columns if c.name not in keep}
+        set_["joined_at_utc"] = func.coalesce(tbl.c.joined_at_utc, ins.excluded.joined_at_utc)
+        newer = or_(tbl.c.last_active_at_utc.is_(None), ins.excluded.last_active_at_utc > tbl.c.last_active_at_utc)
+        set_["last_active_raw"] = case((newer, func.coalesce(ins.excluded.last_active_raw, tbl.c.last_active_raw)), else_=tbl.c.last_active_raw)
+        set_["last_active_at_utc"] = case((newer, func.coalesce(ins.excluded.last_active_at_utc, tbl.c.last_active_at_utc)), else_=tbl.c.last_active_at_utc)
+        stmt = ins.on_conflict_do_update(index_elements=[tbl.c.tenant, tbl.c.user_id], set_=set_)
+        session.execute(stmt, new_rows)
+
+    return inserted, updated
+
+
+def _member_record(node: dict) -> dict:
+    rec = {}
+    # 1) Standardfelder mappen
+    for field, accessor in _FIELD_ACCESSORS:
+        rec[field] = accessor(node)
+
+    # 2) spData: JSON-String mit All-Time Punkten & Level
+    #    Beispiel: {"pts":2269,"lv":7,"pcl":2015,"pnl":8015,"role":3}
+    sp_raw = _SP_DATA(node)
+    if sp_raw:
+        try:
+            sp = json.loads(sp_raw) if isinstance(sp_raw, str) else sp_raw
+            if isinstance(sp, dict):
+                # Level nur setzen, wenn noch nicht vorhanden
+                if sp.get("lv") is not None:
+                    rec.setdefault("level_current", sp.get("lv"))
+                # All-time Punkte als aktueller Stand, nur setzen wenn noch leer
+                if sp.get("pts") is not None:
+                    rec.setdefault("points_all", sp.get("pts"))
+        except Exception:
+            # falls mal kaputtes JSON kommt, ignorieren
+            pass
+    return rec
+
+
 # -------------------- Members normalisieren --------------------
-def normalize_members_json(session: Session, tenant: str, build_id: str, raw_json: dict, raw_path: str):
+def _add_raw_snapshot(session: Session, tenant: str, build_id: str, raw_path: str):
+    # Größe/Hash/Parsezeit liefert der Fetcher mit dem RAW-Pfad (RawRef.meta) – kein erneutes json.dumps
     session.add(
         RawSnapshot(
             tenant=tenant,
             route="members",
             build_id=build_id,
-            path=raw_path,
-            meta={"size": len(json.dumps(raw_json))},
+            path=str(raw_path),
+            meta=dict(getattr(raw_path, "meta", None) or {}) or None,
         )
     )
 
-    entries = list(find_member_entries(raw_json))
+
+def count_changed_members(session: Session, tenant: str, records: list[dict]) -> int:
+    """
+    Anzahl Records, die neu sind oder sich gegenüber dem gespeicherten Stand geändert haben
+    (user.updatedAt abweichend oder lastOffline neuer). Grundlage für den inkrementellen Sync;
+    muss vor dem Upsert laufen. Records ohne user_id zählen als geändert.
+    """
+    tbl = Member.__table__
+    uids = list({str(r["user_id"]) for r in records if r.get("user_id")})
+    stored = {}
+    for i in range(0, len(uids), _IN_CHUNK):
+        res = session.execute(
+            select(tbl.c.user_id, tbl.c.updated_at_raw, tbl.c.last_active_at_utc)
+            .where(tbl.c.tenant == tenant, tbl.c.user_id.in_(uids[i:i + _IN_CHUNK]))
+        )
+        stored.update((row.user_id, row) for row in res)
+
+    changed = 0
+    for rec in records:
+        row = stored.get(str(rec["user_id"])) if rec.get("user_id") else None
+        if row is None:
+            changed += 1
+            continue
+        if rec.get("updated_at_raw") and rec["updated_at_raw"] != row.updated_at_raw:
+            changed += 1
+            continue
+        active = to_utc_str(rec.get("last_active_raw")) if rec.get("last_active_raw") else None
+        if active and (not row.last_active_at_utc or active > row.last_active_at_utc):
+            changed += 1
+    return changed
+
+
+def _upsert_records(session: Session, tenant: str, records: list[dict], build_id: str, bulk: bool) -> tuple[int, int]:
+    if bulk:
+        return upsert_members_bulk(session, tenant, records, build_id)
+    inserted = updated = 0
+    for rec in records:
+        status = upsert_member(session, tenant, rec, build_id)
+        if status == "inserted":
+            inserted += 1
+        else:
+            updated += 1
+    return inserted, updated
+
+
+def normalize_members_json(session: Session, tenant: str, build_id: str, raw_json: dict, raw_path: str,
+                           bulk: bool = False, track_changes: bool = False):
+    """
+    Normalisiert eine Members-Payload. bulk=True: ein Preload + gebatchte Writes pro Seite
+    (upsert_members_bulk) statt bis zu zwei SELECTs und einem flush pro Member.
+    track_changes=True: "changed" im Ergebnis zählt neue/geänderte Member (count_changed_members).
+    """
+    _add_raw_snapshot(session, tenant, build_id, raw_path)
+
+    entries = extract_member_entries(raw_json, tenant)
     if not entries:
         # Fallback: rohe Hinweise ausgeben
         try:
@@ -108,43 +313,81 @@ def normalize_members_json(session: Session, tenant: str, build_id: str, raw_jso
         except Exception:
             pass
 
-    inserted = updated = 0
-    for node in entries:
-        rec = {}
-        # 1) Standardfelder mappen
-        for field, path in FIELDS.items():
-            rec[field] = get_in(node, path)
-
-        # 2) spData: JSON-String mit All-Time Punkten & Level
-        #    Beispiel: {"pts":2269,"lv":7,"pcl":2015,"pnl":8015,"role":3}
-        sp_raw = get_in(node, "user.metadata.spData")
-        if sp_raw:
-            try:
-                sp = json.loads(sp_raw) if isinstance(sp_raw, str) else sp_raw
-                if isinstance(sp, dict):
-                    # Level nur setzen, wenn noch nicht vorhanden
-                    if sp.get("lv") is not None:
-                        rec.setdefault("level_current", sp.get("lv"))
-                    # All-time Punkte als aktueller Stand, nur setzen wenn noch leer
-                    if sp.get("pts") is not None:
-                        rec.setdefault("points_all", sp.get("pts"))
-            except Exception:
-                # falls mal kaputtes JSON kommt, ignorieren
-                pass
-
-        # 3) Upsert
-        status = upsert_member(session, tenant, rec, build_id)
-        if status == "inserted":
-            inserted += 1
-        else:
-            updated += 1
+    records = [_member_record(node) for node in entries]
+    user_ids = [str(r["user_id"]) for r in records if r.get("user_id")]
+    changed = count_changed_members(session, tenant, records) if track_changes else None
+    inserted, updated = _upsert_records(session, tenant, records, build_id, bulk)
+    return {"inserted": inserted, "updated": updated, "scanned_nodes": len(entries), "user_ids": user_ids,
+            "changed": changed}
 
-    return {"inserted": inserted, "updated": updated, "scanned_nodes": len(entries)}
 
+STREAM_BATCH = 500
 
-from .models import Member, LeaderboardSnapshot
-from datetime import datetime
-from .utils import get_in
+
+def normalize_members_stream(session: Session, tenant: str, build_id: str, raw_path: str,
+                             bulk: bool = True, batch_size: int = STREAM_BATCH, track_changes: bool = False):
+    """
+    Streaming-Variante von normalize_members_json: liest pageProps.users aus der gespeicherten
+    RAW-Datei Eintrag für Eintrag (iter_raw_items) und schreibt in Batches von `batch_size`.
+    Die Payload wird nie komplett materialisiert. Einträge außerhalb des bekannten Layouts werden
+    übersprungen; liefert die Datei gar keine Einträge (z. B. geänderte Form), wird sie wie bisher
+    komplett geladen und über normalize_members_json (mit Fingerprint/Heuristik) normalisiert.
+    """
+    from .raw_store import iter_raw_items, load_raw
+
+    inserted = updated = scanned = skipped = changed = 0
+    user_ids: list[str] = []
+    batch: list[dict] = []
+
+    def flush():
+        nonlocal inserted, updated, changed
+        if track_changes:
+            changed += count_changed_members(session, tenant, batch)
+        ins, upd = _upsert_records(session, tenant, batch, build_id, bulk)
+        inserted += ins
+        updated += upd
+        batch.clear()
+
+    for item in iter_raw_items(str(raw_path), "pageProps.users.item"):
+        scanned += 1
+        entry = wrap_member_item(item)
+        if entry is None:
+            skipped += 1
+            continue
+        rec = _member_record(entry)
+        if rec.get("user_id"):
+            user_ids.append(str(rec["user_id"]))
+        batch.append(rec)
+        if len(batch) >= batch_size:
+            flush()
+
+    if scanned == 0:
+        return normalize_members_json(session, tenant, build_id, load_raw(str(raw_path)), raw_path, bulk=bulk,
+                                      track_changes=track_changes)
+
+    if batch:
+        flush()
+    if skipped:
+        print(f"[member-shape] {tenant}: {skipped}/{scanned} Einträge passen nicht zum bekannten Layout (übersprungen).")
+    _add_raw_snapshot(session, tenant, build_id, raw_path)
+    return {"inserted": inserted, "updated": updated, "scanned_nodes": scanned - skipped, "user_ids": user_ids,
+            "changed": changed if track_changes else None}
+
+
+LEADERBOARD_WINDOWS = ("all", "30", "7")
+# Fenster -> (Punkte-Spalte, Rang-Spalte) in members
+_LB_WINDOW_COLUMNS = {"7": ("points_7d", "rank_7d"), "30": ("points_30d", "rank_30d"), "all": ("points_all", "rank_all")}
+# gewünschtes Fenster -> Bucket-Name im JSON
+_LB_BUCKETS = {"all": "allTime", "7": "past7Days", "30": "past30Days"}
+# Kandidaten-Pfade je Fenster in Reihenfolge der Wahrscheinlichkeit, einmalig kompiliert
+_LB_PATHS = {
+    window: (
+        compile_path(f"pageProps.s.{bucket}.users"),
+        compile_path(f"pageProps.{bucket}.users"),
+        compile_path(f"pageProps.{bucket}"),  # falls direkt eine Liste ist
+    )
+    for window, bucket in _LB_BUCKETS.items()
+}
 
 def normalize_leaderboard_json(session, tenant: str, build_id: str, data: dict, fpath: str, window: str):
     """
@@ -156,22 +399,13 @@ def normalize_leaderboard_json(session, tenant: str, build_id: str, data: dict,
     if not data or "pageProps" not in data:
         return {"inserted": 0, "updated": 0, "scanned": 0}
 
-    # gewünschtes Fenster → Bucket-Namen im JSON
-    key_map = {"all": "allTime", "7": "past7Days", "30": "past30Days"}
-    bucket_key = key_map.get(window)
-    if not bucket_key:
+    candidate_paths = _LB_PATHS.get(window)
+    if not candidate_paths:
         return {"inserted": 0, "updated": 0, "scanned": 0}
 
-    # Kandidaten-Pfade in Reihenfolge der Wahrscheinlichkeit
-    candidate_paths = [
-        f"pageProps.s.{bucket_key}.users",
-        f"pageProps.{bucket_key}.users",
-        f"pageProps.{bucket_key}",  # falls direkt eine Liste ist
-    ]
-
     entries = None
-    for p in candidate_paths:
-        val = get_in(data, p)
+    for accessor in candidate_paths:
+        val = accessor(data)
         if isinstance(val, list) and (not val or isinstance(val[0], dict)):
             entries = val
             break
@@ -188,8 +422,13 @@ def normalize_leaderboard_json(session, tenant: str, build_id: str, data: dict,
         # Nichts gefunden → sauber aussteigen
         return {"inserted": 0, "updated": 0, "scanned": 0}
 
-    inserted = updated = scanned = 0
+    return _store_leaderboard_entries(session, tenant, build_id, entries, fpath, window)
+
 
+def _store_leaderboard_entries(session, tenant: str, build_id: str, entries, fpath: str, window: str):
+    """Schreibt die Einträge eines Fensters (beliebiges Iterable, auch ein Stream) in members + Snapshots."""
+    scanned = 0
+    parsed: list[tuple[str, object, object]] = []
     for e in entries:
         if not isinstance(e, dict):
             continue
@@ -199,37 +438,167 @@ def normalize_leaderboard_json(session, tenant: str, build_id: str, data: dict,
         user_id = str(e.get("userId") or user.get("id") or "")  # beides absichern
         if not user_id:
             continue
+        parsed.append((user_id, e.get("points"), e.get("rank")))
 
-        points = e.get("points")
-        rank = e.get("rank")
-
-        # Member aktualisieren (nur wenn vorhanden)
-        m = session.query(Member).filter(
-            Member.tenant == tenant,
-            Member.user_id == user_id
-        ).one_or_none()
-
-        if m:
-            if window == "7":
-                m.points_7d, m.rank_7d = points, rank
-            elif window == "30":
-                m.points_30d, m.rank_30d = points, rank
-            elif window == "all":
-                m.points_all, m.rank_all = points, rank
-            updated += 1
+    if not parsed:
+        return {"inserted": 0, "updated": 0, "scanned": scanned}
+
+    # Member aktualisieren (nur wenn vorhanden): ein IN-Query fürs ganze Fenster ...
+    tbl = Member.__table__
+    ids = list({uid for uid, _, _ in parsed})
+    member_pk: dict[str, int] = {}
+    for i in range(0, len(ids), _IN_CHUNK):
+        rows = session.execute(
+            select(tbl.c.id, tbl.c.user_id).where(tbl.c.tenant == tenant, tbl.c.user_id.in_(ids[i:i + _IN_CHUNK]))
+        )
+        member_pk.update({uid: pk for pk, uid in rows})
 
-        # Snapshot erfassen
-        snap = LeaderboardSnapshot(
+    # ... und ein executemany-UPDATE für Punkte + Rang
+    points_col, rank_col = _LB_WINDOW_COLUMNS[window]
+    updates = [{"b_id": member_pk[uid], "b_points": points, "b_rank": rank}
+               for uid, points, rank in parsed if uid in member_pk]
+    if updates:
+        stmt = (
+            update(tbl)
+            .where(tbl.c.id == bindparam("b_id"))
+            .values({points_col: bindparam("b_points"), rank_col: bindparam("b_rank")})
+        )
+        session.execute(stmt, updates)
+
+    # ein Capture pro Aufruf/Fenster; alle Snapshots per Core-Bulk-Insert daran hängen
+    captured_at = datetime.utcnow()
+    capture_id = session.execute(
+        insert(LeaderboardCapture.__table__).values(
             tenant=tenant,
-            user_id=user_id,
             window=window,
-            points=points,
-            rank=rank,
-            captured_at=datetime.utcnow(),
+            captured_at=captured_at,
             source_file=fpath,
             build_id=build_id,
+            row_count=len(parsed),
         )
-        session.add(snap)
-        inserted += 1
+    ).inserted_primary_key[0]
+    session.execute(
+        insert(LeaderboardSnapshot.__table__),
+        [
+            {
+                "tenant": tenant,
+                "user_id": uid,
+                "window": window,
+                "points": points,
+                "rank": rank,
+                "captured_at": captured_at,
+                "source_file": fpath,
+                "build_id": build_id,
+                "capture_id": capture_id,
+            }
+            for uid, points, rank in parsed
+        ],
+    )
+
+    return {"inserted": len(parsed), "updated": len(updates), "scanned": scanned, "capture_id": capture_id}
 
-    return {"inserted": inserted, "updated": updated, "scanned": scanned}
+
+def normalize_leaderboard_windows(session, tenant: str, build_id: str, data: dict, fpath: str, windows=LEADERBOARD_WINDOWS):
+    """Normalisiert mehrere Fenster aus derselben, bereits geparsten Payload (ein Commit beim Aufrufer)."""
+    return {w: normalize_leaderboard_json(session, tenant, build_id, data, fpath, w) for w in windows}
+
+
+def normalize_leaderboard_windows_stream(session, tenant: str, build_id: str, fpath: str, windows=LEADERBOARD_WINDOWS):
+    """
+    Streaming-Variante: liest die Einträge je Fenster inkrementell aus der RAW-Datei (ein Durchlauf
+    pro Kandidaten-Pfad, ohne die Payload zu materialisieren). Findet sich für ein Fenster kein
+    bekannter Pfad, wird die Datei einmal komplett geladen (normalize_leaderboard_json-Fallbacks).
+    Ohne ijson wird die Payload direkt einmal geladen statt pro Kandidaten-Pfad und Fenster erneut.
+    """
+    from .raw_store import iter_raw_items, load_raw, streaming_available
+
+    if not streaming_available():
+        return normalize_leaderboard_windows(session, tenant, build_id, load_raw(str(fpath)), fpath, windows)
+
+    results, missing = {}, []
+    for w in windows:
+        bucket = _LB_BUCKETS.get(w)
+        if not bucket:
+            results[w] = {"inserted": 0, "updated": 0, "scanned": 0}
+            continue
+        for prefix in (f"pageProps.s.{bucket}.users.item", f"pageProps.{bucket}.users.item", f"pageProps.{bucket}.item"):
+            items = iter_raw_items(str(fpath), prefix)
+            first = next(items, None)
+            if isinstance(first, dict):
+                results[w] = _store_leaderboard_entries(session, tenant, build_id, _chain_first(first, items), fpath, w)
+                break
+            items.close()
+        else:
+            missing.append(w)
+
+    if missing:
+        data = load_raw(str(fpath))
+        results.update({w: normalize_leaderboard_json(session, tenant, build_id, data, fpath, w) for w in missing})
+    return {w: results[w] for w in windows}
+
+
+def _chain_first(first, rest):
+    yield first
+    yield from rest
+
+
+# -------------------- Member Daily Snapshot (set-basiert) --------------------
+_DAILY_VALUE_COLUMNS = ("level_current", "points_7d", "points_30d", "points_all", "rank_7d", "rank_30d", "rank_all")
+
+
+def _sqlite_utc_datetime(col):
+    """
+    ISO-String -> UTC im DateTime-Format von SQLAlchemy/SQLite ("YYYY-MM-DD HH:MM:SS.ffffff").
+    datetime() allein rundet auf Millisekunden und gibt nur ganze Sekunden aus; daher werden die
+    Sekunden ohne Bruchteil umgerechnet und der Bruchteil aus dem Original (auf 6 Stellen) angehängt.
+    """
+    has_frac = func.substr(col, 20, 1) == "."
+    tail = func.substr(col, 21)
+    end = func.coalesce(
+        func.nullif(func.instr(tail, "Z"), 0),
+        func.nullif(func.instr(tail, "+"), 0),
+        func.nullif(func.instr(tail, "-"), 0),
+        func.length(tail) + 1,
+    )
+    frac = case((has_frac, func.substr(tail, 1, end - 1)), else_="")
+    zone = case((has_frac, func.substr(tail, end)), else_=func.substr(col, 20))
+    whole = func.datetime(func.substr(col, 1, 19).concat(zone))
+    return whole.concat(".").concat(func.substr(frac.concat("000000"), 1, 6))
+
+
+def snapshot_members_daily(session, tenant: str, day, captured_at: datetime | None = None) -> dict:
+    """
+    Schreibt den Tages-Snapshot aller Member eines Tenants mit einem einzigen
+    INSERT … SELECT … ON CONFLICT(tenant, user_id, day) DO UPDATE (statt Lookup + Write pro Member).
+    last_active_at_utc (ISO-String in members) wird in SQL nach UTC normalisiert, Sekundenbruchteile
+    bleiben wie beim früheren Pfad über Python-datetime erhalten.
+    Liefert {"inserted", "updated"}; Member ohne user_id werden übersprungen.
+    """
+    m = Member.__table__
+    mds = MemberDailySnapshot.__table__
+    captured_at = captured_at or datetime.utcnow()
+    scope = (m.c.tenant == tenant, m.c.user_id.is_not(None))
+
+    # vorhandene Zeilen für die Zählung (inserted/updated) – ein COUNT über den Unique-Index
+    existing = session.execute(
+        select(func.count()).select_from(
+            mds.join(m, (m.c.tenant == mds.c.tenant) & (m.c.user_id == mds.c.user_id))
+        ).where(mds.c.tenant == tenant, mds.c.day == day)
+    ).scalar_one()
+
+    source = select(
+        m.c.tenant,
+        m.c.user_id,
+        literal(day, Date),
+        *(m.c[c] for c in _DAILY_VALUE_COLUMNS),
+        _sqlite_utc_datetime(m.c.last_active_at_utc),
+        literal(captured_at, DateTime),
+    ).where(*scope)
+    cols = ["tenant", "user_id", "day", *_DAILY_VALUE_COLUMNS, "last_active_at_utc", "captured_at"]
+    stmt = sqlite_insert(mds).from_select(cols, source)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["tenant", "user_id", "day"],
+        set_={c: stmt.excluded[c] for c in cols[3:]},
+    )
+    written = session.execute(stmt).rowcount
+    return {"inserted": written - existing, "updated": existing}
@@ -0,0 +1,112 @@
+"""
+Producer/Consumer-Pipeline für seitenweise Abrufe (z. B. fetch-members-all).
+
+Der Fetch-Stage (Aufrufer-Thread) lädt Seiten und hält die Rate-Pausen ein, ein Worker-Thread
+archiviert/normalisiert die Seiten aus einer begrenzten Queue und committet gebündelt. So laufen
+DB-Arbeit und RAW-I/O während der Pausen statt davor. Die Abbruchentscheidung bleibt beim
+Consumer: bevor Seite N geladen wird, muss das Ergebnis von Seite N - lookahead vorliegen – mit
+lookahead=1 wird also keine Seite mehr abgerufen als im sequentiellen Ablauf.
+"""
+from __future__ import annotations
+import queue
+import threading
+import time
+from collections import defaultdict
+from typing import Callable
+
+_DONE = object()
+
+
+class StageTimings:
+    """Summierte Laufzeit (Sekunden) und Aufrufzahl pro Stage; thread-sicher."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.seconds: dict[str, float] = defaultdict(float)
+        self.calls: dict[str, int] = defaultdict(int)
+
+    def add(self, stage: str, seconds: float):
+        with self._lock:
+            self.seconds[stage] += seconds
+            self.calls[stage] += 1
+
+    def timed(self, stage: str, fn, *args):
+        t0 = time.perf_counter()
+        try:
+            return fn(*args)
+        finally:
+            self.add(stage, time.perf_counter() - t0)
+
+    def summary(self) -> str:
+        """Einzeilige Übersicht, z. B. 'fetch=12.3s/5 · wait=60.0s/4 · normalize=1.2s/5'."""
+        with self._lock:
+            return " · ".join(f"{k}={v:.1f}s/{self.calls[k]}" for k, v in self.seconds.items())
+
+
+def run_page_pipeline(fetch_page: Callable[[int], object], consume: Callable[[int, object], bool], *,
+                      max_pages: int, wait: Callable[[int], float], commit: Callable[[], None],
+                      start_page: int = 1, lookahead: int = 1, commit_every: int = 5,
+                      timings: StageTimings | None = None) -> StageTimings:
+    """
+    Lädt Seiten start_page..max_pages mit fetch_page(page) und übergibt sie über eine Queue
+    (maxsize=lookahead) an consume(page, item) im Worker-Thread; True von consume beendet die
+    Pagination. Zwischen zwei Abrufen wird wait(page) Sekunden pausiert (vorzeitig beendet,
+    sobald der Consumer stoppt). commit() läuft im Worker nach `commit_every` Seiten, wenn die
+    Queue leer ist, und am Ende. Fehler einer Stage beenden beide und werden im Aufrufer erneut
+    geworfen. Liefert die Stage-Zeiten (fetch, wait, gate, normalize, commit).
+    """
+    timings = timings or StageTimings()
+    lookahead = max(1, int(lookahead))
+    pages: queue.Queue = queue.Queue(maxsize=lookahead)
+    stop = threading.Event()
+    progress = threading.Condition()
+    state = {"done": start_page - 1, "error": None}
+
+    def worker():
+        pending = 0
+        try:
+            while True:
+                got = pages.get()
+                if got is _DONE:
+                    break
+                page, item = got
+                if not stop.is_set() and timings.timed("normalize", consume, page, item):
+                    stop.set()
+                pending += 1
+                if pending >= commit_every or pages.empty() or stop.is_set():
+                    timings.timed("commit", commit)
+                    pending = 0
+                with progress:
+                    state["done"] = page
+                    progress.notify_all()
+            if pending:
+                timings.timed("commit", commit)
+        except BaseException as e:  # an den Aufrufer weiterreichen
+            state["error"] = e
+            stop.set()
+            with progress:
+                progress.notify_all()
+            # Queue leeren, damit ein blockierter Producer weiterkommt
+            while pages.get() is not _DONE:
+                pass
+
+    t = threading.Thread(target=worker, name="page-pipeline", daemon=True)
+    t.start()
+    try:
+        for page in range(start_page, max_pages + 1):
+            if page > start_page:
+                timings.timed("wait", stop.wait, max(0.0, float(wait(page - 1))))
+                t0 = time.perf_counter()
+                with progress:
+                    progress.wait_for(lambda: stop.is_set() or state["done"] >= page - lookahead)
+                timings.add("gate", time.perf_counter() - t0)
+            if stop.is_set():
+                break
+            item = timings.timed("fetch", fetch_page, page)
+            pages.put((page, item))
+    finally:
+        pages.put(_DONE)
+        t.join()
+    if state["error"] is not None:
+        raise state["error"]
+    return timings
@@ -0,0 +1,380 @@
+"""
+Content-adressierter RAW-Speicher für Skool-Antworten (ersetzt die einzelnen JSON-Dateien).
+
+Layout unter <raw_dir>/<tenant>/:
+  objects/<sha[:2]>/<sha>.json.zst|.json.gz   komprimierte Payloads, identische Antworten nur einmal
+  index.jsonl                                 ein Eintrag pro Abruf (ts, tenant, route, kind, build_id, sha256, size, path)
+  latest.json                                 Manifest: neuester Eintrag pro Art und pro Route (O(1)-Lookup,
+                                              Routen ohne buildId geschlüsselt, damit Deploys keine Schlüssel anhäufen)
+
+Ist `zstandard` installiert, wird zstd genutzt, sonst gzip (RAW_CODEC=gzip|zstd erzwingt eins).
+Ältere RAW-Dateien (*.json) bleiben lesbar: load_raw() erkennt das Format an der Endung.
+Streaming (optional, `ijson`, Extra `skoolhud[stream]`): put_stream() archiviert eine Antwort chunkweise, iter_raw_items()
+liefert Einträge einer gespeicherten Payload einzeln, ohne sie komplett zu materialisieren.
+"""
+from __future__ import annotations
+import gzip
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from glob import glob
+
+import orjson
+
+try:  # optional: besseres Verhältnis und schneller als gzip
+    import zstandard as _zstd
+except ImportError:  # pragma: no cover - abhängig von der Umgebung
+    _zstd = None
+
+try:  # optional: inkrementelles Parsen großer Payloads (Streaming-Modus)
+    import ijson as _ijson
+except ImportError:  # pragma: no cover - abhängig von der Umgebung
+    _ijson = None
+
+INDEX_NAME = "index.jsonl"
+HEADS_NAME = "latest.json"
+_INDEX_LOCK = threading.Lock()
+
+
+def _codec() -> str:
+    wanted = os.environ.get("RAW_CODEC", "").strip().lower()
+    if wanted == "gzip" or _zstd is None:
+        return "gzip"
+    return "zstd"
+
+
+def route_kind(route: str) -> str:
+    """Grobe Routen-Art für den Index: members | leaderboards | other."""
+    r = (route or "").lower().split("?", 1)[0]
+    if r.endswith("members.json") or "/-/members" in r:
+        return "members"
+    if "leaderboards" in r:
+        return "leaderboards"
+    return "other"
+
+
+_NEXT_BUILD = re.compile(r"/_next/data/[^/]+/")
+
+
+def route_key(route: str) -> str:
+    """Manifest-Schlüssel einer Route: die buildId in /_next/data/<build>/ wird durch {build} ersetzt."""
+    return _NEXT_BUILD.sub("/_next/data/{build}/", route or "", count=1)
+
+
+def _compress(raw: bytes, codec: str) -> bytes:
+    if codec == "zstd":
+        return _zstd.ZstdCompressor(level=3).compress(raw)
+    return gzip.compress(raw, compresslevel=6)
+
+
+def read_raw_bytes(path: str) -> bytes:
+    """Liest eine RAW-Datei (zst/gz/legacy json) und liefert die unkomprimierten JSON-Bytes."""
+    with open(path, "rb") as f:
+        blob = f.read()
+    if path.endswith(".zst"):
+        if _zstd is None:
+            raise RuntimeError(f"{path} ist zstd-komprimiert, aber 'zstandard' ist nicht installiert.")
+        return _zstd.ZstdDecompressor().decompress(blob)
+    if path.endswith(".gz"):
+        return gzip.decompress(blob)
+    return blob
+
+
+def load_raw(path: str):
+    """Lädt eine RAW-Payload (komprimiertes Objekt oder alte JSON-Datei) als Python-Objekt."""
+    return orjson.loads(read_raw_bytes(path))
+
+
+def streaming_available() -> bool:
+    """True, wenn `ijson` installiert ist (sonst lädt iter_raw_items die Payload komplett)."""
+    return _ijson is not None
+
+
+def open_raw(path: str):
+    """Öffnet eine RAW-Datei als dekomprimierenden Binär-Stream (zst/gz/legacy json)."""
+    if path.endswith(".zst"):
+        if _zstd is None:
+            raise RuntimeError(f"{path} ist zstd-komprimiert, aber 'zstandard' ist nicht installiert.")
+        return _zstd.ZstdDecompressor().stream_reader(open(path, "rb"), closefd=True)
+    if path.endswith(".gz"):
+        return gzip.open(path, "rb")
+    return open(path, "rb")
+
+
+def iter_raw_items(path: str, prefix: str):
+    """
+    Einträge unter `prefix` (ijson-Syntax, z. B. "pageProps.users.item") einer gespeicherten Payload.
+    Mit ijson inkrementell (Speicher ~ ein Eintrag), sonst Fallback über load_raw().
+    """
+    if _ijson is not None:
+        with open_raw(path) as f:
+            # use_float: Zahlen als float statt Decimal (SQLite kann kein Decimal binden)
+            yield from _ijson.items(f, prefix, use_float=True)
+        return
+    node = load_raw(path)
+    parts = prefix.split(".") if prefix else []
+    many = bool(parts) and parts[-1] == "item"
+    for key in parts[:-1] if many else parts:
+        node = node.get(key) if isinstance(node, dict) else None
+    if many:
+        yield from (node if isinstance(node, list) else ())
+    elif node is not None:
+        yield node
+
+
+class RawRef(str):
+    """
+    Pfad einer gespeicherten Payload (verhält sich wie str) plus Abruf-Metadaten in `.meta`
+    (size, sha256; der Fetcher ergänzt parse_ms/fetch_ms) – fließt z. B. in RawSnapshot.meta.
+    """
+    meta: dict
+
+    def __new__(cls, path: str, meta: dict | None = None):
+        ref = super().__new__(cls, path)
+        ref.meta = dict(meta or {})
+        return ref
+
+
+class RawStore:
+    """RAW-Speicher eines Tenants: put() dedupliziert per SHA-256, der Index hält die Metadaten."""
+
+    def __init__(self, raw_dir: str, tenant: str):
+        self.tenant = tenant
+        self.root = os.path.join(raw_dir, tenant)
+        self.index_path = os.path.join(self.root, INDEX_NAME)
+        self.heads_path = os.path.join(self.root, HEADS_NAME)
+
+    def _object_path(self, sha: str, codec: str) -> str:
+        ext = ".json.zst" if codec == "zstd" else ".json.gz"
+        return os.path.join(self.root, "objects", sha[:2], sha + ext)
+
+    def _existing_object(self, sha: str) -> str | None:
+        for codec in ("zstd", "gzip"):
+            p = self._object_path(sha, codec)
+            if os.path.exists(p):
+                return p
+        return None
+
+    def _put_bytes(self, raw: bytes, sha: str | None = None) -> str:
+        sha = sha or hashlib.sha256(raw).hexdigest()
+        path = self._existing_object(sha)
+        if path is None:
+            codec = _codec()
+            path = self._object_path(sha, codec)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp, "wb") as f:
+                f.write(_compress(bytes(raw), codec))
+            os.replace(tmp, path)
+        return path
+
+    def put(self, route: str, build_id: str | None, data) -> RawRef:
+        """
+        Speichert eine Payload (dict/list oder die JSON-Bytes wie empfangen) und gibt den
+        Objektpfad als RawRef (mit size/sha256) zurück. Identische Payloads werden nicht erneut
+        geschrieben, nur indiziert.
+        """
+        raw = data if isinstance(data, (bytes, bytearray)) else orjson.dumps(data)
+        sha = hashlib.sha256(raw).hexdigest()
+
+        path = self._put_bytes(raw, sha)
+
+        self._append_index({
+            "ts": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "tenant": self.tenant,
+            "route": route,
+            "kind": route_kind(route),
+            "build_id": build_id,
+            "sha256": sha,
+            "size": len(raw),
+            "path": path,
+        })
+        return RawRef(path, {"size": len(raw), "sha256": sha})
+
+    def put_stream(self, route: str, build_id: str | None, chunks, check=None) -> RawRef:
+        """
+        Archiviert eine Antwort chunkweise (Bytes unverändert, Hash + Kompression im Durchlauf),
+        ohne die Payload im Speicher zu halten. `check(head, size)` wird vor dem Indizieren mit den
+        ersten 4 KiB und der Gesamtgröße aufgerufen; wirft er, wird nichts gespeichert.
+        """
+        codec = _codec()
+        incoming = os.path.join(self.root, "objects")
+        os.makedirs(incoming, exist_ok=True)
+        tmp = os.path.join(incoming, f".incoming.{os.getpid()}.{threading.get_ident()}.tmp")
+        h = hashlib.sha256()
+        head = bytearray()
+        size = 0
+        try:
+            with open(tmp, "wb") as fh:
+                if codec == "zstd":
+                    writer = _zstd.ZstdCompressor(level=3).stream_writer(fh, closefd=False)
+                else:
+                    writer = gzip.GzipFile(fileobj=fh, mode="wb", compresslevel=6)
+                with writer:
+                    for chunk in chunks:
+                        if not chunk:
+                            continue
+                        h.update(chunk)
+                        size += len(chunk)
+                        if len(head) < 4096:
+                            head += chunk[:4096 - len(head)]
+                        writer.write(chunk)
+            if check is not None:
+                check(bytes(head), size)
+            sha = h.hexdigest()
+            path = self._existing_object(sha)
+            if path is None:
+                path = self._object_path(sha, codec)
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                os.replace(tmp, path)
+        finally:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+
+        self._append_index({
+            "ts": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "tenant": self.tenant,
+            "route": route,
+            "kind": route_kind(route),
+            "build_id": build_id,
+            "sha256": sha,
+            "size": size,
+            "path": path,
+        })
+        return RawRef(path, {"size": size, "sha256": sha})
+
+    def _append_index(self, entry: dict):
+        os.makedirs(self.root, exist_ok=True)
+        line = json.dumps(entry, ensure_ascii=False) + "\n"
+        with _INDEX_LOCK:
+            with open(self.index_path, "a", encoding="utf-8") as f:
+                f.write(line)
+            heads = self._load_heads()
+            _advance_heads(heads, entry)
+            self._save_heads(heads)
+
+    # --------- Manifest (latest.json) ----------
+    def _load_heads(self) -> dict:
+        try:
+            with open(self.heads_path, "r", encoding="utf-8") as f:
+                heads = json.load(f)
+            if isinstance(heads, dict):
+                # Manifeste von vor route_key(): Schlüssel mit buildId zusammenführen (neuester gewinnt)
+                routes = heads.get("routes") or {}
+                if any(route_key(r) != r for r in routes):
+                    heads["routes"] = {}
+                    for entry in routes.values():
+                        _advance_heads(heads, entry, kinds=False)
+                return heads
+        except (OSError, ValueError):
+            pass
+        # Manifest fehlt (z. B. Index von vor dem Manifest) -> einmalig aus dem Index aufbauen
+        heads = {"kinds": {}, "routes": {}}
+        for entry in self.entries():
+            _advance_heads(heads, entry)
+        return heads
+
+    def _save_heads(self, heads: dict):
+        tmp = f"{self.heads_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(heads, f, ensure_ascii=False)
+        os.replace(tmp, self.heads_path)
+
+    def entries(self):
+        """Alle Index-Einträge in Schreibreihenfolge (kaputte Zeilen werden übersprungen)."""
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                lines = f.readlines()
+        except OSError:
+            return []
+        out = []
+        for line in lines:
+            try:
+                out.append(json.loads(line))
+            except ValueError:
+                continue
+        return out
+
+    def latest(self, route_keyword: str) -> dict | None:
+        """
+        Neuester Eintrag für eine Routen-Art (members/leaderboards) oder eine Route, die das
+        Stichwort enthält – direkt aus dem Manifest, ohne Verzeichnis- oder Index-Scan.
+        """
+        if not os.path.exists(self.heads_path) and not os.path.exists(self.index_path):
+            return None
+        heads = self._load_heads()
+        if route_keyword in ("members", "leaderboards"):
+            entry = heads.get("kinds", {}).get(route_keyword)
+        else:
+            hits = [e for r, e in heads.get("routes", {}).items()
+                    if route_keyword in r or route_keyword in (e.get("route") or "")]
+            entry = max(hits, key=lambda e: e.get("ts") or "", default=None)
+        if entry and os.path.exists(entry.get("path") or ""):
+            return entry
+        return None
+
+    # --------- Backfill alter RAW-Dateien ----------
+    def backfill_legacy(self, migrate: bool = False) -> dict:
+        """
+        Nimmt alte RAW-Dateien (<tenant>/*.json, ein File pro Abruf) in Index und Manifest auf.
+        Mit migrate=True werden sie zusätzlich in den Objektspeicher übernommen und gelöscht.
+        Bereits indizierte Dateien werden übersprungen; Reihenfolge nach mtime.
+        """
+        known = {e.get("path") for e in self.entries()}
+        files = sorted(
+            (p for p in glob(os.path.join(self.root, "*.json")) if os.path.basename(p) != HEADS_NAME),
+            key=os.path.getmtime,
+        )
+        added = skipped = 0
+        for fpath in files:
+            if fpath in known:
+                skipped += 1
+                continue
+            with open(fpath, "rb") as f:
+                raw = f.read()
+            route = _legacy_route(os.path.basename(fpath), self.tenant)
+            ts = time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(os.path.getmtime(fpath)))
+            if migrate:
+                # kompakt serialisiert wie bei put(); sha/size beschreiben das gespeicherte Objekt
+                raw = orjson.dumps(orjson.loads(raw))
+                path = self._put_bytes(raw)
+                os.remove(fpath)
+            else:
+                path = fpath
+            self._append_index({
+                "ts": ts,
+                "tenant": self.tenant,
+                "route": route,
+                # alte Namen sind 'safe' gemangelt (/ und ? -> _), daher Stichwort-Erkennung wie früher per glob
+                "kind": "leaderboards" if "leaderboards" in route else "members" if "members" in route else "other",
+                "build_id": None,
+                "sha256": hashlib.sha256(raw).hexdigest(),
+                "size": len(raw),
+                "path": path,
+                "legacy": True,
+            })
+            added += 1
+        return {"added": added, "skipped": skipped}
+
+
+def _advance_heads(heads: dict, entry: dict, kinds: bool = True):
+    ts = entry.get("ts") or ""
+    buckets = (("kinds", entry.get("kind") if kinds else None), ("routes", route_key(entry.get("route") or "")))
+    for bucket, key in buckets:
+        if not key:
+            continue
+        cur = heads.setdefault(bucket, {}).get(key)
+        if cur is None or (cur.get("ts") or "") <= ts:
+            heads[bucket][key] = entry
+
+
+def _legacy_route(fname: str, tenant: str) -> str:
+    """Alte Dateinamen: <tenant>__<route>__<ts>.json – Route bleibt in der 'safe' Schreibweise."""
+    stem = fname[:-5] if fname.endswith(".json") else fname
+    parts = stem.split("__")
+    if len(parts) >= 3:
+        return "__".join(parts[1:-1])
+    return stem
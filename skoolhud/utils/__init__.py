@@ -1,11 +1,12 @@
 import re, json, time, random
 from datetime import datetime, timezone
-from dateutil import parser as dtparser
 import os
 from glob import glob
 from pathlib import Path
 from datetime import date as _date
 
+from .timestamps import parse_timestamp, to_utc, to_utc_iso
+
 
 def sleep_with_jitter(seconds_min: int, jitter_range=(3,7)):
 	# Sleep with jitter to spread requests
@@ -14,19 +15,10 @@ def sleep_with_jitter(seconds_min: int, jitter_range=(3,7)):
 	time.sleep(base + jitter)
 
 def to_utc_str(ts) -> str | None:
-	# Convert various timestamp formats to ISO UTC string
+	# Convert various timestamp formats to ISO UTC string (fromisoformat-Fast-Path + Cache, siehe timestamps.py)
 	if not ts:
 		return None
-	try:
-		if isinstance(ts, (int, float)):
-			dt = datetime.fromtimestamp(float(ts), tz=timezone.utc)
-			return dt.isoformat()
-		dt = dtparser.parse(str(ts))
-		if dt.tzinfo is None:
-			dt = dt.replace(tzinfo=timezone.utc)
-		return dt.astimezone(timezone.utc).isoformat()
-	except Exception:
-		return None
+	return to_utc_iso(ts)
 
 def get_in(obj, path: str):
 	# Dot-Notation access with '|' alternatives, e.g. "user.firstName|member.firstName"
@@ -48,6 +40,48 @@ def get_in(obj, path: str):
 			continue
 	return None
 
+_INDEXED_PART = re.compile(r"(.+)\[(\d+)\]")
+_MISSING = object()
+
+def _compile_alt(alt: str):
+	# "a.b[0].c" -> ("a", "b", 0, "c"); None, wenn ein Segment ungültig ist (get_in: KeyError -> Alternative verworfen)
+	keys = []
+	for part in alt.split("."):
+		if part.endswith("]"):
+			m = _INDEXED_PART.match(part)
+			if not m:
+				return None
+			name, idx = m.groups()
+			keys += [name, int(idx)]
+		else:
+			keys.append(part)
+	return tuple(keys)
+
+def compile_path(path: str):
+	"""
+	Kompiliert einen get_in-Pfad (Punkt-Notation, '|'-Alternativen, [i]-Indizes) einmalig
+	zu einem Accessor `fn(obj)` mit identischer Semantik – ohne Split/Regex pro Aufruf.
+	"""
+	alts = tuple(k for k in (_compile_alt(a.strip()) for a in path.split("|")) if k is not None)
+
+	def accessor(obj):
+		for keys in alts:
+			cur = obj
+			try:
+				for k in keys:
+					# dict.get statt Exception: fehlende Keys sind der Normalfall bei '|'-Alternativen
+					cur = cur.get(k, _MISSING) if type(cur) is dict else cur[k]
+					if cur is _MISSING:
+						break
+				else:
+					return cur
+			except Exception:
+				continue
+		return None
+
+	accessor.path = path
+	return accessor
+
 def deep_iter(obj):
 	# Yield all dict nodes from nested structures
 	if isinstance(obj, dict):
@@ -91,8 +125,14 @@ def find_member_entries(root):
 
 def latest_raw_file(raw_dir: str, tenant: str, route_keyword: str = "members"):
 	"""
-	Finde die neueste RAW-JSON für einen Tenant (members/leaderboard).
+	Finde die neueste RAW-Payload für einen Tenant (members/leaderboard).
+	Liest über das Manifest des RAW-Speichers (O(1)); nicht indizierte alte *.json-Dateien
+	dienen als Fallback (einmalig aufnehmen mit `skoolhud raw-index-backfill`).
 	"""
+	from ..raw_store import RawStore
+	entry = RawStore(raw_dir, tenant).latest(route_keyword)
+	if entry:
+		return entry["path"]
 	tdir = os.path.join(raw_dir, tenant)
 	if not os.path.isdir(tdir):
 		return None
@@ -186,7 +226,10 @@ from .net import post_with_retry
 __all__ = [
 	"sleep_with_jitter",
 	"to_utc_str",
+	"parse_timestamp",
+	"to_utc",
 	"get_in",
+	"compile_path",
 	"deep_iter",
 	"find_member_entries",
 	"latest_raw_file",
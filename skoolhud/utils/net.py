@@ -1,38 +1,226 @@
+"""
+HTTP mit Rate-Limit und Retry (Discord-Webhooks, Reports).
+
+Pro Host ein Token-Bucket (Mindestabstand + Burst) statt einer prozessweiten Pause: Posts an
+verschiedene Hosts bremsen sich nicht gegenseitig aus. Retry-After (429/503) und
+X-RateLimit-Remaining/-Reset(-After) sperren den Bucket des Hosts bis zum angegebenen Zeitpunkt.
+Jeder Host bekommt eine eigene requests.Session mit Connection-Pool (Keep-Alive).
+
+Konfiguration per Env:
+  RATE_LIMIT_MIN_DELAY  Standard-Abstand zwischen Requests pro Host (Sek., Default 15)
+  RATE_LIMIT_BURST      Standard-Burst pro Host (Default 1)
+  RATE_LIMIT_HOSTS      Overrides, z. B. "discord.com=0.5:5,api.example.com=2:1" (Abstand:Burst)
+  RETRY_MAX             max. Wiederholungen (Default 3)
+"""
 from __future__ import annotations
 import os
+import threading
 import time
-import requests
+from email.utils import parsedate_to_datetime
 from typing import Any
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
 
 _MIN_DELAY = float(os.getenv("RATE_LIMIT_MIN_DELAY", "15"))
+_BURST = int(os.getenv("RATE_LIMIT_BURST", "1"))
 _MAX_RETRY = int(os.getenv("RETRY_MAX", "3"))
-_last_ts = 0.0
+_POOL_SIZE = 10
+
+# Discord erlaubt pro Webhook ~5 Requests / 2 s; genaue Grenzen kommen über X-RateLimit-* zurück
+_DEFAULT_HOSTS = {
+    "discord.com": (0.5, 5),
+    "discordapp.com": (0.5, 5),
+}
+
+
+def _parse_host_limits(spec: str) -> dict[str, tuple[float, int]]:
+    out = {}
+    for part in (spec or "").split(","):
+        host, _, limits = part.strip().partition("=")
+        if not host or not limits:
+            continue
+        interval, _, burst = limits.partition(":")
+        try:
+            out[host.lower()] = (float(interval), int(burst or 1))
+        except ValueError:
+            continue
+    return out
+
+
+_HOST_LIMITS = {**_DEFAULT_HOSTS, **_parse_host_limits(os.getenv("RATE_LIMIT_HOSTS", ""))}
+
+
+class TokenBucket:
+    """
+    Token-Bucket: ein Token je `interval` Sekunden, höchstens `burst` angespart. acquire()
+    reserviert ein Token (auch ins Minus) und schläft außerhalb des Locks, bis es fällig ist.
+    block_for() sperrt den Bucket für eine Dauer (Retry-After / Rate-Limit-Header).
+    """
+
+    def __init__(self, interval: float, burst: int = 1):
+        self.interval = max(0.0, float(interval))
+        self.burst = max(1, int(burst))
+        self.tokens = float(self.burst)
+        self.updated = time.monotonic()
+        self.blocked = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        if self.interval > 0:
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) / self.interval)
+        else:
+            self.tokens = float(self.burst)
+        self.updated = now
+
+    def reserve(self) -> float:
+        """Reserviert ein Token und liefert die Wartezeit bis dahin (Sek.)."""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            wait = 0.0 if self.tokens >= 1 else (1 - self.tokens) * self.interval
+            self.tokens -= 1
+            return max(wait, self.blocked - now)
+
+    def acquire(self):
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    def block_for(self, seconds: float):
+        """Keine neuen Requests vor Ablauf von `seconds`; angesparte Tokens verfallen."""
+        if seconds <= 0:
+            return
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self.blocked = max(self.blocked, now + seconds)
+            self.tokens = min(self.tokens, 1.0)
+
+
+_BUCKETS: dict[str, TokenBucket] = {}
+_SESSIONS: dict[str, requests.Session] = {}
+_REGISTRY_LOCK = threading.Lock()
+
+
+def _host(url: str) -> str:
+    return (urlsplit(url).hostname or "").lower()
+
+
+def _limits_for(host: str) -> tuple[float, int]:
+    for h, limits in _HOST_LIMITS.items():
+        if host == h or host.endswith("." + h):
+            return limits
+    return _MIN_DELAY, _BURST
+
+
+def bucket_for(host: str) -> TokenBucket:
+    with _REGISTRY_LOCK:
+        bucket = _BUCKETS.get(host)
+        if bucket is None:
+            bucket = _BUCKETS[host] = TokenBucket(*_limits_for(host))
+        return bucket
+
+
+def session_for(host: str) -> requests.Session:
+    """Gepoolte Session pro Host (Keep-Alive statt neuer TCP/TLS-Verbindung pro Request)."""
+    with _REGISTRY_LOCK:
+        s = _SESSIONS.get(host)
+        if s is None:
+            s = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=_POOL_SIZE)
+            s.mount("https://", adapter)
+            s.mount("http://", adapter)
+            _SESSIONS[host] = s
+        return s
+
+
+def _retry_after(value: str | None) -> float | None:
+    """Retry-After als Sekunden (Zahl oder HTTP-Datum)."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def rate_limit_delay(resp) -> float | None:
+    """
+    Wartezeit laut Antwort-Headern: Retry-After (429/503) oder – wenn X-RateLimit-Remaining 0
+    ist – X-RateLimit-Reset-After bzw. X-RateLimit-Reset (Sekunden oder Unix-Zeitpunkt).
+    """
+    headers = getattr(resp, "headers", None) or {}
+    if resp.status_code in (429, 503):
+        delay = _retry_after(headers.get("Retry-After"))
+        if delay is not None:
+            return delay
+    remaining = headers.get("X-RateLimit-Remaining")
+    if remaining is None:
+        return None
+    try:
+        if float(remaining) > 0:
+            return None
+        if headers.get("X-RateLimit-Reset-After") is not None:
+            return max(0.0, float(headers["X-RateLimit-Reset-After"]))
+        reset = float(headers.get("X-RateLimit-Reset", ""))
+    except ValueError:
+        return None
+    return max(0.0, reset - time.time()) if reset > 1e9 else reset
+
+
+def _rewind(files):
+    """Datei-Uploads für einen erneuten Versuch an den Anfang setzen."""
+    values = files.values() if isinstance(files, dict) else (files or ())
+    for v in values:
+        fh = v[1] if isinstance(v, (tuple, list)) and len(v) > 1 else v
+        if hasattr(fh, "seek"):
+            try:
+                fh.seek(0)
+            except (OSError, ValueError):
+                pass
 
-def _respect_rate_limit():
-    global _last_ts
-    now = time.time()
-    wait = _MIN_DELAY - (now - _last_ts)
-    if wait > 0:
-        time.sleep(wait)
-    _last_ts = time.time()
 
 def _with_retry(method: str, url: str, **kw) -> requests.Response:
     max_retry = int(kw.pop("max_retries", _MAX_RETRY))
+    timeout = kw.pop("timeout", 60)
+    host = _host(url)
+    bucket = bucket_for(host)
+    session = session_for(host)
     for attempt in range(max_retry + 1):
-        _respect_rate_limit()
+        bucket.acquire()
+        if attempt:
+            _rewind(kw.get("files"))
         try:
-            r = requests.request(method, url, timeout=kw.pop("timeout", 60), **kw)
-            if r.status_code >= 500:
-                r.raise_for_status()
-            return r
-        except Exception:
+            r = session.request(method, url, timeout=timeout, **kw)
+        except requests.RequestException:
             if attempt >= max_retry:
                 raise
-            backoff = min(60, 2 ** attempt)
-            time.sleep(backoff)
+            time.sleep(min(60, 2 ** attempt))
+            continue
+
+        delay = rate_limit_delay(r)
+        if delay is not None:
+            bucket.block_for(delay)
+        if r.status_code == 429 or r.status_code >= 500:
+            if attempt >= max_retry:
+                if r.status_code >= 500:
+                    r.raise_for_status()
+                return r
+            if delay is None:
+                time.sleep(min(60, 2 ** attempt))
+            continue
+        return r
+
 
 def get_with_retry(url: str, **kw) -> requests.Response:
     return _with_retry("GET", url, **kw)
 
+
 def post_with_retry(url: str, json: Any = None, data: Any = None, files: Any = None, **kw) -> requests.Response:
     return _with_retry("POST", url, json=json, data=data, files=files, **kw)
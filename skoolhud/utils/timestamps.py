@@ -0,0 +1,66 @@
+"""
+Gemeinsames Timestamp-Parsing für Normalizer, CLI, Agents und Skripte.
+
+Skool liefert fast ausschließlich ISO-8601 (z. B. "2025-09-01T10:00:00.123Z"). Der schnelle Pfad
+nutzt datetime.fromisoformat; nur was daran scheitert, geht an dateutil. Geparste Strings landen
+in einem LRU-Cache, weil dieselben Werte (lastOffline, createdAt) pro Lauf mehrfach geparst werden.
+"""
+from __future__ import annotations
+from datetime import datetime, timezone
+from functools import lru_cache
+
+from dateutil import parser as dtparser
+
+_CACHE_SIZE = 16384
+
+
+@lru_cache(maxsize=_CACHE_SIZE)
+def _parse_str(s: str) -> datetime | None:
+    s = s.strip()
+    if not s:
+        return None
+    try:
+        # fromisoformat kann 'Z' erst ab Python 3.11
+        return datetime.fromisoformat(s[:-1] + "+00:00" if s.endswith(("Z", "z")) else s)
+    except ValueError:
+        pass
+    try:
+        return dtparser.parse(s)
+    except (ValueError, OverflowError):
+        return None
+
+
+def parse_timestamp(value) -> datetime | None:
+    """
+    Parst einen Zeitstempel (ISO-String, datetime, Unix-Sekunden) und behält den Offset bei:
+    naive Werte bleiben naiv. None bei leeren/unlesbaren Werten.
+    """
+    if value is None or value == "":
+        return None
+    if isinstance(value, datetime):
+        return value
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        try:
+            return datetime.fromtimestamp(float(value), tz=timezone.utc)
+        except (ValueError, OverflowError, OSError):
+            return None
+    return _parse_str(str(value))
+
+
+def to_utc(value) -> datetime | None:
+    """Wie parse_timestamp, aber immer tz-aware in UTC (naive Werte gelten als UTC)."""
+    dt = parse_timestamp(value)
+    if dt is None:
+        return None
+    return dt.astimezone(timezone.utc) if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+
+
+def to_utc_iso(value) -> str | None:
+    """ISO-8601-String in UTC (Format von to_utc_str), None wenn nicht parsebar."""
+    dt = to_utc(value)
+    return dt.isoformat() if dt is not None else None
+
+
+def cache_info():
+    """Trefferstatistik des Parse-Caches (zum Debuggen/Benchmarken)."""
+    return _parse_str.cache_info()
@@ -0,0 +1,40 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from skoolhud.config import settings
+from skoolhud.db import Base
+import skoolhud.member_extract as member_extract
+
+
+@pytest.fixture
+def make_session():
+    """Fabrik für Sessions auf je einer frischen In-Memory-DB mit aktuellem Schema (für Vergleiche mit mehreren DBs)."""
+    sessions = []
+
+    def make():
+        engine = create_engine("sqlite://", future=True)
+        Base.metadata.create_all(engine)
+        s = sessionmaker(bind=engine, autoflush=False, future=True)()
+        sessions.append(s)
+        return s
+
+    yield make
+    for s in sessions:
+        s.close()
+        s.get_bind().dispose()
+
+
+@pytest.fixture
+def db_session(make_session):
+    """Session auf einer leeren In-Memory-DB; die Engine ist über db_session.get_bind() erreichbar."""
+    return make_session()
+
+
+@pytest.fixture
+def state_dir(tmp_path, monkeypatch):
+    """State- und Raw-Ordner nach tmp_path umbiegen; der Layout-Cache aus member_extract startet leer."""
+    monkeypatch.setattr(settings, "state_dir", str(tmp_path / "state"))
+    monkeypatch.setattr(settings, "raw_dir", str(tmp_path / "raw"))
+    monkeypatch.setattr(member_extract, "_KNOWN", {})
+    return tmp_path / "state"
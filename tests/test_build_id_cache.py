@@ -0,0 +1,78 @@
+import json
+
+import pytest
+
+from skoolhud.config import settings
+from skoolhud.fetcher import SkoolFetcher, BuildIdExpired
+
+
+class _Resp:
+    def __init__(self, status_code, payload=None):
+        self.status_code = status_code
+        self._payload = payload or {}
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(f"HTTP {self.status_code}")
+
+    def json(self):
+        return self._payload
+
+    @property
+    def content(self):
+        return json.dumps(self._payload).encode("utf-8")
+
+
+@pytest.fixture
+def fetcher(state_dir, monkeypatch):
+    f = SkoolFetcher("https://example.invalid", "grp", "auth_token=x", "t1")
+    builds = iter(["b1", "b2", "b3"])
+    f.discoveries = 0
+
+    def discover(page_tail):
+        f.discoveries += 1
+        return next(builds)
+
+    monkeypatch.setattr(f, "_discover_build_id_from", discover)
+    return f
+
+
+def test_build_id_is_cached_across_fetchers(fetcher, monkeypatch):
+    assert fetcher.discover_build_id() == "b1"
+    other = SkoolFetcher("https://example.invalid", "grp", "auth_token=x", "t1")
+    monkeypatch.setattr(other, "_discover_build_id_from", lambda tail: pytest.fail("should use cache"))
+    assert other.discover_build_id() == "b1"
+    assert fetcher.discoveries == 1
+
+
+def test_cache_respects_ttl(fetcher, monkeypatch):
+    fetcher.discover_build_id()
+    monkeypatch.setattr(settings, "build_id_ttl_seconds", -1)
+    assert fetcher.discover_build_id() == "b2"
+
+
+def test_stale_build_is_invalidated_and_refreshed_once(fetcher, monkeypatch):
+    build = fetcher.discover_build_id()
+    calls = []
+
+    def get(url, **kw):
+        calls.append(url)
+        if "/_next/data/b1/" in url:
+            return _Resp(404)
+        return _Resp(200, {"pageProps": {"users": []}})
+
+    monkeypatch.setattr(fetcher.session, "get", get)
+    data, route, fpath = fetcher.fetch_members_json_with_params(build, {"p": 2})
+    assert "/_next/data/b2/" in route
+    assert fetcher.build_id == "b2"
+    # Folgeaufruf mit alter ID geht direkt auf die neue
+    data, route, fpath = fetcher.fetch_members_json_with_params(build, {"p": 3})
+    assert "/_next/data/b2/" in route
+    assert sum("/b1/" in c for c in calls) == 1
+    assert fetcher.discover_build_id() == "b2"
+
+
+def test_redirect_raises_build_expired(fetcher, monkeypatch):
+    monkeypatch.setattr(fetcher.session, "get", lambda url, **kw: _Resp(307))
+    with pytest.raises(BuildIdExpired):
+        fetcher._get_next_data_json("https://example.invalid/_next/data/b1/grp/-/members.json", "-/members")
@@ -0,0 +1,40 @@
+from sqlalchemy import create_engine, select, func
+from sqlalchemy.orm import sessionmaker
+from typer.testing import CliRunner
+
+from skoolhud import cli
+from skoolhud.config import settings
+from skoolhud.db import Base
+from skoolhud.models import Tenant, Member, LeaderboardSnapshot
+from skoolhud.raw_store import RawStore
+
+PAYLOAD = {"pageProps": {"s": {
+    "allTime": {"users": [{"userId": "u1", "points": 500, "rank": 1}]},
+    "past30Days": {"users": [{"userId": "u1", "points": 50, "rank": 2}]},
+    "past7Days": {"users": [{"userId": "u1", "points": 5, "rank": 3}]},
+}}}
+
+
+def test_all_windows_from_one_payload(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'db.sqlite'}", future=True)
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine, autoflush=False, future=True)
+    with Session() as s:
+        s.add_all([Tenant(slug="t1", group_path="grp", cookie_header="auth_token=x"),
+                   Member(tenant="t1", user_id="u1")])
+        s.commit()
+    monkeypatch.setattr(cli, "SessionLocal", Session)
+    monkeypatch.setattr(settings, "raw_dir", str(tmp_path / "raw"))
+    RawStore(settings.raw_dir, "t1").put("/grp/-/leaderboards.json?group=grp", None, PAYLOAD)
+
+    res = CliRunner().invoke(cli.app, ["normalize-leaderboard", "--slug", "t1", "--all-windows"])
+    assert res.exit_code == 0, res.output
+    assert res.output.count("Leaderboard normalisiert") == 3
+
+    with Session() as s:
+        m = s.execute(select(Member)).scalar_one()
+        assert (m.points_all, m.points_30d, m.points_7d) == (500, 50, 5)
+        assert s.execute(select(func.count()).select_from(LeaderboardSnapshot)).scalar() == 3
+
+    res = CliRunner().invoke(cli.app, ["normalize-leaderboard", "--slug", "t1", "--window", "all,14"])
+    assert res.exit_code == 2
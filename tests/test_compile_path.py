@@ -0,0 +1,34 @@
+import pytest
+
+from skoolhud.utils import compile_path, get_in
+
+DOC = {
+    "user": {"id": "u1", "firstName": "", "metadata": {"bio": None, "links": ["a", "b"]}},
+    "member": {"firstName": "Mem", "createdAt": "2025-01-01"},
+    "items": [{"x": 1}, {"x": 2}],
+    "text": "abc",
+}
+
+
+@pytest.mark.parametrize("path", [
+    "user.id",
+    "user.firstName|member.firstName",
+    "missing|member.firstName",
+    "user.metadata.bio|member.createdAt",
+    "items[1].x",
+    "user.metadata.links[0]",
+    "items[5].x|user.id",
+    "text.foo|user.id",
+    "items.x",
+    "broken]|user.id",
+    "nothing.here",
+    " user.id | member.firstName ",
+])
+def test_compiled_accessor_matches_get_in(path):
+    assert compile_path(path)(DOC) == get_in(DOC, path)
+
+
+def test_compiled_accessor_handles_non_dict_roots():
+    acc = compile_path("a.b")
+    assert acc(None) is None
+    assert acc([1, 2]) is None
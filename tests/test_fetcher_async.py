@@ -0,0 +1,76 @@
+import asyncio
+import random
+import time
+
+from skoolhud import fetcher as fetcher_mod
+from skoolhud.fetcher import SkoolFetcher, TenantRateBudget
+
+
+class FakeFetcher(SkoolFetcher):
+    def __init__(self, tenant: str, total_pages: int):
+        super().__init__("https://example.invalid", "grp", "auth_token=x", tenant)
+        self.total_pages = total_pages
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.requested = []
+
+    def fetch_members_json_with_params(self, build_id, extra_params=None):
+        page = (extra_params or {}).get("p", 1)
+        self.requested.append(page)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            # Antworten kommen absichtlich ungeordnet zurück
+            time.sleep(random.uniform(0.0, 0.03))
+        finally:
+            self.in_flight -= 1
+        users = [{"id": f"{page}-{i}"} for i in range(30 if page < self.total_pages else 5)]
+        return {"pageProps": {"users": users}}, f"/route?p={page}", f"raw_{page}.json"
+
+
+def _collect(f, **kw):
+    async def run():
+        out = []
+        pages = f.iter_members_pages_async("build", **kw)
+        try:
+            async for page, data, route, fpath in pages:
+                out.append(page)
+                if len(data["pageProps"]["users"]) < 30:
+                    break
+        finally:
+            await pages.aclose()
+        return out
+    return asyncio.run(run())
+
+
+def test_pages_are_yielded_in_order_with_bounded_concurrency(monkeypatch):
+    monkeypatch.setattr(fetcher_mod, "_RATE_BUDGETS", {})
+    f = FakeFetcher("t-order", total_pages=6)
+    pages = _collect(f, max_pages=20, concurrency=3, min_interval=0.0)
+    assert pages == [1, 2, 3, 4, 5, 6]
+    assert f.max_in_flight <= 3
+    # höchstens das Prefetch-Fenster wird über die letzte Seite hinaus angefragt
+    assert max(f.requested) <= 6 + 2
+
+
+def test_max_pages_is_respected(monkeypatch):
+    monkeypatch.setattr(fetcher_mod, "_RATE_BUDGETS", {})
+    f = FakeFetcher("t-max", total_pages=50)
+    assert _collect(f, max_pages=4, concurrency=8, min_interval=0.0) == [1, 2, 3, 4]
+    assert sorted(f.requested) == [1, 2, 3, 4]
+
+
+def test_rate_budget_spaces_request_starts():
+    budget = TenantRateBudget(min_interval=0.5)
+    delays = [budget.reserve() for _ in range(3)]
+    assert delays[0] <= 0.01
+    assert 0.45 <= delays[1] <= 0.55
+    assert 0.95 <= delays[2] <= 1.05
+
+
+def test_rate_budget_for_picks_up_new_parameters(monkeypatch):
+    monkeypatch.setattr(fetcher_mod, "_RATE_BUDGETS", {})
+    first = fetcher_mod.rate_budget_for("t-cfg", 11.0, 13.0)
+    second = fetcher_mod.rate_budget_for("t-cfg", 2.0)
+    assert second is first
+    assert (first.min_interval, first.jitter) == (2.0, 0.0)
@@ -0,0 +1,57 @@
+from datetime import date
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from skoolhud.agents.joiners import joiners_in_window
+from skoolhud.db import table_columns
+from skoolhud.models import Member
+from skoolhud.normalizer import normalize_members_json
+
+WEEK = dict(cutoff_30=date(2025, 8, 11), start_this_week=date(2025, 9, 8),
+            start_last_week=date(2025, 9, 1), end_last_week=date(2025, 9, 7))
+
+
+def _page(*joined):
+    users = [{"id": f"u{i}", "firstName": f"N{i}", "member": {"id": f"m{i}", "createdAt": j}}
+             for i, j in enumerate(joined)]
+    return {"pageProps": {"users": users}}
+
+
+@pytest.mark.parametrize("bulk", [True, False])
+def test_window_and_buckets_from_normalized_column(db_session, bulk):
+    s = db_session
+    page = _page("2025-09-09T08:00:00Z", "2025-09-03T23:30:00Z", "2025-08-20T10:00:00Z", "2025-07-01T10:00:00Z", None)
+    normalize_members_json(s, "t1", "b1", page, "p1", bulk=bulk)
+    normalize_members_json(s, "t2", "b1", _page("2025-09-09T08:00:00Z"), "p1", bulk=bulk)
+    s.commit()
+
+    assert s.query(Member.joined_at_utc).filter_by(tenant="t1", user_id="u0").scalar() == "2025-09-09T08:00:00+00:00"
+    rows = joiners_in_window(s, "t1", **WEEK)
+    assert [(n, w, lw) for n, _, _, w, lw in rows] == [("N0", True, False), ("N1", False, True), ("N2", False, False)]
+    assert rows[1][1].hour == 23
+
+
+def test_joined_at_utc_filled_for_existing_rows(db_session):
+    s = db_session
+    s.add(Member(tenant="t1", user_id="u0", name="Alt", joined_date="2025-09-09T08:00:00Z"))
+    s.commit()
+    normalize_members_json(s, "t1", "b1", _page("2025-09-10T08:00:00Z"), "p1", bulk=True)
+    s.commit()
+    m = s.query(Member).filter_by(user_id="u0").one()
+    # joined_date bleibt geschützt, joined_at_utc folgt dem gespeicherten Wert
+    assert (m.joined_date, m.joined_at_utc) == ("2025-09-09T08:00:00Z", "2025-09-09T08:00:00+00:00")
+
+
+def test_legacy_schema_falls_back_to_joined_date():
+    engine = create_engine("sqlite://", future=True)
+    with engine.begin() as conn:
+        conn.exec_driver_sql("CREATE TABLE members (id INTEGER PRIMARY KEY, tenant TEXT, name TEXT, joined_date TEXT)")
+        conn.exec_driver_sql("INSERT INTO members (tenant, name, joined_date) VALUES "
+                             "('t1', 'A', '2025-09-09T08:00:00Z'), ('t1', 'B', '2025-01-01T00:00:00Z'), ('t2', 'C', '2025-09-09T08:00:00Z')")
+    s = sessionmaker(bind=engine, future=True)()
+    assert table_columns(s, "members") == {"id", "tenant", "name", "joined_date"}
+    assert table_columns(engine, "members") is table_columns(s, "members")
+    rows = joiners_in_window(s, "t1", **WEEK)
+    assert [(n, t, w) for n, _, t, w, _ in rows] == [("A", None, True)]
@@ -0,0 +1,13 @@
+from skoolhud.agents.leaderboard_delta import top_movers
+from skoolhud.models import Member
+
+
+def test_top_movers_is_tenant_scoped_and_ordered(db_session):
+    s = db_session
+    for uid, tenant, p7 in [("a", "t1", 5), ("b", "t1", None), ("c", "t1", 9), ("d", "t2", 100), ("e", "t1", 5)]:
+        s.add(Member(tenant=tenant, user_id=uid, name=uid.upper(), points_7d=p7))
+    s.commit()
+
+    assert top_movers(s, "t1", "7d") == [("C", 9), ("A", 5), ("E", 5)]
+    assert top_movers(s, "t1", "7d", topn=2) == [("C", 9), ("A", 5)]
+    assert top_movers(s, "t2", "30d") == []
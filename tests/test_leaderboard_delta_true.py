@@ -0,0 +1,46 @@
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from skoolhud.models import Member
+from skoolhud.normalizer import normalize_leaderboard_json
+from skoolhud.agents.leaderboard_delta_true import _latest_two, _delta_rows, _movers
+
+
+def _payload(users, bucket="past7Days"):
+    return {"pageProps": {"s": {bucket: {"users": [
+        {"userId": uid, "points": p, "rank": r} for uid, p, r in users
+    ]}}}}
+
+
+def test_delta_compares_whole_captures(db_session):
+    s = db_session
+    s.add_all([Member(tenant="t1", user_id="a", name="Anna"), Member(tenant="t2", user_id="a", name="Fremd")])
+
+    normalize_leaderboard_json(s, "t1", "b", _payload([("a", 10, 2), ("b", 20, 1), ("c", 5, 3)]), "old.json", "7")
+    normalize_leaderboard_json(s, "t1", "b", _payload([("x", 99, 1)], "past30Days"), "other.json", "30")
+    normalize_leaderboard_json(s, "t1", "b", _payload([("a", 30, 1), ("b", 20, 2), ("d", 1, 3)]), "new.json", "7")
+    s.commit()
+
+    latest, prev = _latest_two(s, "t1", "7")
+    assert (latest.id, prev.id) == (3, 1)
+    up, down, new_in, dropped = _movers(_delta_rows(s, "t1", latest.id, prev.id))
+
+    assert up == [("Anna", 1, 20, 2, 1, 10, 30)]
+    assert down == [("user:b", -1, 0, 1, 2, 20, 20)]
+    assert new_in == [("user:d", 1, 3)]
+    assert dropped == [("user:c", 5, 3)]
+
+    assert _latest_two(s, "t1", "30")[1] is None
+
+
+def test_unmigrated_db_is_skipped(tmp_path, monkeypatch):
+    import skoolhud.agents.leaderboard_delta_true as agent
+
+    engine = create_engine("sqlite://", future=True)
+    with engine.begin() as conn:
+        conn.exec_driver_sql('CREATE TABLE leaderboard_snapshots (id INTEGER PRIMARY KEY, tenant TEXT, user_id TEXT, '
+                             '"window" TEXT, points INTEGER, rank INTEGER, captured_at DATETIME)')
+    monkeypatch.setattr(agent, "SessionLocal", sessionmaker(bind=engine, future=True))
+    monkeypatch.setattr(agent, "reports_dir_for", lambda slug: tmp_path)
+    agent.main(["--slug", "t1"])
+    assert "Migration fehlt" in (tmp_path / "leaderboard_delta_true.md").read_text(encoding="utf-8")
@@ -0,0 +1,38 @@
+from sqlalchemy import event, select
+
+from skoolhud.models import Member, LeaderboardSnapshot, LeaderboardCapture
+from skoolhud.normalizer import normalize_leaderboard_json
+
+
+def _payload(n):
+    users = [{"userId": f"u{i}", "points": 100 - i, "rank": i + 1} for i in range(n)]
+    users.append({"user": {"id": "u-nested"}, "points": 1, "rank": n + 1})
+    users.append({"points": 0})  # ohne ID -> nur gescannt
+    return {"pageProps": {"s": {"past30Days": {"users": users}}}}
+
+
+def test_batched_leaderboard_normalization(db_session):
+    s = db_session
+    statements = []
+    event.listen(s.get_bind(), "before_cursor_execute", lambda *a: statements.append(a[2]))
+    s.add_all([Member(tenant="t1", user_id="u0"), Member(tenant="t1", user_id="u3"),
+               Member(tenant="other", user_id="u1")])
+    s.commit()
+    statements.clear()
+
+    res = normalize_leaderboard_json(s, "t1", "b1", _payload(200), "raw.json.gz", "30")
+    s.commit()
+    assert res == {"inserted": 201, "updated": 2, "scanned": 202, "capture_id": 1}
+    # ein SELECT, ein UPDATE (executemany), Capture-INSERT + Snapshot-INSERT (executemany) statt 2N
+    assert len([q for q in statements if not q.startswith(("BEGIN", "COMMIT"))]) == 4
+
+    members = {m.user_id: m for m in s.execute(select(Member).where(Member.tenant == "t1")).scalars()}
+    assert (members["u3"].points_30d, members["u3"].rank_30d) == (97, 4)
+    assert s.execute(select(Member.points_30d).where(Member.tenant == "other")).scalar() is None
+    snaps = s.execute(select(LeaderboardSnapshot)).scalars().all()
+    assert len(snaps) == 201
+    assert {sn.window for sn in snaps} == {"30"}
+    assert len({sn.captured_at for sn in snaps}) == 1
+    assert {sn.capture_id for sn in snaps} == {res["capture_id"]}
+    cap = s.get(LeaderboardCapture, res["capture_id"])
+    assert (cap.tenant, cap.window, cap.row_count, cap.source_file) == ("t1", "30", 201, "raw.json.gz")
@@ -0,0 +1,113 @@
+import json
+
+import pytest
+
+from skoolhud.fetcher import SkoolFetcher, _BUILD_CACHE, _ROUTE_STATE
+from skoolhud.fetch_state import load_state
+
+LEADERBOARD = {"pageProps": {"s": {"allTime": {"users": [{"userId": "u1", "points": 10, "rank": 1}]}}}}
+
+
+class _Resp:
+    def __init__(self, status_code, payload=None):
+        self.status_code = status_code
+        self._payload = payload
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(f"HTTP {self.status_code}")
+
+    def json(self):
+        return self._payload
+
+    @property
+    def content(self):
+        return json.dumps(self._payload).encode("utf-8")
+
+
+@pytest.fixture
+def make_fetcher(state_dir, monkeypatch):
+    def make(working: str):
+        f = SkoolFetcher("https://example.invalid", "grp", "auth_token=x", "t1")
+        f.build_id = "b1"
+        f.calls = []
+
+        def get(url, **kw):
+            f.calls.append(url)
+            if working in url:
+                return _Resp(200, LEADERBOARD)
+            return _Resp(404)
+
+        monkeypatch.setattr(f.session, "get", get)
+        return f
+    return make
+
+
+def test_winning_route_is_tried_first_next_time(make_fetcher):
+    f = make_fetcher("/api/leaderboards.json")
+    data, route, _ = f.fetch_leaderboard_json(window="all")
+    assert route.startswith("/api/leaderboards.json")
+    assert len(f.calls) == 4
+
+    f2 = make_fetcher("/api/leaderboards.json")
+    f2.fetch_leaderboard_json(window="all")
+    assert len(f2.calls) == 1
+
+
+def test_memo_is_per_window_and_falls_back(make_fetcher):
+    make_fetcher("/api/leaderboards.json").fetch_leaderboard_json(window="all")
+    # Route stirbt: Fallback auf die übrigen Kandidaten, neue Gewinnerin wird gelernt
+    f = make_fetcher("invalid/leaderboards.json")
+    _, route, _ = f.fetch_leaderboard_json(window="all")
+    assert route.startswith("/leaderboards.json")
+    assert "/api/leaderboards.json" in f.calls[0]
+    f2 = make_fetcher("invalid/leaderboards.json")
+    f2.fetch_leaderboard_json(window="all")
+    assert len(f2.calls) == 1
+    # anderes Fenster hat noch nichts gelernt
+    f3 = make_fetcher("invalid/leaderboards.json")
+    f3.fetch_leaderboard_json(window="7")
+    assert len(f3.calls) == 2
+
+
+def test_dead_routes_are_demoted(make_fetcher):
+    for _ in range(3):
+        make_fetcher("/_next/data/").fetch_leaderboard_json(window="30")
+    order = make_fetcher("x")._leaderboard_route_order("30")
+    assert order[0].startswith("/_next/data/")
+    # die vier toten Routen stehen weiter hinten, werden aber noch als Fallback probiert
+    assert len(order) == 5
+
+
+def test_stale_build_id_is_refreshed_not_demoted(make_fetcher, monkeypatch):
+    f = make_fetcher("/_next/data/b2/")
+    monkeypatch.setattr(f, "_discover_build_id_from", lambda tail: "b2")
+    for _ in range(3):
+        _, route, _ = f.fetch_leaderboard_json(window="7")
+        assert "/_next/data/b2/" in route
+    assert sum("/_next/data/b1/" in c for c in f.calls) == 1
+    assert make_fetcher("x")._leaderboard_route_order("7")[0].startswith("/_next/data/")
+
+    # neue buildId ebenfalls abgelehnt: kein Urteil über die Route
+    g = make_fetcher("/api/leaderboards.json")
+    monkeypatch.setattr(g, "_discover_build_id_from", lambda tail: "b3")
+    g.fetch_leaderboard_json(window="7")
+    stats = load_state(_ROUTE_STATE)["t1"]["7"]
+    assert all(st["fail"] == 0 for tpl, st in stats.items() if tpl.startswith("/_next/data/"))
+    assert load_state(_BUILD_CACHE)["t1"]["build_id"] == "b3"
+
+
+def test_dead_next_data_route_is_demoted_with_current_build(make_fetcher, monkeypatch):
+    # frisch ermittelte buildId == aktuelle: die Route ist tot, nicht die buildId
+    f = make_fetcher("nirgends")
+    monkeypatch.setattr(f, "_discover_build_id_from", lambda tail: "b1")
+    with pytest.raises(RuntimeError):
+        f.fetch_leaderboard_json(window="7")
+    stats = load_state(_ROUTE_STATE)["t1"]["7"]
+    assert [st["fail"] for tpl, st in stats.items() if tpl.startswith("/_next/data/")] == [1]
+    # der gerade erneuerte Cache bleibt erhalten, der nächste Lauf braucht keinen HTML-Abruf
+    assert load_state(_BUILD_CACHE)["t1"]["build_id"] == "b1"
+    g = make_fetcher("/api/leaderboards.json")
+    monkeypatch.setattr(g, "_discover_build_id_from", lambda tail: pytest.fail("cache ignoriert"))
+    g.build_id = None
+    g.discover_build_id()
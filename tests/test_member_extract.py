@@ -0,0 +1,54 @@
+import pytest
+
+from skoolhud.fetch_state import load_state
+from skoolhud.member_extract import SHAPE_STATE, extract_member_entries, shape_fingerprint
+import skoolhud.member_extract as member_extract
+
+
+pytestmark = pytest.mark.usefixtures("state_dir")
+
+
+def _user(uid, first="A"):
+    return {"id": uid, "name": f"h-{uid}", "firstName": first, "metadata": {"bio": "x"},
+            "member": {"id": f"m-{uid}", "firstName": first, "role": "member"}}
+
+
+def _payload(*users, extra=None):
+    page = {"users": list(users), "group": {"id": "g"}}
+    page.update(extra or {})
+    return {"pageProps": page}
+
+
+def test_known_shape_skips_heuristic(monkeypatch):
+    first = extract_member_entries(_payload(_user("u1"), _user("u2")), "t1")
+    # nur echte User, nicht die member-Objekte, die die Heuristik zusätzlich als User erkennt
+    assert [e["user"]["id"] for e in first] == ["u1", "u2"]
+    assert first[0]["member"]["id"] == "m-u1"
+
+    state = load_state(SHAPE_STATE)["t1"]
+    assert state["shapes"][state["current"]]["mode"] == "fast"
+
+    calls = []
+    monkeypatch.setattr(member_extract, "find_member_entries", lambda d: calls.append(d) or iter(()))
+    again = extract_member_entries(_payload(_user("u3")), "t1")
+    assert [e["user"]["id"] for e in again] == ["u3"] and calls == []
+
+
+def test_changed_shape_is_recorded_and_falls_back():
+    extract_member_entries(_payload(_user("u1")), "t1")
+    fp_old = load_state(SHAPE_STATE)["t1"]["current"]
+
+    # Frontend-Änderung: Users wandern nach pageProps.data.members
+    changed = {"pageProps": {"users": [{"foo": 1}], "data": {"members": [_user("u9")]}}}
+    entries = extract_member_entries(changed, "t1")
+    assert "u9" in {e["user"]["id"] for e in entries}
+
+    state = load_state(SHAPE_STATE)["t1"]
+    assert state["current"] != fp_old and state["current"] == shape_fingerprint(changed)[0]
+    assert state["shapes"][state["current"]]["mode"] == "heuristic"
+    assert "changed_at" in state
+
+
+def test_empty_page():
+    assert extract_member_entries(_payload(), "t1") == []
+    assert load_state(SHAPE_STATE) == {}
@@ -0,0 +1,52 @@
+import pytest
+from skoolhud.member_frame import TenantFrame, get_frame, shared_frames
+from skoolhud.models import Member
+
+
+@pytest.fixture()
+def session(db_session):
+    s = db_session
+    members = [
+        # user_id, points_30d, points_all, points_7d, last_active
+        ("u1", 2, 100, 0, "2025-09-01T10:00:00Z"),
+        ("u2", 10, 100, 5, None),
+        ("u3", None, 60, None, "2025-09-02T10:00:00Z"),
+        ("u4", 1, None, 1, None),
+        ("u5", 40, 500, 12, None),
+    ]
+    for uid, p30, pall, p7, active in members:
+        s.add(Member(tenant="t1", user_id=uid, name=uid.upper(), points_30d=p30, points_all=pall,
+                     points_7d=p7, last_active_at_utc=active))
+    s.add(Member(tenant="t2", user_id="x1", name="X", points_30d=0, points_all=999))
+    s.commit()
+    return s
+
+
+def test_load_and_mask_match_python_filter(session):
+    frame = TenantFrame.load(session, "t1")
+    assert len(frame) == 5 and list(frame.user_id) == ["u1", "u2", "u3", "u4", "u5"]
+
+    # wie bisher `(p30 or 0) < 5 and (pall or 0) > 50`
+    at_risk = frame.rows(frame.mask("points_30d<5 & points_all>50"), "user_id", "points_30d", "last_active_at_utc")
+    assert at_risk == [("u1", 2, "2025-09-01T10:00:00Z"), ("u3", None, "2025-09-02T10:00:00Z")]
+    assert frame.count("points_7d>0") == 3
+    assert frame.count("points_all>=500 | points_30d==1") == 2
+    assert frame.active_epoch[0] == pytest.approx(1756720800.0)
+
+
+def test_top_and_invalid_expression(session):
+    frame = TenantFrame.load(session, "t1")
+    assert [frame.user_id[i] for i in frame.top("points_all", 3)] == ["u5", "u1", "u2"]
+    assert list(frame.top("points_all", 10, mask=frame.mask("points_7d>0"))) == [4, 1]
+    with pytest.raises(ValueError):
+        frame.mask("name>1")
+    with pytest.raises(ValueError):
+        frame.mask("points_30d ~ 5")
+
+
+def test_shared_frames_load_once(session):
+    with shared_frames():
+        first = get_frame("t1", session)
+        assert get_frame("t1", session) is first
+        assert len(get_frame("t2", session)) == 1
+    assert get_frame("t1", session) is not first
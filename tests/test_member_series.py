@@ -0,0 +1,80 @@
+from datetime import date, timedelta
+
+import numpy as np
+import pytest
+from skoolhud.member_series import SnapshotSeries, forward_fill, rolling_std, run_lengths
+from skoolhud.models import MemberDailySnapshot
+
+D0 = date(2025, 9, 1)
+
+
+@pytest.fixture()
+def series(db_session):
+    s = db_session
+    history = {
+        # user: [(tag, points_all, rank_all)]; Tag 3 fehlt für "a" (Lücke), "b" startet später
+        "a": [(0, 10, 5), (1, 12, 4), (2, 12, 6), (4, 20, 2), (5, 25, 1)],
+        "b": [(2, 100, 1), (3, 101, 2), (4, 102, 3), (5, 103, 4)],
+    }
+    for uid, points in history.items():
+        for day, pts, rank in points:
+            s.add(MemberDailySnapshot(tenant="t1", user_id=uid, day=D0 + timedelta(days=day), points_all=pts, rank_all=rank))
+    s.add(MemberDailySnapshot(tenant="t2", user_id="a", day=D0 + timedelta(days=30), points_all=1))
+    s.commit()
+    return SnapshotSeries.load(s, "t1")
+
+
+def test_load_dense_matrix(series):
+    assert list(series.user_ids) == ["a", "b"]
+    assert series.days[0] == np.datetime64("2025-09-01") and len(series.days) == 6
+    pts = series.values["points_all"]
+    assert np.isnan(pts[0, 3]) and np.isnan(pts[1, 0]) and pts[1, 5] == 103
+
+
+def test_gain_activity_streaks_velocity(series):
+    gain = series.daily_gain()
+    np.testing.assert_array_equal(gain[0, 1:], [2, 0, 0, 8, 5])
+    assert np.isnan(gain[1, :3]).all() and list(gain[1, 3:]) == [1, 1, 1]
+    assert list(series.activity(window=3)[:, -1]) == [2, 3]
+    current, longest = series.streaks()
+    assert list(current) == [2, 3] and list(longest) == [2, 3]
+    np.testing.assert_allclose(series.velocity(window=2)[:, -1], [6.5, 1.0])
+
+
+def test_volatility_and_engagement(series):
+    vol = series.volatility(window=3)
+    assert vol[0, -1] == pytest.approx(np.std([2, 1]))  # Tag 3 fehlt
+    assert vol[1, -1] == pytest.approx(np.std([2, 3, 4]))
+    assert np.isnan(vol[1, 2])  # nur ein Snapshot im Fenster
+    expected = sum(g * 0.5 ** ((5 - d) / 2) for d, g in enumerate([0, 2, 0, 0, 8, 5]))
+    assert series.engagement(half_life=2)[0] == pytest.approx(expected)
+    summary = series.summary(window=3)
+    assert list(summary["active_days"]) == [2, 3] and summary["engagement"].shape == (2,)
+
+
+def test_matrix_helpers_match_naive_loops():
+    rng = np.random.default_rng(1)
+    m = rng.normal(size=(20, 30)) * 100
+    m[rng.random(m.shape) < 0.3] = np.nan
+    filled, vol, runs = forward_fill(m), rolling_std(m, 5), run_lengths(~np.isnan(m))
+    for i in range(m.shape[0]):
+        last, run = np.nan, 0
+        for j in range(m.shape[1]):
+            last = m[i, j] if not np.isnan(m[i, j]) else last
+            run = run + 1 if not np.isnan(m[i, j]) else 0
+            assert (np.isnan(last) and np.isnan(filled[i, j])) or filled[i, j] == last
+            assert runs[i, j] == run
+            window = m[i, max(0, j - 4):j + 1]
+            window = window[~np.isnan(window)]
+            if len(window) >= 2:
+                assert vol[i, j] == pytest.approx(np.std(window))
+            else:
+                assert np.isnan(vol[i, j])
+
+
+def test_unknown_column_and_empty_tenant(db_session):
+    s = db_session
+    with pytest.raises(ValueError):
+        SnapshotSeries.load(s, "t1", columns=("points_all; DROP",))
+    empty = SnapshotSeries.load(s, "nope")
+    assert len(empty) == 0 and len(empty.summary()["engagement"]) == 0
@@ -0,0 +1,76 @@
+import pytest
+
+from skoolhud.member_sync import (clear_checkpoint, load_checkpoint, resume_point, save_checkpoint,
+                                  seen_ids_digest)
+from skoolhud.raw_store import RawStore
+
+
+pytestmark = pytest.mark.usefixtures("state_dir")
+
+
+def _page(*uids):
+    return {"pageProps": {"users": [{"id": u, "firstName": "A", "member": {"id": f"m-{u}"}} for u in uids]}}
+
+
+def _store_pages(tmp_path):
+    store = RawStore(str(tmp_path / "raw"), "t1")
+    return [store.put("/members?p=1", "b1", _page("u1", "u2")), store.put("/members?p=2", "b1", _page("u3"))]
+
+
+def test_digest_is_order_independent():
+    assert seen_ids_digest(["b", "a"]) == seen_ids_digest({"a", "b"}) != seen_ids_digest({"a"})
+
+
+def test_resume_continues_after_last_committed_page(tmp_path):
+    paths = _store_pages(tmp_path)
+    save_checkpoint("t1", "b1", 2, {"u1", "u2", "u3"}, paths)
+    cp = load_checkpoint("t1")
+    assert cp["page"] == 2 and cp["seen_count"] == 3 and cp["build_id"] == "b1"
+
+    start, seen, raw_paths, _ = resume_point("t1", "b1")
+    assert start == 3 and seen == {"u1", "u2", "u3"} and raw_paths == paths
+
+    clear_checkpoint("t1")
+    assert load_checkpoint("t1") is None
+    assert resume_point("t1", "b1")[0] == 1
+
+
+def test_resume_restarts_on_new_build_or_mismatch(tmp_path):
+    paths = _store_pages(tmp_path)
+    save_checkpoint("t1", "b1", 2, {"u1", "u2", "u3"}, paths)
+    assert resume_point("t1", "b2")[:2] == (1, set())
+
+    save_checkpoint("t1", "b1", 2, {"u1", "u2", "u3", "u4"}, paths)
+    assert resume_point("t1", "b1")[0] == 1
+
+
+def test_full_sync_due():
+    from datetime import datetime, timedelta, timezone
+    from skoolhud.member_sync import full_sync_due, last_full_sync, mark_full_sync
+
+    now = datetime(2025, 9, 10, tzinfo=timezone.utc)
+    assert full_sync_due("t1", 7, now) and last_full_sync("t1") is None
+    mark_full_sync("t1", 12, now - timedelta(days=3))
+    assert not full_sync_due("t1", 7, now)
+    assert full_sync_due("t1", 2, now)
+
+
+def test_count_changed_members(db_session):
+    from skoolhud.normalizer import normalize_members_json
+
+    s = db_session
+
+    def page(updated="2025-01-01T00:00:00Z", offline="2025-02-01T00:00:00Z"):
+        users = [{"id": f"u{i}", "firstName": "A", "updatedAt": updated if i == 0 else "2025-01-01T00:00:00Z",
+                  "member": {"id": f"m{i}", "lastOffline": offline if i == 1 else "2025-02-01T00:00:00Z"}}
+                 for i in range(3)]
+        return {"pageProps": {"users": users}}
+
+    assert normalize_members_json(s, "t1", "b1", page(), "p1", bulk=True, track_changes=True)["changed"] == 3
+    assert normalize_members_json(s, "t1", "b1", page(), "p1", bulk=True, track_changes=True)["changed"] == 0
+    # älteres lastOffline ist keine Änderung, neueres updatedAt/lastOffline schon
+    assert normalize_members_json(s, "t1", "b1", page(offline="2024-12-01T00:00:00Z"), "p1", track_changes=True)["changed"] == 0
+    res = normalize_members_json(s, "t1", "b1", page(updated="2025-03-01T00:00:00Z", offline="2025-03-01T00:00:00Z"),
+                                 "p1", bulk=True, track_changes=True)
+    assert res["changed"] == 2
+    assert normalize_members_json(s, "t1", "b1", page(), "p1")["changed"] is None
@@ -0,0 +1,76 @@
+import importlib.util
+from pathlib import Path
+
+from alembic.migration import MigrationContext
+from alembic.operations import Operations
+from sqlalchemy import create_engine
+
+VERSIONS = Path(__file__).resolve().parents[1] / "alembic" / "versions"
+
+
+def _migration(name):
+    spec = importlib.util.spec_from_file_location(name, VERSIONS / f"{name}.py")
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    return mod
+
+
+def _upgrade(conn, mod):
+    with Operations.context(MigrationContext.configure(conn)):
+        mod.upgrade()
+
+
+def _downgrade(conn, mod):
+    with Operations.context(MigrationContext.configure(conn)):
+        mod.downgrade()
+
+
+def test_capture_backfill_splits_repeated_normalization_of_one_file():
+    engine = create_engine("sqlite://", future=True)
+    with engine.begin() as conn:
+        conn.exec_driver_sql(
+            'CREATE TABLE leaderboard_snapshots (id INTEGER PRIMARY KEY, tenant TEXT, user_id TEXT, "window" TEXT, '
+            'points INTEGER, rank INTEGER, captured_at DATETIME, source_file TEXT, build_id TEXT)'
+        )
+        rows = []
+        # dieselbe Datei dreimal normalisiert: zweimal direkt hintereinander, einmal eine Stunde später
+        for ts in ("2025-08-31 16:36:37.1", "2025-08-31 16:36:38.2", "2025-08-31 17:36:00.0"):
+            rows += [("t1", uid, "7", 10, 1, ts, "lb.json", "b1") for uid in ("a", "b")]
+        rows.append(("t1", "a", "30", 5, 1, "2025-08-31 16:36:39.0", "lb.json", "b1"))
+        conn.exec_driver_sql(
+            'INSERT INTO leaderboard_snapshots (tenant, user_id, "window", points, rank, captured_at, source_file, build_id) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?, ?)', rows)
+
+        _upgrade(conn, _migration("20261017_add_leaderboard_captures"))
+
+        captures = conn.exec_driver_sql(
+            'SELECT id, "window", row_count, captured_at FROM leaderboard_captures ORDER BY id').fetchall()
+        assert [(c[1], c[2]) for c in captures] == [("7", 2), ("7", 2), ("30", 1), ("7", 2)]
+        assert captures[1][3] == "2025-08-31 16:36:38.2"
+        dupes = conn.exec_driver_sql(
+            "SELECT capture_id, user_id FROM leaderboard_snapshots GROUP BY capture_id, user_id HAVING COUNT(*) > 1"
+        ).fetchall()
+        assert dupes == []
+        assert conn.exec_driver_sql("SELECT COUNT(*) FROM leaderboard_snapshots WHERE capture_id IS NULL").scalar() == 0
+
+        # erneuter Lauf ist ein No-op
+        _upgrade(conn, _migration("20261017_add_leaderboard_captures"))
+        assert conn.exec_driver_sql("SELECT COUNT(*) FROM leaderboard_captures").scalar() == 4
+
+
+def test_hot_path_indexes_round_trip_restores_lookup_index():
+    mod = _migration("20261017_add_hot_path_indexes")
+    engine = create_engine("sqlite://", future=True)
+    with engine.begin() as conn:
+        conn.exec_driver_sql("CREATE TABLE member_daily_snapshot (id INTEGER PRIMARY KEY, tenant TEXT, user_id TEXT, day DATE)")
+        conn.exec_driver_sql("CREATE INDEX ix_mds_tenant_user_day ON member_daily_snapshot (tenant, user_id, day)")
+        conn.exec_driver_sql("INSERT INTO member_daily_snapshot (tenant, user_id, day) VALUES "
+                             "('t1', 'a', '2025-09-01'), ('t1', 'a', '2025-09-01'), ('t1', 'b', '2025-09-01')")
+        _upgrade(conn, mod)
+        indexes = lambda: {r[1] for r in conn.exec_driver_sql("PRAGMA index_list('member_daily_snapshot')")}
+        assert "ix_mds_tenant_user_day" not in indexes()
+        # Dubletten sind entfernt, die neueste Zeile bleibt
+        assert conn.exec_driver_sql("SELECT id FROM member_daily_snapshot ORDER BY id").scalars().all() == [2, 3]
+
+        _downgrade(conn, mod)
+        assert "ix_mds_tenant_user_day" in indexes()
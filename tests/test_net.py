@@ -0,0 +1,72 @@
+import io
+
+import pytest
+
+from skoolhud.utils import net
+
+
+class _Resp:
+    def __init__(self, status, headers=None):
+        self.status_code = status
+        self.headers = headers or {}
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise net.requests.HTTPError(str(self.status_code))
+
+
+class _Session:
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.calls = []
+
+    def request(self, method, url, **kw):
+        files = kw.get("files")
+        self.calls.append((method, url, files["file"][1].read() if files else None))
+        return self.responses.pop(0)
+
+
+@pytest.fixture(autouse=True)
+def _fresh_registry(monkeypatch):
+    monkeypatch.setattr(net, "_BUCKETS", {})
+    monkeypatch.setattr(net, "_SESSIONS", {})
+
+
+def test_buckets_are_per_host_with_burst():
+    slow = net.bucket_for("example.org")
+    assert slow.reserve() == 0 and slow.reserve() > 10  # Default: 15 s, Burst 1
+    discord = net.bucket_for("discord.com")
+    assert discord is net.bucket_for("discord.com")
+    assert [discord.reserve() for _ in range(5)] == [0] * 5 and discord.reserve() > 0
+    assert net.bucket_for("ptb.discord.com").burst == 5
+
+
+def test_rate_limit_headers():
+    assert net.rate_limit_delay(_Resp(429, {"Retry-After": "3"})) == 3.0
+    assert net.rate_limit_delay(_Resp(200, {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset-After": "1.5"})) == 1.5
+    assert net.rate_limit_delay(_Resp(200, {"X-RateLimit-Remaining": "4", "X-RateLimit-Reset-After": "1.5"})) is None
+    assert net.rate_limit_delay(_Resp(200)) is None
+
+
+def test_retry_after_blocks_host_and_rewinds_files(monkeypatch):
+    session = _Session([_Resp(429, {"Retry-After": "0.01"}), _Resp(204)])
+    monkeypatch.setattr(net, "session_for", lambda host: session)
+    blocked = []
+    bucket = net.bucket_for("discord.com")
+    monkeypatch.setattr(bucket, "block_for", lambda s: blocked.append(s))
+
+    fh = io.BytesIO(b"report")
+    r = net.post_with_retry("https://discord.com/api/webhooks/x", json={"content": "hi"},
+                            files={"file": ("r.md", fh)}, timeout=5)
+    assert r.status_code == 204
+    assert blocked == [0.01]
+    assert [c[2] for c in session.calls] == [b"report", b"report"]
+
+
+def test_server_error_raises_after_retries(monkeypatch):
+    session = _Session([_Resp(502), _Resp(502)])
+    monkeypatch.setattr(net, "session_for", lambda host: session)
+    monkeypatch.setattr(net.time, "sleep", lambda s: None)
+    with pytest.raises(net.requests.HTTPError):
+        net.get_with_retry("https://discord.com/x", max_retries=1)
+    assert len(session.calls) == 2
@@ -0,0 +1,68 @@
+import copy
+import json
+
+import pytest
+from sqlalchemy import select
+
+from skoolhud.models import Member
+from skoolhud.normalizer import normalize_members_json
+
+
+pytestmark = pytest.mark.usefixtures("state_dir")
+
+
+def _node(uid, first, email=None, last_offline=None, pts=None, member_id=None, bio=None):
+    user = {"id": uid, "name": f"h-{uid}", "firstName": first, "lastName": "X",
+            "metadata": {"bio": bio, "lastOffline": last_offline}}
+    if pts is not None:
+        user["metadata"]["spData"] = json.dumps({"pts": pts, "lv": 3})
+    member = {"id": member_id or f"m-{uid}", "role": "member", "createdAt": "2025-01-01T00:00:00Z"}
+    if email:
+        member["searchAnswer"] = email
+    return {"user": user, "member": member}
+
+
+def _page(*nodes):
+    return {"pageProps": {"users": list(nodes)}}
+
+
+PAGES = [
+    _page(_node("u1", "Anna", "a@x.io", "2025-09-01T10:00:00Z", pts=10),
+          _node("u2", "Ben", "b@x.io", "2025-09-01T10:00:00Z"),
+          _node("u2", "Benjamin", "b2@x.io", "2025-09-02T10:00:00Z", bio="dup on same page")),
+    _page(_node("u1", "Anna-Neu", "new@x.io", "2025-08-01T10:00:00Z", pts=20, bio="older activity"),
+          _node(None, "Cleo", "b@x.io", "2025-09-03T10:00:00Z", bio="matched by email"),
+          _node("u4", "Dora", "", None),
+          _node("u2", "Ben", None, "2025-09-05T10:00:00+02:00", bio="newer")),
+]
+
+
+def _run(s, bulk: bool):
+    results = []
+    for page in copy.deepcopy(PAGES):
+        results.append(normalize_members_json(s, "t1", "b1", page, "raw.json", bulk=bulk))
+        s.commit()
+    rows = s.execute(select(Member.__table__).order_by(Member.user_id)).mappings().all()
+    return results, [{k: v for k, v in r.items() if k != "id"} for r in rows]
+
+
+def test_bulk_matches_row_by_row_merge(make_session):
+    seq_results, seq_rows = _run(make_session(), bulk=False)
+    bulk_results, bulk_rows = _run(make_session(), bulk=True)
+    assert bulk_results == seq_results
+    assert bulk_rows == seq_rows
+
+
+def test_bulk_merge_rules(db_session):
+    _, rows = _run(db_session, bulk=True)
+    by_uid = {r["user_id"]: r for r in rows}
+    # geschützte Stammdaten bleiben, Punkte werden aktualisiert
+    assert by_uid["u1"]["name"] == "Anna" and by_uid["u1"]["email"] == "a@x.io"
+    assert by_uid["u1"]["points_all"] == 20
+    # last_active bewegt sich nur vorwärts
+    assert by_uid["u1"]["last_active_raw"] == "2025-09-01T10:00:00Z"
+    assert by_uid["u2"]["last_active_at_utc"] == "2025-09-05T08:00:00+00:00"
+    assert by_uid["u4"]["email"] is None
+    # ohne user_id per E-Mail auf den bestehenden Datensatz gemappt
+    assert by_uid["u2"]["bio"] == "newer"
+    assert sorted(by_uid.keys() - {None}) == ["u1", "u2", "u4"]
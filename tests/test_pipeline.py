@@ -0,0 +1,50 @@
+import threading
+import time
+
+import pytest
+
+from skoolhud.pipeline import StageTimings, run_page_pipeline
+
+
+def test_stops_without_extra_fetch_and_batches_commits():
+    fetched, consumed, commits = [], [], []
+
+    def consume(page, item):
+        consumed.append((page, item))
+        return page == 4
+
+    timings = run_page_pipeline(lambda p: fetched.append(p) or f"data{p}", consume, max_pages=10,
+                                wait=lambda p: 0, commit=lambda: commits.append(len(consumed)),
+                                commit_every=2)
+    assert fetched == [1, 2, 3, 4]
+    assert consumed == [(p, f"data{p}") for p in fetched]
+    assert commits and commits[-1] == 4
+    assert timings.calls["fetch"] == 4 and timings.calls["normalize"] == 4
+    assert "fetch=" in timings.summary()
+
+
+def test_normalization_overlaps_wait():
+    during_wait = threading.Event()
+
+    def consume(page, item):
+        if page == 1:
+            during_wait.set()
+        return page == 2
+
+    t0 = time.perf_counter()
+    run_page_pipeline(lambda p: p, consume, max_pages=2, wait=lambda p: 0.3, commit=lambda: None)
+    assert during_wait.is_set()
+    # Pause vor Seite 2 wird nicht durch die Normalisierung verlängert, nach dem Stopp keine Pause
+    assert time.perf_counter() - t0 < 1.0
+
+
+def test_consumer_error_is_raised_and_stops_fetching():
+    fetched = []
+
+    def consume(page, item):
+        raise ValueError("kaputt")
+
+    with pytest.raises(ValueError):
+        run_page_pipeline(lambda p: fetched.append(p), consume, max_pages=5, wait=lambda p: 5,
+                          commit=lambda: None, timings=StageTimings())
+    assert fetched == [1]
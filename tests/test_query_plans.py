@@ -0,0 +1,26 @@
+import importlib.util
+from pathlib import Path
+
+from sqlalchemy import create_engine
+
+from skoolhud.db import Base
+import skoolhud.models  # noqa: F401  (Tabellen registrieren)
+
+
+def _explain_script():
+    path = Path(__file__).resolve().parents[1] / "scripts" / "explain_hot_queries.py"
+    spec = importlib.util.spec_from_file_location("explain_hot_queries", path)
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    return mod
+
+
+def test_hot_queries_use_indexes(tmp_path):
+    db = tmp_path / "plans.db"
+    Base.metadata.create_all(create_engine(f"sqlite:///{db}", future=True))
+    assert _explain_script().main(["--db", str(db), "--quiet"]) == 0
+
+
+def test_full_scan_is_reported():
+    mod = _explain_script()
+    assert mod.full_scans(["SCAN leaderboard_snapshots", "SEARCH m USING INDEX x (tenant=?)"]) == ["SCAN leaderboard_snapshots"]
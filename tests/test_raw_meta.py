@@ -0,0 +1,40 @@
+import hashlib
+import json
+from datetime import timedelta
+
+from sqlalchemy import select
+
+from skoolhud.fetcher import SkoolFetcher
+from skoolhud.models import RawSnapshot
+from skoolhud.normalizer import normalize_members_json
+from skoolhud.raw_store import read_raw_bytes
+
+PAYLOAD = {"pageProps": {"users": [{"id": "u1", "firstName": "A", "member": {"id": "m1"}}]}}
+
+
+class _Resp:
+    status_code = 200
+    elapsed = timedelta(milliseconds=42)
+    # Wire-Format mit Leerzeichen: muss unverändert archiviert werden
+    content = json.dumps(PAYLOAD, indent=1).encode("utf-8")
+
+    def raise_for_status(self):
+        pass
+
+
+def test_fetch_meta_flows_into_raw_snapshot(state_dir, db_session, monkeypatch):
+    f = SkoolFetcher("https://example.invalid", "grp", "auth_token=x", "t1")
+    monkeypatch.setattr(f.session, "get", lambda url, **kw: _Resp())
+
+    data, route, fpath = f.fetch_members_json("b1")
+    assert data == PAYLOAD
+    assert read_raw_bytes(fpath) == _Resp.content
+    assert fpath.meta["size"] == len(_Resp.content)
+    assert fpath.meta["sha256"] == hashlib.sha256(_Resp.content).hexdigest()
+    assert fpath.meta["fetch_ms"] == 42.0 and fpath.meta["parse_ms"] >= 0
+
+    normalize_members_json(db_session, "t1", "b1", data, fpath, bulk=True)
+    db_session.commit()
+    snap = db_session.execute(select(RawSnapshot)).scalar_one()
+    assert snap.path == str(fpath)
+    assert snap.meta == fpath.meta
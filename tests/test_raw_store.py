@@ -0,0 +1,117 @@
+import json
+import os
+
+from skoolhud.raw_store import RawStore, load_raw, route_key, route_kind
+from skoolhud.utils import latest_raw_file
+
+MEMBERS_ROUTE = "/_next/data/b1/grp/-/members.json?group=grp"
+LB_ROUTE = "/grp/-/leaderboards.json?group=grp&window=all"
+
+
+def test_identical_payloads_are_stored_once(tmp_path):
+    store = RawStore(str(tmp_path), "t1")
+    payload = {"pageProps": {"users": [{"id": "u1", "firstName": "Ä"}]}}
+    p1 = store.put(MEMBERS_ROUTE, "b1", payload)
+    p2 = store.put(MEMBERS_ROUTE, "b1", dict(payload))
+    assert p1 == p2
+    objects = [f for _, _, files in os.walk(tmp_path / "t1" / "objects") for f in files]
+    assert len(objects) == 1
+    assert load_raw(p1) == payload
+    entries = store.entries()
+    assert len(entries) == 2
+    assert entries[0]["kind"] == "members" and entries[0]["build_id"] == "b1"
+
+
+def test_latest_raw_file_reads_through_index(tmp_path):
+    store = RawStore(str(tmp_path), "t1")
+    store.put(LB_ROUTE, None, {"v": 1})
+    m = store.put(MEMBERS_ROUTE, "b1", {"v": 2})
+    lb = store.put(LB_ROUTE, None, {"v": 3})
+    assert latest_raw_file(str(tmp_path), "t1", "members") == m
+    assert latest_raw_file(str(tmp_path), "t1", "leaderboards") == lb
+    assert load_raw(lb) == {"v": 3}
+
+
+def test_legacy_json_files_still_found(tmp_path):
+    tdir = tmp_path / "t1"
+    tdir.mkdir()
+    legacy = tdir / "t1___grp_-_leaderboards.json__20250101T000000.json"
+    legacy.write_text('{"old": true}', encoding="utf-8")
+    fpath = latest_raw_file(str(tmp_path), "t1", "leaderboards")
+    assert fpath == str(legacy)
+    assert load_raw(fpath) == {"old": True}
+
+
+def test_route_kind():
+    assert route_kind(MEMBERS_ROUTE + "&p=2") == "members"
+    assert route_kind(LB_ROUTE) == "leaderboards"
+    assert route_kind("/api/leaderboards?group=members-club") == "leaderboards"
+
+
+def test_latest_uses_manifest_without_index_scan(tmp_path, monkeypatch):
+    store = RawStore(str(tmp_path), "t1")
+    store.put(MEMBERS_ROUTE, "b1", {"v": 1})
+    newest = store.put(MEMBERS_ROUTE + "&p=2", "b1", {"v": 2})
+    monkeypatch.setattr(RawStore, "entries", lambda self: (_ for _ in ()).throw(AssertionError("scan")))
+    assert RawStore(str(tmp_path), "t1").latest("members")["path"] == newest
+    assert RawStore(str(tmp_path), "t1").latest("p=2")["path"] == newest
+
+
+def test_manifest_routes_do_not_grow_per_build(tmp_path):
+    store = RawStore(str(tmp_path), "t1")
+    for build in ("b1", "b2", "b3"):
+        newest = store.put(MEMBERS_ROUTE.replace("/b1/", f"/{build}/"), build, {"build": build})
+    with open(store.heads_path, encoding="utf-8") as f:
+        routes = json.load(f)["routes"]
+    assert list(routes) == [route_key(MEMBERS_ROUTE)] == ["/_next/data/{build}/grp/-/members.json?group=grp"]
+    assert routes[route_key(MEMBERS_ROUTE)]["build_id"] == "b3"
+    assert store.latest("members.json")["path"] == newest
+    assert store.latest("/b3/")["path"] == newest
+
+
+def test_old_manifest_keys_are_merged_on_load(tmp_path):
+    store = RawStore(str(tmp_path), "t1")
+    store.put(MEMBERS_ROUTE, "b1", {"v": 1})
+    newest = store.put(MEMBERS_ROUTE.replace("/b1/", "/b2/"), "b2", {"v": 2})
+    # Manifest im alten Format: ein Schlüssel pro Route inkl. buildId
+    entries = store.entries()
+    with open(store.heads_path, "w", encoding="utf-8") as f:
+        json.dump({"kinds": {"members": entries[-1]}, "routes": {e["route"]: e for e in entries}}, f)
+
+    assert list(store._load_heads()["routes"]) == [route_key(MEMBERS_ROUTE)]
+    assert store.latest("members.json")["path"] == newest
+
+
+def test_backfill_indexes_legacy_files(tmp_path):
+    tdir = tmp_path / "t1"
+    tdir.mkdir()
+    old_m = tdir / "t1___next_data_b1_grp_-_members.json_group_grp__20250101T000000.json"
+    old_m.write_text('{"m": 1}', encoding="utf-8")
+    old_lb = tdir / "t1__grp_-_leaderboards.json_group_grp__20250101T000001.json"
+    old_lb.write_text('{"lb": 1}', encoding="utf-8")
+    os.utime(old_m, (1_700_000_000, 1_700_000_000))
+    os.utime(old_lb, (1_700_000_100, 1_700_000_100))
+
+    store = RawStore(str(tmp_path), "t1")
+    assert store.backfill_legacy() == {"added": 2, "skipped": 0}
+    assert store.backfill_legacy() == {"added": 0, "skipped": 2}
+    assert store.latest("members")["path"] == str(old_m)
+
+    # neue Captures überholen die Altbestände
+    fresh = store.put(LB_ROUTE, None, {"lb": 2})
+    assert store.latest("leaderboards")["path"] == fresh
+
+
+def test_backfill_migrate_moves_files_into_object_store(tmp_path):
+    tdir = tmp_path / "t1"
+    tdir.mkdir()
+    old_lb = tdir / "t1__grp_-_leaderboards.json__20250101T000001.json"
+    old_lb.write_text('{\n  "lb": 1\n}', encoding="utf-8")
+    store = RawStore(str(tmp_path), "t1")
+    store.backfill_legacy(migrate=True)
+    assert not old_lb.exists()
+    assert load_raw(store.latest("leaderboards")["path"]) == {"lb": 1}
+    # Index-Hash zeigt auf das gespeicherte Objekt; gleiche Payload über put() wird dedupliziert
+    entry = store.latest("leaderboards")
+    assert store._existing_object(entry["sha256"]) == entry["path"]
+    assert store.put(LB_ROUTE, None, {"lb": 1}) == entry["path"]
@@ -0,0 +1,154 @@
+import hashlib
+import json
+import os
+
+import pytest
+from sqlalchemy import select
+
+from skoolhud.fetcher import SkoolFetcher
+from skoolhud.models import Member, LeaderboardSnapshot, RawSnapshot
+from skoolhud.normalizer import (normalize_members_json, normalize_members_stream,
+                                 normalize_leaderboard_windows, normalize_leaderboard_windows_stream)
+from skoolhud.raw_store import RawStore, iter_raw_items, read_raw_bytes
+
+
+pytestmark = pytest.mark.usefixtures("state_dir")
+
+
+def _members(n):
+    users = [{"id": f"u{i}", "name": f"h{i}", "firstName": "A", "lastName": str(i),
+              "member": {"id": f"m{i}", "role": "member"}} for i in range(n)]
+    return {"pageProps": {"users": users}}
+
+
+def _chunks(raw: bytes, size=7):
+    return (raw[i:i + size] for i in range(0, len(raw), size))
+
+
+def test_put_stream_roundtrip_and_dedupe(tmp_path):
+    store = RawStore(str(tmp_path / "raw"), "t1")
+    raw = json.dumps(_members(3), indent=1).encode("utf-8")
+
+    ref = store.put_stream("/members", "b1", _chunks(raw))
+    assert read_raw_bytes(ref) == raw
+    assert ref.meta == {"size": len(raw), "sha256": hashlib.sha256(raw).hexdigest()}
+    # identische Bytes -> gleiches Objekt, zwei Indexeinträge
+    assert store.put_stream("/members", "b1", _chunks(raw, 100)) == ref
+    assert [e["path"] for e in store.entries()] == [ref, ref]
+    assert not [p for p in os.listdir(os.path.dirname(os.path.dirname(ref))) if p.endswith(".tmp")]
+
+
+def test_put_stream_check_rejects(tmp_path):
+    store = RawStore(str(tmp_path / "raw"), "t1")
+
+    def check(head, size):
+        assert head.startswith(b'{"pageProps"') and size == 34
+        raise RuntimeError("redirect")
+
+    with pytest.raises(RuntimeError):
+        store.put_stream("/members", "b1", [b'{"pageProps": {"__N_REDIRECT"', b": 1}}"], check=check)
+    assert list(store.entries()) == []
+    assert os.listdir(os.path.join(store.root, "objects")) == []
+
+
+def test_iter_raw_items(tmp_path):
+    ref = RawStore(str(tmp_path / "raw"), "t1").put("/members", "b1", _members(3))
+    assert [u["id"] for u in iter_raw_items(ref, "pageProps.users.item")] == ["u0", "u1", "u2"]
+    assert list(iter_raw_items(ref, "pageProps.missing.item")) == []
+
+
+def test_members_stream_matches_json(tmp_path, make_session):
+    data = _members(7)
+    ref = RawStore(str(tmp_path / "raw"), "t1").put("/members", "b1", data)
+
+    s1, s2 = make_session(), make_session()
+    r1 = normalize_members_json(s1, "t1", "b1", data, ref, bulk=True)
+    r2 = normalize_members_stream(s2, "t1", "b1", ref, batch_size=3)
+    s1.commit(); s2.commit()
+    assert r1 == r2
+
+    cols = (Member.user_id, Member.name, Member.handle, Member.role)
+    rows = lambda s: s.execute(select(*cols).order_by(Member.user_id)).all()
+    assert rows(s1) == rows(s2) and len(rows(s2)) == 7
+    assert s2.execute(select(RawSnapshot.path)).scalar_one() == str(ref)
+
+
+def test_members_stream_falls_back_on_unknown_shape(tmp_path, db_session):
+    data = {"pageProps": {"data": {"members": _members(2)["pageProps"]["users"]}}}
+    ref = RawStore(str(tmp_path / "raw"), "t1").put("/members", "b1", data)
+    res = normalize_members_stream(db_session, "t1", "b1", ref)
+    assert sorted(res["user_ids"]) == ["u0", "u1"]
+
+
+def test_leaderboard_windows_stream_matches_json(tmp_path, make_session):
+    users = [{"userId": f"u{i}", "points": 50 - i, "rank": i + 1} for i in range(5)]
+    data = {"pageProps": {"s": {"allTime": {"users": users}}, "past7Days": users[:2]}}
+    ref = RawStore(str(tmp_path / "raw"), "t1").put("/leaderboard", "b1", data)
+
+    s1, s2 = make_session(), make_session()
+    r1 = normalize_leaderboard_windows(s1, "t1", "b1", data, ref)
+    r2 = normalize_leaderboard_windows_stream(s2, "t1", "b1", ref)
+    s1.commit(); s2.commit()
+    assert r1 == r2 and r2["all"]["inserted"] == 5 and r2["7"]["inserted"] == 2
+
+    cols = (LeaderboardSnapshot.window, LeaderboardSnapshot.user_id, LeaderboardSnapshot.points, LeaderboardSnapshot.rank)
+    rows = lambda s: s.execute(select(*cols).order_by(*cols)).all()
+    assert rows(s1) == rows(s2)
+
+
+def test_iter_raw_items_decodes_incrementally(tmp_path, monkeypatch):
+    pytest.importorskip("ijson")
+    import skoolhud.raw_store as raw_store
+
+    ref = RawStore(str(tmp_path / "raw"), "t1").put("/members", "b1", _members(3))
+    # der ijson-Pfad darf die Payload nie komplett laden
+    monkeypatch.setattr(raw_store, "load_raw", lambda path: pytest.fail("Payload komplett geladen"))
+    items = iter_raw_items(ref, "pageProps.users.item")
+    assert next(items)["id"] == "u0"
+    assert [u["id"] for u in items] == ["u1", "u2"]
+
+
+def test_leaderboard_windows_without_ijson_load_payload_once(tmp_path, monkeypatch, make_session):
+    import skoolhud.raw_store as raw_store
+
+    users = [{"userId": f"u{i}", "points": 50 - i, "rank": i + 1} for i in range(3)]
+    data = {"pageProps": {"past30Days": {"users": users}, "past7Days": users[:1]}}
+    ref = RawStore(str(tmp_path / "raw"), "t1").put("/leaderboard", "b1", data)
+    expected = normalize_leaderboard_windows(make_session(), "t1", "b1", data, ref)
+
+    loads = []
+    real_load = raw_store.load_raw
+    monkeypatch.setattr(raw_store, "_ijson", None)
+    monkeypatch.setattr(raw_store, "load_raw", lambda path: loads.append(path) or real_load(path))
+    assert normalize_leaderboard_windows_stream(make_session(), "t1", "b1", ref) == expected
+    assert loads == [str(ref)]
+
+
+class _StreamResp:
+    status_code = 200
+    headers = {}
+
+    def __init__(self, body: bytes):
+        self.body = body
+        self.closed = False
+
+    def raise_for_status(self):
+        pass
+
+    def iter_content(self, chunk_size):
+        return _chunks(self.body, 5)
+
+    def close(self):
+        self.closed = True
+
+
+def test_fetch_members_stream(monkeypatch):
+    body = json.dumps(_members(2)).encode("utf-8")
+    f = SkoolFetcher("https://example.invalid", "grp", "auth_token=x", "t1")
+    calls = []
+    monkeypatch.setattr(f.session, "get", lambda url, **kw: calls.append(kw) or _StreamResp(body))
+
+    route, ref = f.fetch_members_stream_with_params("b1", {"p": 2})
+    assert calls[0]["stream"] is True and "p=2" in route
+    assert read_raw_bytes(ref) == body
+    assert ref.meta["size"] == len(body) and ref.meta["streamed"] is True
@@ -0,0 +1,81 @@
+import threading
+import time
+
+import pytest
+
+from skoolhud.agents.run_all_agents import AGENTS, Agent, dependencies, run_agents
+
+CALLS = []
+_LOCK = threading.Lock()
+
+
+def _record(name, argv, delay=0.0):
+    time.sleep(delay)
+    with _LOCK:
+        CALLS.append((name, tuple(argv)))
+
+
+def slow_a(argv):
+    _record("a", argv, 0.2)
+
+
+def slow_b(argv):
+    _record("b", argv, 0.2)
+
+
+def needs_a(argv):
+    _record("c", argv)
+    assert ("a", tuple(argv)) in CALLS
+
+
+def broken(argv):
+    raise RuntimeError("kaputt")
+
+
+def _agent(name, func, inputs=(), outputs=()):
+    return Agent(name, f"{__name__}:{func}", inputs, outputs)
+
+
+@pytest.fixture(autouse=True)
+def _reset():
+    CALLS.clear()
+
+
+def test_dag_order_and_parallelism():
+    agents = (
+        _agent("c", "needs_a", ("report:a.md",), ("report:c.md",)),
+        _agent("a", "slow_a", ("db:members",), ("report:a.md",)),
+        _agent("b", "slow_b", ("db:members",), ("report:b.md",)),
+    )
+    assert dependencies(agents) == {"c": {"a"}, "a": set(), "b": set()}
+
+    t0 = time.perf_counter()
+    results = run_agents("t1", agents, workers=2)
+    assert time.perf_counter() - t0 < 0.39  # a und b parallel
+    assert [(r.name, r.status) for r in results] == [("c", "ok"), ("a", "ok"), ("b", "ok")]
+    assert results[1].seconds >= 0.2
+    assert set(CALLS) == {(n, ("--slug", "t1")) for n in "abc"}
+
+
+def test_failure_skips_dependents_only():
+    agents = (
+        _agent("x", "broken", (), ("report:x.md",)),
+        _agent("y", "needs_a", ("report:x.md",)),
+        _agent("b", "slow_b"),
+    )
+    status = {r.name: r.status for r in run_agents("t1", agents)}
+    assert status == {"x": "failed", "y": "skipped", "b": "ok"}
+
+
+def test_cycle_is_rejected():
+    with pytest.raises(ValueError):
+        dependencies((_agent("p", "slow_a", ("r:q",), ("r:p",)), _agent("q", "slow_b", ("r:p",), ("r:q",))))
+
+
+def test_registry_targets_exist():
+    import importlib
+
+    dependencies(AGENTS)
+    for a in AGENTS:
+        module, _, func = a.target.partition(":")
+        assert callable(getattr(importlib.import_module(module), func))
@@ -0,0 +1,35 @@
+from datetime import date, datetime
+
+from sqlalchemy import event, select
+
+from skoolhud.models import Member, MemberDailySnapshot
+from skoolhud.normalizer import snapshot_members_daily
+
+
+def test_set_based_daily_snapshot_upserts_per_tenant(db_session):
+    s = db_session
+    s.add_all([
+        Member(tenant="t1", user_id="a", points_7d=5, last_active_at_utc="2025-09-04T13:47:12.2273+02:00"),
+        Member(tenant="t1", user_id="b", points_7d=1),
+        Member(tenant="t1", user_id=None, email="noise@example.com"),
+        Member(tenant="t2", user_id="a", points_7d=99),
+    ])
+    s.commit()
+
+    day = date(2025, 9, 4)
+    statements = []
+    event.listen(s.get_bind(), "before_cursor_execute", lambda *a: statements.append(a[2]))
+    assert snapshot_members_daily(s, "t1", day) == {"inserted": 2, "updated": 0}
+    assert len([q for q in statements if q.startswith("INSERT")]) == 1
+    s.commit()
+
+    s.execute(Member.__table__.update().where(Member.user_id == "a", Member.tenant == "t1").values(points_7d=7))
+    assert snapshot_members_daily(s, "t1", day) == {"inserted": 0, "updated": 2}
+    s.commit()
+
+    rows = {r.user_id: r for r in s.execute(select(MemberDailySnapshot)).scalars()}
+    assert set(rows) == {"a", "b"}
+    assert rows["a"].tenant == "t1" and rows["a"].points_7d == 7 and rows["a"].day == day
+    # Sekundenbruchteile bleiben erhalten (wie beim früheren Python-Pfad)
+    assert rows["a"].last_active_at_utc == datetime(2025, 9, 4, 11, 47, 12, 227300)
+    assert rows["b"].last_active_at_utc is None
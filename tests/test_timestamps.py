@@ -0,0 +1,40 @@
+from datetime import datetime, timezone, timedelta
+
+import pytest
+from dateutil import parser as dtparser
+
+from skoolhud.utils import to_utc_str
+from skoolhud.utils.timestamps import parse_timestamp, to_utc, cache_info
+
+
+@pytest.mark.parametrize("raw", [
+    "2025-09-01T10:00:00Z",
+    "2025-09-01T10:00:00.123456Z",
+    "2025-09-01T12:00:00+02:00",
+    "2025-09-01 10:00:00",
+    "2025-09-01",
+    "Sep 1, 2025 10:00 AM",        # nur dateutil
+    "2025-09-01T10:00:00.123Z",
+])
+def test_to_utc_str_matches_dateutil(raw):
+    dt = dtparser.parse(raw)
+    dt = dt.replace(tzinfo=timezone.utc) if dt.tzinfo is None else dt
+    assert to_utc_str(raw) == dt.astimezone(timezone.utc).isoformat()
+
+
+def test_edge_values():
+    assert to_utc_str(None) is None and to_utc_str("") is None
+    assert to_utc_str("not a date") is None
+    assert to_utc_str(0) is None  # falsy wie bisher
+    assert to_utc_str(1756720800) == "2025-09-01T10:00:00+00:00"
+    aware = datetime(2025, 9, 1, 12, tzinfo=timezone(timedelta(hours=2)))
+    assert to_utc(aware) == datetime(2025, 9, 1, 10, tzinfo=timezone.utc)
+
+
+def test_parse_timestamp_keeps_offset_and_caches():
+    before = cache_info().hits
+    a = parse_timestamp("2025-09-01T12:00:00+02:00")
+    b = parse_timestamp("2025-09-01T12:00:00+02:00")
+    assert a is b and a.utcoffset() == timedelta(hours=2)
+    assert cache_info().hits >= before + 1
+    assert parse_timestamp("2025-09-01T12:00:00").tzinfo is None
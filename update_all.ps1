@@ -22,10 +22,8 @@ Write-Host ">>> Fetch leaderboard RAW..." -ForegroundColor Yellow
 skoolhud fetch-leaderboard --slug $slug
 
 # 5. Normalisieren für alle Fenster
-foreach ($w in "all","30","7") {
-    Write-Host ">>> Normalisiere Leaderboard (window=$w)..." -ForegroundColor Yellow
-    skoolhud normalize-leaderboard --slug $slug --window $w
-}
+Write-Host ">>> Normalisiere Leaderboard (all,30,7)..." -ForegroundColor Yellow
+skoolhud normalize-leaderboard --slug $slug --all-windows
 
 # 6. Status-Report
 Write-Host ">>> Mitglieder-Count prüfen..." -ForegroundColor Yellow
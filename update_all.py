@@ -27,9 +27,8 @@ def main():
     # 2) Leaderboard abrufen
     run(["skoolhud", "fetch-leaderboard", "--slug", SLUG])
 
-    # 3) Leaderboard normalisieren (all/30/7)
-    for w in ["all", "30", "7"]:
-        run(["skoolhud", "normalize-leaderboard", "--slug", SLUG, "--window", w])
+    # 3) Leaderboard normalisieren (all/30/7 aus einer Payload, ein Prozess)
+    run(["skoolhud", "normalize-leaderboard", "--slug", SLUG, "--all-windows"])
 
     # 4) Status prüfen
     run(["skoolhud", "count-members", "--slug", SLUG])
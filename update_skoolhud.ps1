@@ -44,9 +44,7 @@ Stamp "Leaderboards normalisieren…"
 # (optional) neueste Leaderboard-RAW zuerst ziehen – falls du sicherstellen willst, dass die Datei aktuell ist:
 # skoolhud fetch-leaderboard --slug $Slug
 
-skoolhud normalize-leaderboard --slug $Slug --window all
-skoolhud normalize-leaderboard --slug $Slug --window 30
-skoolhud normalize-leaderboard --slug $Slug --window 7
+skoolhud normalize-leaderboard --slug $Slug --all-windows
 
 # 5) Schnell-Report (Python Inline)
 Stamp "DB-Report erzeugen…"